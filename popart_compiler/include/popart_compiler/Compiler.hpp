@@ -1,6 +1,7 @@
 // Copyright (c) 2020 Graphcore Ltd. All rights reserved.
 #pragma once
 
+#include <map>
 #include <memory>
 #include <sstream>
 #include <string>
@@ -108,6 +109,33 @@ struct Optimizer {
     }
   }
 
+  // Update the value of the hyperparameter |name| (Using the ParamList names).
+  void setParam(const std::string &name, const ParamType &value) {
+    if (name == "lr") {
+      learning_rate = value;
+    } else if (name == "weight_decay") {
+      weight_decay = value;
+    } else if (name == "loss_scaling") {
+      loss_scaling = value;
+    } else if (name == "velocity_scaling") {
+      velocity_scaling = value;
+    } else if (name == "momentum") {
+      momentum = value;
+    } else if (name == "eps") {
+      eps = value;
+    } else if (name == "beta1") {
+      beta1 = value;
+    } else if (name == "beta2") {
+      beta2 = value;
+    } else if (name == "dampening") {
+      dampening = value;
+    } else if (name == "alpha") {
+      alpha = value;
+    } else {
+      ERROR("Unknown optimizer parameter " << name);
+    }
+  }
+
   OptimizerType type;
 
   ParamType learning_rate;
@@ -200,6 +228,8 @@ public:
 
   void copyDataTo(void *ptr) const;
 
+  const std::vector<uint8_t> &data() const { return _data; }
+
 private:
   const PopartType _popart_type;
   std::vector<uint8_t> _data;
@@ -274,8 +304,13 @@ public:
   // "EVERYN": Will return every N batch
   // "FINAL": Will return the last batch only
   // clang-format on
+  // The mode can be overridden for each output, in which case the output
+  // might not be returned at all (See isReturnedToHost()).
   void addOutputTensor(poptorch::TensorId output);
 
+  // Return false if |id| is an output which is never copied to the host.
+  bool isReturnedToHost(poptorch::TensorId id) const;
+
   void setUpInputOp(poptorch::TensorId id, float *ptr,
                     const std::vector<std::int64_t> &dims);
 
@@ -314,16 +349,43 @@ public:
 
   void initSession(const std::vector<Optimizer> &opt);
 
+  // Save to |filename| the state needed to create the session without
+  // lowering the graph again (ONNX model, tensor ids, anchors, etc), along
+  // with the ids of the executable's |inputs| and |outputs|.
+  void saveState(const char *filename,
+                 const std::vector<poptorch::TensorId> &inputs,
+                 const std::vector<poptorch::TensorId> &outputs) const;
+
+  // Write the Poplar executable of the session to |directory| in a format
+  // which can be loaded by PopART's engine cache.
+  void exportExecutable(const char *directory) const;
+
+  // Number of weights (parameters and buffers) used by the session.
+  std::uint64_t numWeights() const;
+
+  // Name of the weight |index| (in the order the weights were added).
+  const char *weightName(std::uint64_t index) const;
+
+  // Restore a state saved by saveState() into this empty compiler and
+  // return the ids of the executable's inputs and outputs.
+  void loadState(const char *filename, std::vector<poptorch::TensorId> *inputs,
+                 std::vector<poptorch::TensorId> *outputs);
+
   // Write the weights into IPU memory from the pytorch tensor buffers in the
-  // model.
+  // model. The weights with a nullptr buffer are left untouched.
   void copyWeightsToDevice(const std::vector<void *> &host_buffers);
 
   // Read the weights from IPU memory into the pytorch tensor buffers.
+  // The weights with a nullptr buffer are skipped.
   void copyWeightsToHost(const std::vector<void *> &host_buffers);
 
   // Return the type of the given tensor.
   PopartType getPopartType(poptorch::TensorId id) const;
 
+  // Release the IPUs the executable is attached to: the executable can't be
+  // run any more afterwards.
+  void detachFromDevice();
+
   /*
    * Execute the compiled popart graph using poplar. An optimizer can be
    * provided to update the optimizer currently being run by the graph. If there
@@ -332,6 +394,14 @@ public:
    */
   void run(const std::vector<Optimizer> &optimizer);
 
+  /*
+   * Return a copy of the optimizers currently used by the graph where the
+   * hyperparameters in |params| have been updated. |params| is indexed by
+   * group and only needs to contain the hyperparameters which changed.
+   */
+  std::vector<Optimizer> updateOptimizers(
+      const std::map<std::uint64_t, Optimizer::ParamList> &params) const;
+
   std::uint64_t batchPerStep() const;
 
   // Return the PopART batch dimensions [DeviceIterations * ReplicationFactor *
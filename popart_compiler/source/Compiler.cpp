@@ -1,12 +1,17 @@
 // Copyright (c) 2020 Graphcore Ltd. All rights reserved.
+#include <algorithm>
 #include <chrono>
 #include <fstream>
+#include <functional>
 #include <iostream>
 #include <list>
 #include <map>
 #include <memory>
+#include <set>
+#include <sstream>
 #include <string>
 #include <thread>
+#include <type_traits>
 #include <unordered_map>
 #include <utility>
 #include <vector>
@@ -146,6 +151,9 @@ public:
   void registerParameter(const popart::TensorId &id,
                          const popart::TensorInfo &info);
   void updateData(const std::vector<void *> &host_buffers);
+  const std::vector<popart::TensorId> &parameterIds() const {
+    return _weights_order;
+  }
 
 private:
   std::map<popart::TensorId, popart::MutableVoidData> _weights;
@@ -240,18 +248,40 @@ public:
   // Output tensors for the session.
   std::map<popart::TensorId, popart::IArray &> popart_outgoing;
   std::map<popart::TensorId, std::vector<void *>> outgoing_duplicates;
+  // Outputs which have already been bound during the current run.
+  std::set<popart::TensorId> outputs_bound;
 
   std::list<popart::TensorId> outputs;
   // Flat representation of the output shapes
   std::vector<OutputType> output_types;
 
-  // A list to allocate our buffers in so they get released.
-  std::list<std::unique_ptr<popart::IArray>> memory_manager;
+  // Popart wrapper around a host buffer.
+  struct HostBuffer {
+    void *ptr;
+    std::vector<std::int64_t> dims;
+    std::unique_ptr<popart::IArray> array;
+  };
+
+  // Maximum number of wrappers to cache for each tensor: enough to cover the
+  // ring buffers used by the data loaders.
+  static constexpr std::size_t max_host_buffers_per_tensor = 8;
+
+  // The wrappers are cached (most recently used first) and reused between
+  // runs as long as the pointer and the shape of the host buffer bound to a
+  // tensor don't change.
+  std::map<popart::TensorId, std::list<HostBuffer>> host_buffers;
 
   std::unique_ptr<popart::Session> session;
 
+  // Device the session is running on.
+  std::shared_ptr<popart::DeviceInfo> device;
+
   WeightsIO weights;
 
+  // True if PopART's host copy of the weights is the same as the weights on
+  // the device: they don't need to be downloaded again to be read.
+  bool host_weights_fresh = false;
+
   bool is_training;
 
   // Record the final loss, it is guaranteed by previous passes to be just one
@@ -266,6 +296,12 @@ public:
     PopartAnchorTypes anchor_mode;
     // 'N' when anchor_mode == PopartAnchorTypes::EveryN
     std::uint64_t anchor_return_period;
+    // Anchor mode and return period of the outputs which don't use the
+    // defaults above, indexed by position in the flattened outputs.
+    std::map<std::uint64_t, std::pair<PopartAnchorTypes, std::uint64_t>>
+        output_anchors;
+    // Positions of the outputs which are never copied to the host.
+    std::set<std::uint64_t> outputs_not_returned;
     // True if running on the model, False otherwise.
     bool ipu_model;
     // Automatically round up the number of IPUs, if required, to the minimum
@@ -365,16 +401,35 @@ public:
 
   std::unordered_set<std::uint64_t> used_ipus;
 
+  // Names of the weights, in the order they were added.
+  std::vector<std::string> weight_names;
+
   // Map of the pytorch variable update group to the popart weight.
   std::map<std::uint64_t, std::vector<popart::TensorId>> grad_update_groups;
 
+  // Optimizers currently used by the session (one per group).
+  std::vector<Optimizer> optimizers;
+
   std::unique_ptr<MultiConvBuilder> multi_conv_builder;
 
   // General helpers.
 
   // Inserts memory into the list of tensors being output by the model.
-  void addMemoryToOutput(poptorch::TensorId id, void *ptr,
-                         std::unique_ptr<popart::IArray> &&memory);
+  void addMemoryToOutput(
+      poptorch::TensorId id, void *ptr, const std::vector<std::int64_t> &dims,
+      const std::function<std::unique_ptr<popart::IArray>()> &create);
+
+  // Inserts memory into the list of tensors being input to the model.
+  void addMemoryToInput(
+      poptorch::TensorId id, void *ptr, const std::vector<std::int64_t> &dims,
+      const std::function<std::unique_ptr<popart::IArray>()> &create);
+
+  // Return the wrapper around |ptr| for |id|, use |create| to create it
+  // if it's not in the cache.
+  popart::IArray &getOrCreateHostBuffer(
+      const popart::TensorId &id, void *ptr,
+      const std::vector<std::int64_t> &dims,
+      const std::function<std::unique_ptr<popart::IArray>()> &create);
 
   // Domain helpers
   popart::TensorId reshape(const std::vector<popart::TensorId> &inputs,
@@ -463,6 +518,15 @@ public:
 
   bool isHostSideConstant(poptorch::TensorId id) const;
 
+  const std::unordered_map<poptorch::TensorId, HostSideConstant> &
+  hostSideConstants() const {
+    return _host_side_constants;
+  }
+
+  void addHostSideConstant(poptorch::TensorId id, HostSideConstant constant) {
+    _host_side_constants.emplace(id, std::move(constant));
+  }
+
   // R ound up the number of IPUs, if required, to the minimum number which need
   // to be reservered
   static std::uint64_t roundUpNumIPUs(std::uint64_t num_ipu);
@@ -494,7 +558,9 @@ void CompilerImpl::setExecutionStrategyAttributes(
 }
 
 bool WeightsIO::contains(popart::TensorId id) const {
-  return _weights.find(id) != _weights.end();
+  // Weights without a host buffer are not part of the transfer.
+  auto it = _weights.find(id);
+  return it != _weights.end() && it->second.data != nullptr;
 }
 
 popart::MutableVoidData WeightsIO::weight(popart::TensorId id) const {
@@ -503,8 +569,9 @@ popart::MutableVoidData WeightsIO::weight(popart::TensorId id) const {
 
 void WeightsIO::registerParameter(const popart::TensorId &id,
                                   const popart::TensorInfo &info) {
-  ERROR_ON(contains(id));
+  ERROR_ON(_weights.count(id) != 0);
   _weights[id].info = info;
+  _weights[id].data = nullptr;
   _weights_order.push_back(id);
 }
 
@@ -551,22 +618,64 @@ void CompilerImpl::updateUseModelConfig() {
   }
 }
 
-void CompilerImpl::addMemoryToOutput(poptorch::TensorId id, void *ptr,
-                                     std::unique_ptr<popart::IArray> &&memory) {
+namespace {
+// Bind |array| to |id| in |io_map| unless it's already the case.
+void bindHostBuffer(std::map<popart::TensorId, popart::IArray &> *io_map,
+                    const popart::TensorId &id, popart::IArray &array) {
+  auto it = io_map->find(id);
+  if (it != io_map->end()) {
+    if (&it->second == &array) {
+      return;
+    }
+    io_map->erase(it);
+  }
+  io_map->insert({id, array});
+}
+} // namespace
+
+popart::IArray &CompilerImpl::getOrCreateHostBuffer(
+    const popart::TensorId &id, void *ptr,
+    const std::vector<std::int64_t> &dims,
+    const std::function<std::unique_ptr<popart::IArray>()> &create) {
+  std::list<HostBuffer> &buffers = host_buffers[id];
+  for (auto it = buffers.begin(); it != buffers.end(); ++it) {
+    if (it->ptr == ptr && it->dims == dims) {
+      // Move it to the front of the list.
+      buffers.splice(buffers.begin(), buffers, it);
+      return *buffers.front().array;
+    }
+  }
+  buffers.push_front(HostBuffer{ptr, dims, create()});
+  if (buffers.size() > max_host_buffers_per_tensor) {
+    buffers.pop_back();
+  }
+  return *buffers.front().array;
+}
+
+void CompilerImpl::addMemoryToInput(
+    poptorch::TensorId id, void *ptr, const std::vector<std::int64_t> &dims,
+    const std::function<std::unique_ptr<popart::IArray>()> &create) {
+  popart::TensorId popart_id = ids[id];
+  bindHostBuffer(&popart_incoming, popart_id,
+                 getOrCreateHostBuffer(popart_id, ptr, dims, create));
+}
+
+void CompilerImpl::addMemoryToOutput(
+    poptorch::TensorId id, void *ptr, const std::vector<std::int64_t> &dims,
+    const std::function<std::unique_ptr<popart::IArray>()> &create) {
   if (isHostSideConstant(id)) {
     getHostSideConstant(id).copyDataTo(ptr);
     return;
   }
 
-  memory_manager.push_back(std::move(memory));
-
   popart::TensorId popart_id = ids[id];
-  if (!popart_outgoing.insert({popart_id, *memory_manager.back().get()})
-           .second) {
-    // Insertion in the map failed because there is already a pointer associated
-    // with that id.
+  if (!outputs_bound.insert(popart_id).second) {
+    // There is already a pointer associated with that id for this run.
     outgoing_duplicates[popart_id].push_back(ptr);
+    return;
   }
+  bindHostBuffer(&popart_outgoing, popart_id,
+                 getOrCreateHostBuffer(popart_id, ptr, dims, create));
 }
 
 struct SessionOptionsImpl {
@@ -720,6 +829,28 @@ SessionOptionsImpl::SessionOptionsImpl() {
                    // clang-format on
                  });
 
+  registerSetter(
+      container_options, "output_anchors",
+      [&](const std::pair<std::string, std::string> &p) {
+        std::uint64_t output = std::stoul(p.first);
+        // Either "none" or "<anchor mode> <return period>"
+        if (p.second == "none") {
+          poptorch_options.outputs_not_returned.insert(output);
+          return;
+        }
+        std::istringstream ss(p.second);
+        std::uint64_t mode;
+        std::uint64_t period;
+        ss >> mode >> period;
+        ERROR_ON_MSG(ss.fail() ||
+                         mode >= static_cast<std::uint64_t>(
+                                     PopartAnchorTypes::N),
+                     "Invalid anchor mode for output " << output << ": "
+                                                       << p.second);
+        poptorch_options.output_anchors[output] = {
+            static_cast<PopartAnchorTypes>(mode), period};
+      });
+
   registerSetter(container_options, "customCodelets",
                  [&](const std::pair<std::string, std::string> &p) {
                    popart_options.customCodelets.push_back(p.first);
@@ -914,6 +1045,82 @@ bool waitIfIpuIsUnavailable() {
   }
   return wait;
 }
+
+// Version of the format used by Compiler::saveState(): to be incremented
+// every time the content of the state changes.
+constexpr std::uint64_t state_format_version = 1;
+
+// Minimal binary serialisation used to save / restore the compiler state.
+class StateWriter {
+public:
+  explicit StateWriter(const char *filename)
+      : _stream(filename, std::ios::binary) {
+    ERROR_ON_MSG(!_stream, "Failed to open " << filename << " for writing");
+  }
+
+  template <typename T> void write(const T &value) {
+    static_assert(std::is_trivially_copyable<T>::value,
+                  "Only trivially copyable types can be written directly");
+    _stream.write(reinterpret_cast<const char *>(&value), sizeof(T));
+  }
+
+  void write(const std::string &str) {
+    write(str.size());
+    _stream.write(str.data(), str.size());
+  }
+
+  template <typename T> void write(const std::vector<T> &values) {
+    write(values.size());
+    for (const auto &value : values) {
+      write(value);
+    }
+  }
+
+private:
+  std::ofstream _stream;
+};
+
+class StateReader {
+public:
+  explicit StateReader(const char *filename)
+      : _filename(filename), _stream(filename, std::ios::binary) {
+    ERROR_ON_MSG(!_stream, "Failed to open " << filename << " for reading");
+  }
+
+  template <typename T> void read(T *value) {
+    static_assert(std::is_trivially_copyable<T>::value,
+                  "Only trivially copyable types can be read directly");
+    _stream.read(reinterpret_cast<char *>(value), sizeof(T));
+    ERROR_ON_MSG(!_stream, "Unexpected end of file while reading " << _filename);
+  }
+
+  void read(std::string *str) {
+    std::size_t size;
+    read(&size);
+    str->resize(size);
+    _stream.read(&(*str)[0], size);
+    ERROR_ON_MSG(!_stream, "Unexpected end of file while reading " << _filename);
+  }
+
+  template <typename T> void read(std::vector<T> *values) {
+    std::size_t size;
+    read(&size);
+    values->resize(size);
+    for (auto &value : *values) {
+      read(&value);
+    }
+  }
+
+  template <typename T> T read() {
+    T value;
+    read(&value);
+    return value;
+  }
+
+private:
+  std::string _filename;
+  std::ifstream _stream;
+};
 } // namespace
 bool ipuHardwareIsAvailable(std::uint64_t num_ipus) {
   return !ipuModelEnvironmentVariableIsEnabled() &&
@@ -1392,24 +1599,40 @@ Compiler::addInitializedInputTensor(const char *name, const char *type,
   popart::TensorId id = _impl->ids[_impl->ids.size() - 1];
 
   _impl->weights.registerParameter(id, info);
+  _impl->weight_names.emplace_back(name);
 
   return _impl->ids.size() - 1;
 }
 
 void Compiler::addOutputTensor(poptorch::TensorId output) {
+  // Position of this output in the flattened outputs of the model.
+  const std::uint64_t index = _impl->outputs.size();
   _impl->outputs.push_back(_impl->ids[output]);
 
   if (isHostSideConstant(output)) {
     return; // Nothing more to do
   }
 
-  const char *as_str = anchorTypeToString(_impl->options.anchor_mode);
+  if (_impl->options.outputs_not_returned.count(index) != 0u) {
+    logging::debug("Output {} ({}) is not returned to the host", index,
+                   _impl->ids[output]);
+    return;
+  }
+
+  PopartAnchorTypes anchor_mode = _impl->options.anchor_mode;
+  std::uint64_t anchor_return_period = _impl->options.anchor_return_period;
+  auto it = _impl->options.output_anchors.find(index);
+  if (it != _impl->options.output_anchors.end()) {
+    anchor_mode = it->second.first;
+    anchor_return_period = it->second.second;
+  }
+  const char *as_str = anchorTypeToString(anchor_mode);
 
   // If we are returning EveryN we need to pass in the return period.
-  if (_impl->options.anchor_mode == PopartAnchorTypes::EveryN) {
+  if (anchor_mode == PopartAnchorTypes::EveryN) {
     _impl->anchors.insert(
-        {_impl->ids[output], popart::AnchorReturnType(
-                                 as_str, _impl->options.anchor_return_period)});
+        {_impl->ids[output],
+         popart::AnchorReturnType(as_str, anchor_return_period)});
   } else {
     _impl->anchors.insert(
         {_impl->ids[output], popart::AnchorReturnType(as_str)});
@@ -1422,11 +1645,9 @@ void Compiler::setUpInputOp(poptorch::TensorId id, float *ptr,
                  static_cast<const char *>(__PRETTY_FUNCTION__));
 
   // Popart wrapper around the tensor pointer.
-  _impl->memory_manager.push_back(
-      std::make_unique<popart::NDArrayWrapper<float>>(static_cast<float *>(ptr),
-                                                      dims));
-  _impl->popart_incoming.insert(
-      {_impl->ids[id], *_impl->memory_manager.back().get()});
+  _impl->addMemoryToInput(id, ptr, dims, [&]() {
+    return std::make_unique<popart::NDArrayWrapper<float>>(ptr, dims);
+  });
 }
 
 void Compiler::setUpInputOp(poptorch::TensorId id, std::int32_t *ptr,
@@ -1435,10 +1656,9 @@ void Compiler::setUpInputOp(poptorch::TensorId id, std::int32_t *ptr,
                  static_cast<const char *>(__PRETTY_FUNCTION__));
 
   // Popart wrapper around the tensor pointer.
-  _impl->memory_manager.push_back(
-      std::make_unique<popart::NDArrayWrapper<std::int32_t>>(ptr, dims));
-  _impl->popart_incoming.insert(
-      {_impl->ids[id], *_impl->memory_manager.back().get()});
+  _impl->addMemoryToInput(id, ptr, dims, [&]() {
+    return std::make_unique<popart::NDArrayWrapper<std::int32_t>>(ptr, dims);
+  });
 }
 
 void Compiler::setUpInputOp(poptorch::TensorId id, bool *ptr,
@@ -1447,10 +1667,9 @@ void Compiler::setUpInputOp(poptorch::TensorId id, bool *ptr,
                  static_cast<const char *>(__PRETTY_FUNCTION__));
 
   // Popart wrapper around the tensor pointer.
-  _impl->memory_manager.push_back(
-      std::make_unique<popart::NDArrayWrapper<bool>>(ptr, dims));
-  _impl->popart_incoming.insert(
-      {_impl->ids[id], *_impl->memory_manager.back().get()});
+  _impl->addMemoryToInput(id, ptr, dims, [&]() {
+    return std::make_unique<popart::NDArrayWrapper<bool>>(ptr, dims);
+  });
 }
 
 void Compiler::setUpInputOp(poptorch::TensorId id, std::int16_t *ptr,
@@ -1465,49 +1684,44 @@ void Compiler::setUpInputOp(poptorch::TensorId id, std::int16_t *ptr,
   }
 
   // Popart wrapper around the tensor pointer.
-  _impl->memory_manager.push_back(
-      std::make_unique<popart::NDArrayWrapper<std::int16_t>>(
-          ptr, popart::TensorInfo(float16 ? popart::DataType::FLOAT16
-                                          : popart::DataType::INT16,
-                                  dims)));
-  _impl->popart_incoming.insert(
-      {_impl->ids[id], *_impl->memory_manager.back().get()});
+  _impl->addMemoryToInput(id, ptr, dims, [&]() {
+    return std::make_unique<popart::NDArrayWrapper<std::int16_t>>(
+        ptr, popart::TensorInfo(float16 ? popart::DataType::FLOAT16
+                                        : popart::DataType::INT16,
+                                dims));
+  });
 }
 
 void Compiler::setUpOutputOp(poptorch::TensorId id, float *ptr,
                              const std::vector<std::int64_t> &dims) {
   // Popart wrapper around the tensor pointer.
-  auto memory = std::make_unique<popart::NDArrayWrapper<float>>(
-      static_cast<float *>(ptr), dims);
-
-  _impl->addMemoryToOutput(id, ptr, std::move(memory));
+  _impl->addMemoryToOutput(id, ptr, dims, [&]() {
+    return std::make_unique<popart::NDArrayWrapper<float>>(ptr, dims);
+  });
 }
 
 void Compiler::setUpOutputOp(poptorch::TensorId id, std::int32_t *ptr,
                              const std::vector<std::int64_t> &dims) {
   // Popart wrapper around the tensor pointer.
-  auto memory = std::make_unique<popart::NDArrayWrapper<std::int32_t>>(
-      static_cast<std::int32_t *>(ptr), dims);
-
-  _impl->addMemoryToOutput(id, ptr, std::move(memory));
+  _impl->addMemoryToOutput(id, ptr, dims, [&]() {
+    return std::make_unique<popart::NDArrayWrapper<std::int32_t>>(ptr, dims);
+  });
 }
 
 void Compiler::setUpOutputOp(poptorch::TensorId id, bool *ptr,
                              const std::vector<std::int64_t> &dims) {
   // Popart wrapper around the tensor pointer.
-  auto memory = std::make_unique<popart::NDArrayWrapper<bool>>(
-      static_cast<bool *>(ptr), dims);
-
-  _impl->addMemoryToOutput(id, ptr, std::move(memory));
+  _impl->addMemoryToOutput(id, ptr, dims, [&]() {
+    return std::make_unique<popart::NDArrayWrapper<bool>>(ptr, dims);
+  });
 }
 
 void Compiler::setUpOutputOp(poptorch::TensorId id, std::int16_t *ptr,
                              const std::vector<std::int64_t> &dims) {
   // Popart wrapper around the tensor pointer.
-  auto memory = std::make_unique<popart::NDArrayWrapper<std::int16_t>>(
-      static_cast<std::int16_t *>(ptr), dims);
-
-  _impl->addMemoryToOutput(id, ptr, std::move(memory));
+  _impl->addMemoryToOutput(id, ptr, dims, [&]() {
+    return std::make_unique<popart::NDArrayWrapper<std::int16_t>>(ptr, dims);
+  });
 }
 
 void Compiler::initSession(const std::vector<Optimizer> &optimizers) {
@@ -1756,6 +1970,7 @@ void Compiler::initSession(const std::vector<Optimizer> &optimizers) {
 
   // Create the anchors, these are used to copy to the host.
   auto data_flow = popart::DataFlow(_impl->options.steps, _impl->anchors);
+  _impl->device = device;
 
   // Create the popart session object to actually run the graph.
   if (!_impl->is_training) {
@@ -1770,6 +1985,7 @@ void Compiler::initSession(const std::vector<Optimizer> &optimizers) {
     // Create the optimizer from user provided parameters.
     std::unique_ptr<popart::Optimizer> optimizer =
         _impl->getOptimizer(optimizers);
+    _impl->optimizers = optimizers;
 
     // Transform nodes which have training/inference variants. I.E BatchNorm.
     popart::GraphTransformer transformer{_impl->op_builder->getModelProto()};
@@ -1846,24 +2062,188 @@ std::unique_ptr<char[]> Compiler::getPopartIR() const {
   return stringToUniquePtr(as_string);
 }
 
+void Compiler::saveState(const char *filename,
+                         const std::vector<poptorch::TensorId> &inputs,
+                         const std::vector<poptorch::TensorId> &outputs) const {
+  logging::LogContext ctx{"Compiler::saveState"};
+  StateWriter writer(filename);
+  writer.write(state_format_version);
+  writer.write(_impl->op_builder->getModelProto());
+  writer.write(_impl->ids);
+
+  writer.write(_impl->anchors.size());
+  for (const auto &anchor : _impl->anchors) {
+    writer.write(anchor.first);
+    writer.write(anchor.second.str());
+    writer.write(static_cast<std::int64_t>(anchor.second.rp()));
+  }
+
+  writer.write(std::vector<popart::TensorId>(_impl->outputs.begin(),
+                                             _impl->outputs.end()));
+  writer.write(_impl->output_types);
+
+  const auto &weights = _impl->weights.parameterIds();
+  writer.write(weights.size());
+  for (const auto &id : weights) {
+    const popart::TensorInfo &info = _impl->weights.weight(id).info;
+    writer.write(id);
+    writer.write(info.data_type());
+    writer.write(info.shape());
+  }
+  writer.write(_impl->weight_names);
+
+  writer.write(_impl->loss);
+  writer.write(std::vector<std::uint64_t>(_impl->used_ipus.begin(),
+                                          _impl->used_ipus.end()));
+  writer.write(_impl->max_phase);
+
+  writer.write(_impl->grad_update_groups.size());
+  for (const auto &group : _impl->grad_update_groups) {
+    writer.write(group.first);
+    writer.write(group.second);
+  }
+
+  const auto &constants = _impl->hostSideConstants();
+  writer.write(constants.size());
+  for (const auto &constant : constants) {
+    writer.write(constant.first);
+    writer.write(constant.second.popartType());
+    writer.write(constant.second.shape());
+    writer.write(constant.second.data());
+  }
+
+  writer.write(inputs);
+  writer.write(outputs);
+}
+
+void Compiler::exportExecutable(const char *directory) const {
+  logging::LogContext ctx{"Compiler::exportExecutable"};
+  ERROR_ON_MSG(!_impl->session, "The session must be created first");
+  // The graph has already been compiled by initSession(): this only
+  // serialises the Poplar executable. When given a directory PopART names the
+  // file after the hash of the IR, which is what its engine cache looks for.
+  _impl->session->compileAndExport(directory);
+}
+
+std::uint64_t Compiler::numWeights() const {
+  return _impl->weight_names.size();
+}
+
+const char *Compiler::weightName(std::uint64_t index) const {
+  return _impl->weight_names.at(index).c_str();
+}
+
+void Compiler::loadState(const char *filename,
+                         std::vector<poptorch::TensorId> *inputs,
+                         std::vector<poptorch::TensorId> *outputs) {
+  logging::LogContext ctx{"Compiler::loadState"};
+  StateReader reader(filename);
+  auto version = reader.read<std::uint64_t>();
+  ERROR_ON_MSG(version != state_format_version,
+               "Unsupported executable state version " << version
+                                                       << " (Expected "
+                                                       << state_format_version
+                                                       << ")");
+
+  _impl->op_builder =
+      popart::Builder::createFromOnnxModel(reader.read<std::string>());
+  reader.read(&_impl->ids);
+
+  auto num_anchors = reader.read<std::size_t>();
+  for (std::size_t i = 0; i < num_anchors; ++i) {
+    auto id = reader.read<popart::TensorId>();
+    auto art = reader.read<std::string>();
+    auto period = reader.read<std::int64_t>();
+    // Only EveryN anchors accept a return period.
+    if (art == anchorTypeToString(PopartAnchorTypes::EveryN)) {
+      _impl->anchors.insert(
+          {id, popart::AnchorReturnType(art, static_cast<int>(period))});
+    } else {
+      _impl->anchors.insert({id, popart::AnchorReturnType(art)});
+    }
+  }
+
+  auto outputs_ids = reader.read<std::vector<popart::TensorId>>();
+  _impl->outputs.assign(outputs_ids.begin(), outputs_ids.end());
+  reader.read(&_impl->output_types);
+
+  auto num_weights = reader.read<std::size_t>();
+  for (std::size_t i = 0; i < num_weights; ++i) {
+    auto id = reader.read<popart::TensorId>();
+    auto type = reader.read<std::string>();
+    auto shape = reader.read<std::vector<std::int64_t>>();
+    _impl->weights.registerParameter(id, popart::TensorInfo{type, shape});
+  }
+  reader.read(&_impl->weight_names);
+
+  reader.read(&_impl->loss);
+  auto used_ipus = reader.read<std::vector<std::uint64_t>>();
+  _impl->used_ipus.insert(used_ipus.begin(), used_ipus.end());
+  reader.read(&_impl->max_phase);
+
+  auto num_groups = reader.read<std::size_t>();
+  for (std::size_t i = 0; i < num_groups; ++i) {
+    auto group = reader.read<std::uint64_t>();
+    reader.read(&_impl->grad_update_groups[group]);
+  }
+
+  auto num_constants = reader.read<std::size_t>();
+  for (std::size_t i = 0; i < num_constants; ++i) {
+    auto id = reader.read<poptorch::TensorId>();
+    auto type = reader.read<PopartType>();
+    auto shape = reader.read<std::vector<std::int64_t>>();
+    auto data = reader.read<std::vector<std::uint8_t>>();
+    _impl->addHostSideConstant(
+        id, HostSideConstant(type, data.data(), data.size(), shape));
+  }
+
+  reader.read(inputs);
+  reader.read(outputs);
+}
+
 // Write the weights into IPU memory from the pytorch tensor buffers in the
 // model.
 void Compiler::copyWeightsToDevice(const std::vector<void *> &host_buffers) {
   logging::info("Writing weights from host to IPU memory.");
+  bool partial = std::any_of(host_buffers.begin(), host_buffers.end(),
+                             [](void *ptr) { return ptr == nullptr; });
+  if (partial && _impl->is_training && !_impl->host_weights_fresh) {
+    // All the weights are sent to the device: make sure the ones which are
+    // not being updated are not reverted to a stale host copy.
+    _impl->session->weightsToHost();
+  }
   _impl->weights.updateData(host_buffers);
   _impl->session->writeWeights(_impl->weights);
   _impl->session->weightsFromHost();
+  // The whole host copy was uploaded.
+  _impl->host_weights_fresh = true;
 }
 
 // Read the weights from IPU memory into the pytorch tensor buffers.
 void Compiler::copyWeightsToHost(const std::vector<void *> &host_buffers) {
   logging::info("Writing weights from IPU to host.");
-  _impl->session->weightsToHost();
+  // Only download the weights once after each run: the following calls
+  // (e.g. reading the weights one at a time) only read PopART's host copy.
+  if (!_impl->host_weights_fresh) {
+    logging::debug("Downloading the weights from the IPU.");
+    _impl->session->weightsToHost();
+    _impl->host_weights_fresh = true;
+  }
   _impl->weights.updateData(host_buffers);
   _impl->session->readWeights(_impl->weights);
 }
 
+void Compiler::detachFromDevice() {
+  if (_impl->device) {
+    logging::debug("Detaching from device Id {}.", _impl->device->getId());
+    _impl->device->detach();
+    _impl->device.reset();
+  }
+}
+
 void Compiler::run(const std::vector<Optimizer> &optimizers) {
+  ERROR_ON_MSG(!_impl->device && _impl->session,
+               "The executable has been detached from its device");
   if (!optimizers.empty() && _impl->is_training) {
     std::unique_ptr<popart::Optimizer> optimizer =
         _impl->getOptimizer(optimizers);
@@ -1872,11 +2252,19 @@ void Compiler::run(const std::vector<Optimizer> &optimizers) {
     popart::TrainingSession &session =
         dynamic_cast<popart::TrainingSession &>(*_impl->session);
     session.updateOptimizerFromHost(optimizer.get());
+    _impl->optimizers = optimizers;
   }
 
   // Execute the model on IPU.
+  // Note: the StepIO keeps track of how much data has been consumed /
+  // produced for each tensor during the run so it can't be reused, however
+  // the popart wrappers around the host buffers it references are.
   popart::StepIO stepio(_impl->popart_incoming, _impl->popart_outgoing);
   _impl->session->run(stepio);
+  if (_impl->is_training) {
+    // The weights on the device have been updated.
+    _impl->host_weights_fresh = false;
+  }
 
   // In case several outputs point at the same tensor: duplicate the data
   for (const auto &out : _impl->outgoing_duplicates) {
@@ -1887,12 +2275,23 @@ void Compiler::run(const std::vector<Optimizer> &optimizers) {
                       popart::getDataTypeInfoMap().at(src.dataType()).nbytes());
     }
   }
-  // The buffers handle the communication between pytorch and popart, we set
-  // them up each run.
-  _impl->popart_incoming.clear();
-  _impl->popart_outgoing.clear();
+  // The bindings between the popart tensors and the host buffers are kept
+  // for the next run: only the duplicates need to be set up again.
   _impl->outgoing_duplicates.clear();
-  _impl->memory_manager.clear();
+  _impl->outputs_bound.clear();
+}
+
+std::vector<Optimizer> Compiler::updateOptimizers(
+    const std::map<std::uint64_t, Optimizer::ParamList> &params) const {
+  std::vector<Optimizer> optimizers = _impl->optimizers;
+  for (const auto &group : params) {
+    ERROR_ON_MSG(group.first >= optimizers.size(),
+                 "Invalid optimizer group " << group.first);
+    for (const auto &param : group.second) {
+      optimizers[group.first].setParam(param.first, param.second);
+    }
+  }
+  return optimizers;
 }
 
 poptorch::PopartType Compiler::getPopartType(poptorch::TensorId id) const {
@@ -1999,6 +2398,11 @@ std::uint64_t Compiler::popartBatchDim() const {
          _impl->popart_options.accumulationFactor;
 }
 
+bool Compiler::isReturnedToHost(poptorch::TensorId id) const {
+  return isHostSideConstant(id) ||
+         _impl->anchors.find(_impl->ids[id]) != _impl->anchors.end();
+}
+
 std::uint64_t Compiler::popartBatchDimForAnchor(poptorch::TensorId id) const {
   if (isHostSideConstant(id)) {
     return 1; // Cannot be batched as it is a constant
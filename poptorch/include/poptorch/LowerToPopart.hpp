@@ -25,6 +25,14 @@ lowerToPopart(torch::jit::Graph *graph, std::vector<at::Tensor> *in_tensors,
               std::vector<std::string> parameter_names, bool training,
               std::vector<Optimizer> &&opt, const SessionOptions &options);
 
+/*
+ * Create an executable from a state saved by PoplarExecutable::saveState()
+ * instead of lowering a graph.
+ */
+std::shared_ptr<poptorch::PoplarExecutable>
+loadFromState(const std::string &filename, bool training,
+              std::vector<Optimizer> &&opt, const SessionOptions &options);
+
 } // namespace poptorch
 
 #endif // INCLUDE_POPTORCH_LOWER_TO_POPART_H
@@ -16,6 +16,8 @@ namespace poptorch {
 
 class PoplarExecutable {
 public:
+  using NamedBuffer = std::pair<std::string, void *>;
+
   PoplarExecutable() = delete;
   PoplarExecutable(poptorch::Compiler &&c,
                    std::vector<poptorch::TensorId> &&inputs,
@@ -28,37 +30,87 @@ public:
     for (size_t i = 0; i < inputs.size(); i++) {
       _converted_inputs.emplace_back();
     }
+    for (size_t i = 0; i < _parameter_names.size(); i++) {
+      _parameter_indices[_parameter_names[i]] = i;
+    }
   }
 
   /*
    * Execute the compiled graph stored in field "compiler" with the given
    * |inTensors| and return to the user the resulting tensors if any.
+   * If |outTensors| is not empty the results are written to these tensors
+   * instead of newly allocated ones.
    */
   std::vector<at::IValue> run(std::vector<at::Tensor> *inTensors,
-                              const std::vector<Optimizer> &optimizer);
+                              const std::vector<Optimizer> &optimizer,
+                              const std::vector<at::Tensor> &outTensors = {});
+
+  // Keep |depth| sets of output tensors and reuse them in rotation for the
+  // runs which don't provide their own output tensors.
+  // (0 means allocate new output tensors for every run).
+  void setOutputBufferPoolDepth(std::size_t depth);
 
   // Tell popart to copy weights off the IPU and write into host memory.
-  void copyWeightsToHost(const std::map<std::string, void *> &buffers);
+  // Only the weights present in |buffers| are copied.
+  void copyWeightsToHost(const std::vector<NamedBuffer> &buffers);
 
   // Tell popart to copy weights from host into IPU memory.
-  void copyWeightsToDevice(const std::map<std::string, void *> &buffers);
+  // Only the weights present in |buffers| are copied.
+  void copyWeightsToDevice(const std::vector<NamedBuffer> &buffers);
 
   const std::vector<OutputType> &outputTypes() const;
 
+  // Release the IPUs used by this executable. (See
+  // Compiler::detachFromDevice)
+  void detachFromDevice();
+
+  // Return the current optimizers with the hyperparameters in |params|
+  // updated. (See Compiler::updateOptimizers)
+  std::vector<Optimizer> updateOptimizers(
+      const std::map<std::uint64_t, Optimizer::ParamList> &params) const;
+
+  // Save the state needed to re-create this executable without lowering the
+  // graph again to |filename|. (See poptorch::loadFromState)
+  void saveState(const std::string &filename) const;
+
+  // Write the Poplar executable to |directory| so that it can be loaded by
+  // PopART's engine cache.
+  void exportExecutable(const std::string &directory) const;
+
   // Get the IR from popart.
   std::string getPopartIR() const;
 
 private:
+  // Return the host buffers in the order expected by the compiler: nullptr
+  // for the weights not present in |buffers|.
+  std::vector<void *> orderedBuffers(const std::vector<NamedBuffer> &buffers);
+
+  // Convert |tensor| to |type| using the conversion buffer associated to the
+  // input |index|.
+  const at::Tensor &convertInput(std::size_t index, const at::Tensor &tensor,
+                                 at::ScalarType type);
+
+  // Return a tensor from the output pool if there is one available or a
+  // newly allocated one otherwise.
+  at::Tensor getOutputBuffer(std::size_t index,
+                             const std::vector<std::int64_t> &dims);
+
   poptorch::Compiler _compiler;
 
   std::vector<poptorch::TensorId> _popart_inputs;
 
-  // Used for types which need conversion to maintain the ref count
+  // Used for types which need conversion: one buffer per input, reused
+  // between runs as long as the shape of the input doesn't change.
   std::vector<at::Tensor> _converted_inputs;
 
   std::vector<poptorch::TensorId> _popart_outputs;
   std::vector<at::ScalarType> _popart_output_types;
   const std::vector<std::string> _parameter_names;
+  std::unordered_map<std::string, std::size_t> _parameter_indices;
+
+  // Sets of output tensors reused between runs.
+  std::vector<std::vector<at::Tensor>> _output_pool;
+  std::size_t _next_output_set = 0;
 };
 
 } // namespace poptorch
@@ -263,7 +263,10 @@ std::shared_ptr<poptorch::PoplarExecutable> LowerToPopart::compile() {
 
   std::vector<at::ScalarType> data_types;
   for (auto id : _outputTensorHooks) {
-    data_types.emplace_back(fromPopartType(_compiler.getPopartType(id)));
+    // The outputs which are not returned might have been pruned.
+    data_types.emplace_back(_compiler.isReturnedToHost(id)
+                                ? fromPopartType(_compiler.getPopartType(id))
+                                : at::ScalarType::Undefined);
   }
 
   return std::make_shared<poptorch::PoplarExecutable>(
@@ -865,4 +868,37 @@ lowerToPopart(torch::jit::Graph *graph, std::vector<at::Tensor> *in_tensors,
   return executable;
 }
 
+std::shared_ptr<poptorch::PoplarExecutable>
+loadFromState(const std::string &filename, bool training,
+              std::vector<Optimizer> &&opt, const SessionOptions &options) {
+  logging::LogContext ctx("loadFromState");
+  poptorch::Compiler compiler{training, options};
+  std::vector<poptorch::TensorId> inputs;
+  std::vector<poptorch::TensorId> outputs;
+  compiler.loadState(filename.c_str(), &inputs, &outputs);
+
+  std::vector<std::string> parameter_names;
+  for (std::uint64_t i = 0; i < compiler.numWeights(); ++i) {
+    parameter_names.emplace_back(compiler.weightName(i));
+  }
+
+  // Init the session, this also involves compiling to poplar.
+  compiler.initSession(opt);
+
+  std::vector<at::ScalarType> data_types;
+  for (auto id : outputs) {
+    data_types.emplace_back(compiler.isReturnedToHost(id)
+                                ? fromPopartType(compiler.getPopartType(id))
+                                : at::ScalarType::Undefined);
+  }
+
+  auto executable = std::make_shared<poptorch::PoplarExecutable>(
+      std::move(compiler), std::move(inputs), std::move(outputs),
+      std::move(data_types), std::move(parameter_names));
+  if (logging::outputPopartIR()) {
+    logging::debug("Popart IR: {}", executable->getPopartIR());
+  }
+  return executable;
+}
+
 } // namespace poptorch
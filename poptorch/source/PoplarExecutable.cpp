@@ -16,7 +16,8 @@ namespace poptorch {
 
 std::vector<at::IValue>
 PoplarExecutable::run(std::vector<at::Tensor> *inTensors,
-                      const std::vector<Optimizer> &optimizers) {
+                      const std::vector<Optimizer> &optimizers,
+                      const std::vector<at::Tensor> &outTensors) {
   std::vector<at::Tensor> tensor_views;
 
   // Set up the input tensors in the poplar graph to point to the incoming
@@ -62,17 +63,19 @@ PoplarExecutable::run(std::vector<at::Tensor> *inTensors,
                              popart_dims);
       break;
     case at::ScalarType::Long:
-      _converted_inputs[i] = pytorch_tensor.toType(at::ScalarType::Int);
       _compiler.setUpInputOp(
           popart_id,
-          static_cast<std::int32_t *>(_converted_inputs[i].data_ptr()),
+          static_cast<std::int32_t *>(
+              convertInput(i, pytorch_tensor, at::ScalarType::Int).data_ptr()),
           popart_dims);
       break;
     case at::ScalarType::Double:
     case at::ScalarType::BFloat16:
-      _converted_inputs[i] = pytorch_tensor.toType(at::ScalarType::Float);
       _compiler.setUpInputOp(
-          popart_id, static_cast<float *>(_converted_inputs[i].data_ptr()),
+          popart_id,
+          static_cast<float *>(
+              convertInput(i, pytorch_tensor, at::ScalarType::Float)
+                  .data_ptr()),
           popart_dims);
       break;
     default:
@@ -81,6 +84,12 @@ PoplarExecutable::run(std::vector<at::Tensor> *inTensors,
     }
   }
 
+  ERROR_ON_MSG(!outTensors.empty() &&
+                   outTensors.size() != _popart_outputs.size(),
+               "Expected " << _popart_outputs.size()
+                           << " output tensors but got "
+                           << outTensors.size());
+
   // Temp buffers for the output state.
   std::vector<at::IValue> returnees;
   returnees.reserve(_popart_outputs.size());
@@ -88,6 +97,11 @@ PoplarExecutable::run(std::vector<at::Tensor> *inTensors,
   // Set up the outputs.
   for (size_t i = 0; i < _popart_outputs.size(); i++) {
     poptorch::TensorId &popart_id(_popart_outputs[i]);
+    if (!_compiler.isReturnedToHost(popart_id)) {
+      // Returned as None.
+      returnees.emplace_back();
+      continue;
+    }
     std::vector<std::int64_t> dims = _compiler.getSize(popart_id);
 
     std::uint64_t b_dim = _compiler.popartBatchDimForAnchor(popart_id);
@@ -100,10 +114,28 @@ PoplarExecutable::run(std::vector<at::Tensor> *inTensors,
       dims[0] *= b_dim;
     }
 
-    // Create the torch tensor and use its memory for the popart tensor.
+    // Use the tensor provided by the user if any, otherwise create a torch
+    // tensor (or reuse one from the pool) and use its memory for the popart
+    // tensor.
     at::ScalarType type = _popart_output_types[i];
-    returnees.emplace_back(at::empty(
-        {dims}, at::dtype(type).memory_format(c10::MemoryFormat::Contiguous)));
+    if (outTensors.empty()) {
+      returnees.emplace_back(getOutputBuffer(i, dims));
+    } else {
+      const at::Tensor &out = outTensors[i];
+      ERROR_ON_MSG(out.scalar_type() != type,
+                   "Output tensor " << i << " has type torch."
+                                    << torch::getTHPDtype(out.scalar_type())->name
+                                    << " but torch."
+                                    << torch::getTHPDtype(type)->name
+                                    << " was expected");
+      ERROR_ON_MSG(out.sizes() != at::IntArrayRef(dims),
+                   "Output tensor " << i << " has shape " << out.sizes()
+                                    << " but " << at::IntArrayRef(dims)
+                                    << " was expected");
+      ERROR_ON_MSG(!out.is_contiguous(),
+                   "Output tensor " << i << " is not contiguous");
+      returnees.emplace_back(out);
+    }
 
     auto data_ptr = returnees.back().toTensor().data_ptr();
 
@@ -128,36 +160,103 @@ PoplarExecutable::run(std::vector<at::Tensor> *inTensors,
     }
   }
 
+  if (outTensors.empty() && !_output_pool.empty()) {
+    _next_output_set = (_next_output_set + 1) % _output_pool.size();
+  }
+
   // Execute the compiled poplar graph.
   _compiler.run(optimizers);
 
   return returnees;
 }
 
+const at::Tensor &PoplarExecutable::convertInput(std::size_t index,
+                                                const at::Tensor &tensor,
+                                                at::ScalarType type) {
+  at::Tensor &converted = _converted_inputs[index];
+  // Reuse the buffer from the previous run if it has the right shape and type.
+  if (!converted.defined() || converted.sizes() != tensor.sizes() ||
+      converted.scalar_type() != type) {
+    converted = at::empty(
+        tensor.sizes(),
+        at::dtype(type).memory_format(c10::MemoryFormat::Contiguous));
+  }
+  // Note: the copy kernel is split across the intra-op thread pool for large
+  // tensors.
+  converted.copy_(tensor);
+  return converted;
+}
+
+void PoplarExecutable::setOutputBufferPoolDepth(std::size_t depth) {
+  _output_pool.clear();
+  _output_pool.resize(depth,
+                      std::vector<at::Tensor>(_popart_outputs.size()));
+  _next_output_set = 0;
+}
+
+at::Tensor
+PoplarExecutable::getOutputBuffer(std::size_t index,
+                                  const std::vector<std::int64_t> &dims) {
+  auto options = at::dtype(_popart_output_types[index])
+                     .memory_format(c10::MemoryFormat::Contiguous);
+  if (_output_pool.empty()) {
+    return at::empty({dims}, options);
+  }
+
+  // Only reuse a buffer if nothing outside the pool references the tensor
+  // or its storage (e.g a view): otherwise replace it with a new one.
+  at::Tensor &buffer = _output_pool[_next_output_set][index];
+  if (!buffer.defined() || buffer.use_count() > 1 ||
+      buffer.storage().use_count() > 1) {
+    buffer = at::empty({dims}, options);
+  }
+  return buffer;
+}
+
+std::vector<void *>
+PoplarExecutable::orderedBuffers(const std::vector<NamedBuffer> &buffers) {
+  std::vector<void *> pointers(_parameter_names.size(), nullptr);
+  for (const NamedBuffer &buffer : buffers) {
+    auto it = _parameter_indices.find(buffer.first);
+    // Parameters which are not used by the graph are not in the executable.
+    if (it != _parameter_indices.end()) {
+      pointers[it->second] = buffer.second;
+    }
+  }
+  return pointers;
+}
+
 // Tell popart to copy weights off the IPU and write into host memory.
 void PoplarExecutable::copyWeightsToHost(
-    const std::map<std::string, void *> &buffers) {
-  std::vector<void *> pointers;
-  for (const std::string &name : _parameter_names) {
-    pointers.push_back(buffers.at(name));
-  }
-  _compiler.copyWeightsToHost(pointers);
+    const std::vector<NamedBuffer> &buffers) {
+  _compiler.copyWeightsToHost(orderedBuffers(buffers));
 }
 
 // Tell popart to copy weights from host into IPU memory.
 void PoplarExecutable::copyWeightsToDevice(
-    const std::map<std::string, void *> &buffers) {
-  std::vector<void *> pointers;
-  for (const std::string &name : _parameter_names) {
-    pointers.push_back(buffers.at(name));
-  }
-  _compiler.copyWeightsToDevice(pointers);
+    const std::vector<NamedBuffer> &buffers) {
+  _compiler.copyWeightsToDevice(orderedBuffers(buffers));
+}
+
+std::vector<Optimizer> PoplarExecutable::updateOptimizers(
+    const std::map<std::uint64_t, Optimizer::ParamList> &params) const {
+  return _compiler.updateOptimizers(params);
 }
 
 const std::vector<OutputType> &PoplarExecutable::outputTypes() const {
   return _compiler.outputTypes();
 }
 
+void PoplarExecutable::saveState(const std::string &filename) const {
+  _compiler.saveState(filename.c_str(), _popart_inputs, _popart_outputs);
+}
+
+void PoplarExecutable::exportExecutable(const std::string &directory) const {
+  _compiler.exportExecutable(directory.c_str());
+}
+
+void PoplarExecutable::detachFromDevice() { _compiler.detachFromDevice(); }
+
 std::string PoplarExecutable::getPopartIR() const {
   auto managed_ptr = _compiler.getPopartIR();
   const char *raw_ptr = static_cast<const char *>(managed_ptr.get());
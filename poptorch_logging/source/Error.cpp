@@ -5,7 +5,8 @@
 namespace logging {
 
 std::string &getContext() {
-  static std::string log_context;
+  // Each thread has its own context as models can be compiled in parallel.
+  static thread_local std::string log_context;
   return log_context;
 }
 
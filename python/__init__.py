@@ -1,5 +1,9 @@
 # Copyright (c) 2020 Graphcore Ltd. All rights reserved.
 import atexit
+import concurrent.futures
+import copy
+import os
+import tempfile
 
 import torch
 import torch.nn as nn
@@ -17,9 +21,11 @@ from . import _impl
 from .enums import *
 from .ops import *
 from .options import *
-from ._impl import PoplarExecutor
+from ._impl import PoplarExecutor, PrecompiledExecutor, BucketedExecutor
 from . import optim
 from . import profiling
+from . import serving
+from . import metrics
 
 __version__ = "@VERSION@-@SNAPSHOT@"
 
@@ -61,6 +67,29 @@ class _SubDataset:
     def __getitem__(self, index):
         return self._dataset[index + self._offset]
 
+    def __getitems__(self, indices):
+        return self._dataset.__getitems__(
+            [index + self._offset for index in indices])
+
+
+class _BatchedDataset:
+    """Fetch a whole batch with a single call to the dataset's
+    ``__getitems__()``.
+
+    The DataLoader passes the list of indices of the batch to
+    ``__getitem__()``.
+    """
+
+    def __init__(self, dataset, collate_fn):
+        self._dataset = dataset
+        self._collate_fn = collate_fn
+
+    def __len__(self):
+        return len(self._dataset)
+
+    def __getitem__(self, indices):
+        return self._collate_fn(self._dataset.__getitems__(indices))
+
 
 class DataLoader(torch.utils.data.DataLoader):
     """ Thin wrapper around the traditional `torch.utils.data.DataLoader` to
@@ -97,6 +126,11 @@ class DataLoader(torch.utils.data.DataLoader):
             If None (default): enabled if num_workers > 0, disabled otherwise.
         :param kwargs: Other options to pass to the Torch's DataLoader's
             constructor.
+
+        .. note:: If the dataset implements ``__getitems__(indices)``,
+            returning the list of samples for the given list of indices,
+            it is called once per combined batch instead of calling
+            ``__getitem__()`` for each sample.
         """
         assert isinstance(options, Options)
         if persistent_workers is None:
@@ -115,6 +149,12 @@ class DataLoader(torch.utils.data.DataLoader):
         # __getitem__ and __len__
         self._is_iterable = isinstance(dataset,
                                        torch.utils.data.IterableDataset)
+        # Fetch all the samples of a batch at once if the dataset supports it
+        # (Unless the sampling is customised)
+        fetch_batches = not self._is_iterable and hasattr(
+            dataset, "__getitems__"
+        ) and self._combined_batch_size is not None and not any(
+            arg in kwargs for arg in ("sampler", "batch_sampler"))
 
         if self._is_iterable:
             assert options.Distributed.numProcesses == 1, (
@@ -158,12 +198,30 @@ class DataLoader(torch.utils.data.DataLoader):
         # _RepeatSampler instead.
         if self._is_iterable and persistent_workers:
             dataset = _RepeatSampler(dataset, self._is_iterable)
+        batch_size = self._combined_batch_size
+        if fetch_batches:
+            # Sample whole batches of indices and pass them to the dataset
+            # without any automatic batching from the DataLoader.
+            if shuffle:
+                sampler = torch.utils.data.RandomSampler(
+                    dataset, generator=kwargs.get("generator"))
+            else:
+                sampler = torch.utils.data.SequentialSampler(dataset)
+            kwargs["sampler"] = torch.utils.data.BatchSampler(
+                sampler, batch_size, drop_last)
+            dataset = _BatchedDataset(
+                dataset,
+                kwargs.pop("collate_fn", None)
+                or torch.utils.data.dataloader.default_collate)
+            batch_size = None
+            shuffle = False
+            drop_last = False
         if not self._is_iterable:
             dataset = profiling.Channel("dataset").instrument(
                 dataset, "__getitem__")
 
         super().__init__(dataset,
-                         batch_size=self._combined_batch_size,
+                         batch_size=batch_size,
                          shuffle=shuffle,
                          num_workers=num_workers,
                          drop_last=drop_last,
@@ -240,6 +298,10 @@ class AsynchronousDataAccessor:
     the worker thread will be filling the unready elements of the ring
     buffer.
 
+    The elements are returned with the same structure as the ones of the
+    dataset. Their tensors are views of the ring buffer which are reused for
+    the following elements but their containers are new for every element.
+
     .. important:: In order to avoid hanging issues related to ``OpenMP`` and
         ``fork()`` the ``AsynchronousDataAccessor`` uses the ``spawn`` start
         method which means your dataset must be serializable by ``pickle``.
@@ -250,16 +312,52 @@ class AsynchronousDataAccessor:
     def __init__(self,
                  dataset,
                  buffer_size=3,
-                 miss_sleep_time_in_ms=0.1,
-                 load_indefinitely=True):
+                 miss_sleep_time_in_ms=100,
+                 load_indefinitely=True,
+                 num_workers=1,
+                 ordered=True,
+                 max_shapes=None,
+                 collate_into=None):
         """
         :param dataset: The dataset to pull data from, this can be any Python
-            iterable.
-        :param buffer_size: The size of the ring buffer.
-        :param miss_sleep_time_in_ms: When the buffer is full how long should
-            we sleep the worker before checking again.
+            iterable. Its elements can be tensors or tuples, lists and dicts
+            of tensors, nested in any way. They must all have the same
+            structure and, unless ``max_shapes`` is used, the same shapes.
+        :param buffer_size: The size of the ring buffer. It is rounded up to
+            a multiple of ``num_workers``.
+        :param miss_sleep_time_in_ms: The worker waits for the host to
+            release an element when the buffer is full and the host waits
+            for the worker when it is empty. This is how long either of them
+            can block before checking the other one is still running.
         :param load_indefinitely: If True when we hit the end of the dataset
             we will just loop round again.
+        :param num_workers: The number of worker processes loading the data.
+            Element ``i`` of the dataset is loaded by worker
+            ``i % num_workers``: map-style datasets (which implement
+            ``__getitem__`` and ``__len__``) are split by index and
+            DataLoaders by batch. IterableDatasets must only return their
+            own elements to each worker: see
+            :py:func:`~poptorch.asynchronousWorkerInfo`. Other iterables
+            can't be used with several workers.
+        :param ordered: If True the elements are returned in the order of the
+            dataset, otherwise they are returned as soon as any worker
+            has loaded them.
+        :param max_shapes: The maximum shapes of the tensors whose shape can
+            change from one element to the next (for example the last batch
+            of a dataset or sequences of variable length). Same structure as
+            the elements of the dataset with the maximum shape of each of
+            these tensors (or None if its shape doesn't change) in place of
+            the tensor. The elements are returned as views of the first
+            elements of the maximum shape buffers, without any copy.
+        :param collate_into: A function ``collate_into(slot, samples)``
+            writing a batch straight into the shared memory, instead of
+            having the worker copy the batch built by the dataset into it.
+            In this case the elements of ``dataset`` are the lists of samples
+            to collate and ``slot`` is the element of the ring buffer to
+            fill: a structure of tensors identical to the one returned for
+            the first batch, which is collated using PyTorch's
+            ``default_collate`` to allocate the ring buffer. The function
+            must be serializable by ``pickle``.
         """
 
         # To avoid hangs when the application exits: implicitly call terminate().
@@ -270,7 +368,9 @@ class AsynchronousDataAccessor:
         self._worker = None
         self._worker = _impl.AsynchronousWorker(buffer_size,
                                                 miss_sleep_time_in_ms, dataset,
-                                                load_indefinitely)
+                                                load_indefinitely, num_workers,
+                                                ordered, max_shapes,
+                                                collate_into)
 
     def terminate(self):
         """
@@ -293,10 +393,9 @@ class AsynchronousDataAccessor:
         # We return shared memory to the user so we can't tell the worker to
         # refill it until the next item is requested.
         self._worker.releaseElement()
-        while not self._worker.endOfFile():
-            data = self._worker.acquireElementIfAvailable()
-            if data is not None:
-                return data
+        data = self._worker.acquireElement()
+        if data is not None:
+            return data
 
         self._worker.assertNoError()
         # EOF event
@@ -348,6 +447,165 @@ def inferenceModel(model, options=None):
     return PoplarExecutor(model=model, options=options, training=False)
 
 
+def bucketedInferenceModel(model, buckets, options=None, dim=1, pad_value=0):
+    """Create a PopTorch inference model which accepts inputs of variable
+    size along one dimension (e.g. the sequence length in NLP models).
+
+    One executable is compiled per bucket, the first time it is used or
+    up front using :py:meth:`~poptorch.BucketedExecutor.compile`. The
+    inputs of each call are padded with ``pad_value`` to the smallest bucket
+    which fits them and the outputs which have the size of the bucket along
+    ``dim`` are sliced back to the size of the inputs.
+
+    .. warning:: Each executable is attached to its own IPUs.
+
+    :param torch.nn.Module model: The PyTorch model to wrap.
+    :param buckets: Sizes to compile the model for.
+    :type buckets: list(int)
+    :param poptorch.Options options: The IPU specific options, shared by
+        all the buckets.
+    :param int dim: Dimension of the inputs which has a variable size. All
+        the input tensors with this dimension must have the same size along
+        it. The other inputs are passed unchanged.
+    :param pad_value: Value used to pad the inputs.
+    :returns: The :py:class:`poptorch.BucketedExecutor` wrapper to use in
+        place of ``model``.
+    """
+    return BucketedExecutor(model, buckets, options, dim, pad_value)
+
+
+def saveExecutable(model, path):
+    """Save a compiled model to a file which can be loaded by
+    :py:func:`poptorch.loadExecutable` in another process.
+
+    The file contains the Poplar executable, the lowered graph and the
+    current weights of the model: it can be loaded without the source of the
+    model and without compiling it again. This can be combined with
+    :py:func:`poptorch.Options.useOfflineIpuTarget` to compile models on
+    machines without IPUs.
+
+    :param poptorch.PoplarExecutor model: Compiled model to save.
+    :param str path: File to write the model to.
+    """
+    _impl.saveExecutable(model, path)
+
+
+def loadExecutable(path, options=None):
+    """Load a model saved by :py:func:`poptorch.saveExecutable`.
+
+    :param str path: File to load the model from.
+    :param poptorch.Options options: Options to use to run the model.
+        The device iterations, replication factor, gradient accumulation and
+        anchor mode must match the ones used to compile the model.
+        By default the options used to compile the model are used.
+    :returns: A :py:class:`poptorch.PrecompiledExecutor` to use like the
+        original model.
+    """
+    return _impl.loadExecutable(path, options)
+
+
+def _compileVariant(model, options, example_inputs, optimizer, path):
+    """Compile and save one of the variants of compileMany()
+
+    Runs in a worker process.
+    """
+    if optimizer is None:
+        executor = inferenceModel(model, options)
+    else:
+        executor = trainingModel(model, options, optimizer)
+    executor.compile(*example_inputs)
+    saveExecutable(executor, path)
+    executor.destroy()
+    return path
+
+
+def compileMany(model,
+                variants,
+                workers=None,
+                optimizer=None,
+                ipu_version=1,
+                directory=None):
+    """Compile several variants of a model in parallel, each in its own
+    process, for an offline IPU target.
+
+    This is useful to compile a model for several batch sizes, replication
+    factors, etc.: the total compilation time then scales with the number of
+    CPU cores available.
+
+    If executable caching is enabled in the options of a variant then the
+    cache is populated too: compiling the same model with the same options
+    and inputs afterwards will load it from the cache.
+
+    >>> paths = poptorch.compileMany(model, [(opts_bs1, (torch.rand(1, 3),)),
+    ...                                      (opts_bs4, (torch.rand(4, 3),))])
+    >>> model_bs4 = poptorch.loadExecutable(paths[1])
+
+    :param torch.nn.Module model: The PyTorch model to compile: it must be
+        picklable.
+    :param variants: List of ``(options, example_inputs)`` tuples where
+        ``example_inputs`` is the tuple of arguments to pass to the model.
+    :type variants: list(tuple(poptorch.Options, tuple))
+    :param int workers: Maximum number of processes to use. (Default: number
+        of CPUs)
+    :param torch.optim.Optimizer optimizer: If set, compile training models
+        using this optimizer. Otherwise compile inference models.
+    :param int ipu_version: IPU version to target if the options don't
+        already use an offline target. (See
+        :py:func:`~poptorch.Options.useOfflineIpuTarget`)
+    :param str directory: Directory where to save the executables. By
+        default a new temporary directory is created: it is up to the caller
+        to delete it.
+    :returns: The paths of the executables, in the same order as
+        ``variants``, to load with :py:func:`poptorch.loadExecutable`.
+    """
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix="poptorch_")
+    os.makedirs(directory, exist_ok=True)
+
+    jobs = []
+    for index, (options, example_inputs) in enumerate(variants):
+        # Don't modify the user's options: they might be used to run the
+        # executables.
+        options = copy.deepcopy(options) if options else Options()
+        if options.connection_type != ConnectionType.Never.value:
+            options.useOfflineIpuTarget(ipu_version)
+        if isinstance(example_inputs, torch.Tensor):
+            example_inputs = (example_inputs, )
+        jobs.append((options, tuple(example_inputs),
+                     os.path.join(directory, "variant%d.poptorch" % index)))
+
+    # Fork isn't safe once Poplar has been initialised.
+    context = torch.multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(_compileVariant, model, options, example_inputs,
+                        optimizer, path)
+            for options, example_inputs, path in jobs
+        ]
+        return [f.result() for f in futures]
+
+
+def asynchronousWorkerInfo():
+    """Information about the :py:class:`~poptorch.AsynchronousDataAccessor`
+    worker process the dataset is being iterated in, similar to
+    ``torch.utils.data.get_worker_info()``.
+
+    When several workers are used, an ``IterableDataset`` must use it to only
+    return the elements whose index modulo ``num_workers`` is ``id``.
+
+    >>> def __iter__(self):
+    ...     info = poptorch.asynchronousWorkerInfo()
+    ...     start, step = (info.id, info.num_workers) if info else (0, 1)
+    ...     for index in range(start, len(self._files), step):
+    ...         yield decode(self._files[index])
+
+    :returns: An object with the attributes ``id`` and ``num_workers`` or
+        None if not called from a worker process.
+    """
+    return _impl.asynchronousWorkerInfo()
+
+
 def ipuHardwareIsAvailable():
     """Indicates whether IPU hardware is available to use.
 
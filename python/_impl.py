@@ -1,11 +1,17 @@
 # Copyright (c) 2020 Graphcore Ltd. All rights reserved.
 
+import collections
+import concurrent.futures
+import copy
 import enum
+import hashlib
 import io
+import itertools
 import os
 import sys
-import time
 import inspect
+import tempfile
+import threading
 import torch
 import torch.multiprocessing as multiprocessing
 
@@ -18,6 +24,12 @@ from ._logging import logger
 from .options import Options
 
 
+# The execution strategies (and so their stages manager) can be shared
+# between models which might be compiled in different threads
+# (See PoplarExecutor.compileAsync): only trace one model at a time.
+_tracing_lock = threading.Lock()
+
+
 def apply_optimizer(optimizer):
     num_groups = len(optimizer.param_groups)
     for index in range(0, num_groups):
@@ -158,10 +170,126 @@ def _convertOptimizerToDict(optimizer):
     return the_dict
 
 
+def _diffOptimizerDicts(old, new):
+    """Return the subset of ``new`` which differs from ``old``.
+
+    If anything other than the per-group hyperparameters changed then the
+    whole of ``new`` is returned: the backend will then rebuild the optimizer
+    from scratch instead of updating the existing one.
+    """
+    # Global settings are stored using string keys, groups using int keys.
+    if any(new.get(k) != old.get(k)
+           for k in set(new).union(old) if isinstance(k, str)):
+        return new
+    diff = {}
+    for group, params in new.items():
+        if isinstance(group, str):
+            continue
+        old_params = old[group]
+        changed = {
+            name: value
+            for name, value in params.items()
+            if old_params.get(name) != value
+        }
+        if changed:
+            diff[group] = changed
+    return diff
+
+
+def _learningRates(optimizer):
+    """Return the learning rate of each group of an optimizer dictionary."""
+    return [
+        optimizer[group]["lr"][0] for group in range(optimizer["num_groups"])
+    ]
+
+
+def _mergeOptimizerUpdates(pending, update):
+    """Merge two consecutive updates returned by _diffOptimizerDicts()."""
+    if not pending or "optimizer_type" in update:
+        return update
+    if "optimizer_type" in pending:
+        # The pending update is a full optimizer: update it in place.
+        merged = dict(pending)
+        for group, params in update.items():
+            merged[group] = {**merged[group], **params}
+        return merged
+    merged = dict(pending)
+    for group, params in update.items():
+        merged[group] = {**merged.get(group, {}), **params}
+    return merged
+
+
+# Options which only select the device the executable runs on.
+_DEVICE_SELECTION_OPTIONS = ("connection_type", "ipu_id", "ipu_version")
+
+
+def _hashTensorData(hasher, tensor):
+    tensor = tensor.detach().cpu().contiguous()
+    if tensor.dtype == torch.bfloat16:
+        tensor = tensor.float()
+    hasher.update(tensor.numpy().tobytes())
+
+
+def _compilationCacheKey(graph, parameters, inputs, options, training,
+                         optimizer):
+    """Return the key of the compilation cache entry for a graph.
+
+    The key covers everything the lowering depends on: the traced graph
+    (including the values of its tensor constants), the names, types and
+    shapes of the parameters (and the values of the integer ones as they get
+    turned into constants), the inputs signature, the options and the
+    constant hyperparameters of the optimizer.
+
+    :param torch._C.Graph graph: Inlined graph of the traced / scripted model.
+    :param dict parameters: Parameters and buffers of the traced model.
+    :param tuple inputs: Inputs used to compile the model.
+    :param dict options: Options dictionary passed to the backend.
+    :param bool training: True for training models.
+    :param dict optimizer: Optimizer dictionary passed to the backend.
+    """
+    from . import __version__  # pylint: disable=import-outside-toplevel
+    hasher = hashlib.sha256()
+
+    def update(value):
+        hasher.update(repr(value).encode())
+
+    update(__version__)
+    update(str(graph))
+    for node in graph.findAllNodes("prim::Constant"):
+        if node.hasAttribute("value") and node.kindOf("value") == "t":
+            _hashTensorData(hasher, node.t("value"))
+
+    for name, tensor in parameters.items():
+        update((name, tensor.dtype, tensor.shape))
+        if not tensor.is_floating_point():
+            _hashTensorData(hasher, tensor)
+
+    update([_CallPlan._spec(t) for t in inputs])  # pylint: disable=protected-access
+    # The target device doesn't change the lowering: executables compiled for
+    # an offline target (See poptorch.compileMany) can be used on hardware.
+    update(
+        sorted(((k, v) for k, v in options.items()
+                if k not in _DEVICE_SELECTION_OPTIONS),
+               key=str))
+    update(training)
+    # Only the constant hyperparameters are compiled in the executable.
+    update(
+        sorted(((group, value) if isinstance(group, str) else
+                (group,
+                 sorted((name, param[1], param[0] if param[1] else None)
+                        for name, param in value.items()))
+                for group, value in optimizer.items()),
+               key=str))
+    return hasher.hexdigest()
+
+
 class ArgsParser:
     class Args:
         def __init__(self):
             self._args = []
+            # Where each element of _args comes from: ("arg", index),
+            # ("kwarg", name) or ("default", value). Used to build _CallPlans.
+            self._sources = []
             self.first_none = None
 
         def _forEach(self, data, fn):
@@ -249,6 +377,7 @@ class ArgsParser:
             if i < len(args):
                 self._errorOnListOrDict(args[i], name, [])
                 a._args.append(args[i])
+                a._sources.append(("arg", i))
                 assert name not in kwargs, ("Parameter %s was passed more "
                                             "than once") % name
             elif name in kwargs:
@@ -258,6 +387,7 @@ class ArgsParser:
                     " %s") % (name, ", ".join(none_passed))
                 self._errorOnListOrDict(kwargs[name], name, [])
                 a._args.append(kwargs[name])
+                a._sources.append(("kwarg", name))
             else:
                 assert i >= first_optional, ("Mandatory parameter %s "
                                              "missing") % name
@@ -268,6 +398,7 @@ class ArgsParser:
                     none_passed.append("%s (%d)" % (name, i))
                 if not none_passed:
                     a._args.append(value)
+                    a._sources.append(("default", value))
         if a.first_none is None:
             a.first_none = len(self._varnames)
 
@@ -298,6 +429,176 @@ class ArgsParser:
                 " including when nested in tuples.\nReceived list " + end_msg)
 
 
+class _CallPlan:
+    """Flattened mapping from the arguments passed to the executor to the
+    inputs of the executable, for a single input signature.
+
+    The plan is built from the result of the slow path (``ArgsParser``) and
+    records the arity, the keyword argument names, the nesting of the tuples
+    and the dtype / shape of each tensor. As long as the arguments match that
+    signature (and are contiguous) the inputs can be assembled directly,
+    without re-validating them.
+    """
+
+    def __init__(self, sources, args_specs, kwargs_specs):
+        self._sources = sources
+        self._args_specs = args_specs
+        self._kwargs_specs = kwargs_specs
+
+    @staticmethod
+    def key(args, kwargs):
+        return (len(args), tuple(kwargs))
+
+    @staticmethod
+    def create(args, kwargs, in_tensors):
+        """Return the plan matching the given arguments or None if they
+        can't be handled by the fast path.
+        """
+        args_specs = tuple(_CallPlan._spec(a) for a in args)
+        kwargs_specs = tuple(_CallPlan._spec(v) for v in kwargs.values())
+        if None in args_specs or None in kwargs_specs:
+            return None
+        return _CallPlan(tuple(in_tensors._sources), args_specs, kwargs_specs)  # pylint: disable=protected-access
+
+    @staticmethod
+    def signature(in_tensors):
+        """Return a hashable description of the inputs an executable was
+        compiled for: number of arguments and dtype / shape of the tensors.
+        """
+
+        def spec(data):
+            if isinstance(data, torch.Tensor):
+                return (data.dtype, tuple(data.shape))
+            if isinstance(data, (tuple, list)):
+                return tuple(spec(d) for d in data)
+            return None
+
+        return (in_tensors.first_none, spec(in_tensors.asTuple()))
+
+    @staticmethod
+    def _spec(data):
+        # Tensors are represented by a (dtype, shape) tuple and tuples of
+        # tensors by a list of specs.
+        if isinstance(data, torch.Tensor):
+            return (data.dtype, data.shape)
+        if isinstance(data, tuple):
+            specs = [_CallPlan._spec(d) for d in data]
+            return None if None in specs else specs
+        return None
+
+    @staticmethod
+    def _matches(data, spec):
+        if isinstance(spec, list):
+            return isinstance(data, tuple) and len(data) == len(spec) and all(
+                _CallPlan._matches(d, s) for d, s in zip(data, spec))
+        return isinstance(data, torch.Tensor) and data.dtype == spec[0] \
+            and data.shape == spec[1] and data.is_contiguous()
+
+    def inputs(self, args, kwargs):
+        """Return the tuple of inputs to pass to the executable or None if
+        the arguments don't match this plan's signature.
+        """
+        for arg, spec in zip(args, self._args_specs):
+            if not _CallPlan._matches(arg, spec):
+                return None
+        for value, spec in zip(kwargs.values(), self._kwargs_specs):
+            if not _CallPlan._matches(value, spec):
+                return None
+        inputs = []
+        for kind, source in self._sources:
+            if kind == "arg":
+                inputs.append(args[source])
+            elif kind == "kwarg":
+                inputs.append(kwargs[source])
+            else:
+                inputs.append(source)
+        return tuple(inputs)
+
+
+# Attributes of a parameter which can be accessed without its data being
+# copied from the device first.
+_TENSOR_METADATA_ATTRIBUTES = frozenset([
+    "__class__", "__dict__", "device", "dim", "dtype", "grad", "grad_fn",
+    "is_floating_point", "is_leaf", "layout", "names", "ndim", "nelement",
+    "numel", "requires_grad", "shape", "size"
+])
+
+
+class _WeightsPlan:
+    """Names and tensors of the parameters and buffers of a model.
+
+    Built once and reused by the weight transfers as long as none of the
+    parameters / buffers have been replaced in their module.
+
+    ``names`` are the names used by the executable (the ones of the traced
+    model) and ``user_names`` the ones of the model given by the user, which
+    can be different if the traced model wraps it (e.g.
+    ``OptimizerWrapper``).
+    """
+
+    def __init__(self, model, user_model):
+        modules = dict(model.named_modules())
+        self.names = []
+        self.tensors = []
+        # (owner's __dict__, "_parameters" or "_buffers", attribute name)
+        self._locations = []
+        for kind, named_tensors in (("_parameters", model.named_parameters()),
+                                    ("_buffers", model.named_buffers())):
+            for name, tensor in named_tensors:
+                module_name, _, attr = name.rpartition(".")
+                self.names.append(name)
+                self.tensors.append(tensor)
+                self._locations.append((vars(modules[module_name]), kind,
+                                        attr))
+        self.names = tuple(self.names)
+        self.tensors = tuple(self.tensors)
+        user_names = {
+            id(tensor): name
+            for name, tensor in itertools.chain(
+                user_model.named_parameters(), user_model.named_buffers())
+        }
+        self.user_names = tuple(
+            user_names.get(id(tensor), name)
+            for name, tensor in zip(self.names, self.tensors))
+        # Both the user's and the executable's names are accepted.
+        self._indices = {name: idx for idx, name in enumerate(self.names)}
+        self._indices.update(
+            {name: idx
+             for idx, name in enumerate(self.user_names)})
+        self._names_by_id = {
+            id(tensor): name
+            for name, tensor in zip(self.user_names, self.tensors)
+        }
+
+    def nameOf(self, tensor):
+        """Return the user's name of the given tensor or None if it's not
+        part of the plan."""
+        return self._names_by_id.get(id(tensor))
+
+    def isValid(self):
+        # Note: use the modules' __dict__ directly to avoid triggering an
+        # implicit copyWeightsToHost() on training models.
+        return all(
+            attrs[kind].get(attr) is tensor
+            for (attrs, kind, attr), tensor in zip(self._locations,
+                                                   self.tensors))
+
+    def userName(self, name):
+        """Return the user's name of the tensor with the given name."""
+        return self.user_names[self._indices[name]]
+
+    def subset(self, names):
+        """Return the executable's names and the tensors for the given
+        subset of names."""
+        indices = []
+        for name in names:
+            assert name in self._indices, (
+                f"Unknown parameter or buffer '{name}'")
+            indices.append(self._indices[name])
+        return tuple(self.names[i] for i in indices), tuple(
+            self.tensors[i] for i in indices)
+
+
 class PoplarExecutor:
     """ This class should not be created directly but is a wrapper around
     the model that was passed into `inferenceModel` or `trainingModel`.
@@ -331,6 +632,9 @@ class PoplarExecutor:
                 "Gradient accumulation"
                 " should be left to its default value (1) for inference")
             assert not optimizer, "Optimizer should be None for inference"
+        assert not training or options.Jit.max_executables == 1, (
+            "Options.Jit.maxExecutables() is only supported by inference "
+            "models")
 
         self._executable = None
         self._options = options
@@ -338,12 +642,57 @@ class PoplarExecutor:
         # otherwise we will not be able to retrieve the real arguments list
         self._args_parser = ArgsParser(model)
         self._first_none_arg = None
+        # Call plans indexed by _CallPlan.key()
+        self._call_plans = {}
+        # _CallPlan.signature() of the inputs self._executable was compiled
+        # for and, if Options.Jit.maxExecutables() > 1, the executables
+        # compiled for other signatures, least recently used first.
+        self._signature = None
+        self._executables = collections.OrderedDict()
+        # The wrapped model's class changes if it gets wrapped by a
+        # training model: cache the weights synchronisation function per
+        # class.
+        self._user_model_type = None
+        self._copy_weights_to_host_if_needed = None
+        # Used by executeAsync(): the steps are run by a single worker thread
+        # to preserve their order.
+        self._async_executor = None
+        self._steps_in_flight = None
+        self._last_step = None
+        # Used by compileAsync(): pending compilation.
+        self._compile_executor = None
+        self._compilation = None
 
         self._training = training
+        # Latest version of the optimizer set by the user.
         self._optimizer = optimizer or {}
-        self._new_optimizer = optimizer or {}
+        # Hyperparameters which changed since the last time the optimizer was
+        # sent to the device, and the versions used to detect changes.
+        self._optimizer_update = {}
+        self._optimizer_version = 0
+        self._device_optimizer_version = 0
+        # Learning rate schedule (See setLRSchedule())
+        self._lr_schedule = None
+        self._lr_factor = 1.0
+        self._base_lrs = []
+        # Number of optimizer steps run so far.
+        self._optimizer_steps = 0
+        # Cached _WeightsPlan of self._model
+        self._weights_plan = None
+        # Used by checkpointAsync(): host buffers the weights get copied to
+        # and worker thread used to save them.
+        self._checkpoint_buffers = None
+        self._checkpoint_executor = None
+        self._last_checkpoint = None
         self._warned_not_contiguous_input = False
         self._dirty_host_weights = False
+        # Incremented every time the weights on the device get updated: used
+        # to know which tensors on the host are out of date when
+        # _dirty_host_weights is set.
+        self._device_weights_version = 0
+        # Value of _device_weights_version when each tensor was last copied to
+        # the host.
+        self._tensor_host_versions = {}
         self._trace = None
 
         self._profiling = profiling.Channel(
@@ -378,13 +727,19 @@ class PoplarExecutor:
 
                 def __getattr__(self, name):
                     attribute = super().__getattr__(name)
-                    if isinstance(attribute, torch.nn.parameter.Parameter):
-                        self.copyWeightsToHostIfNeeded()
+                    # Parameters are synchronised when their data is accessed
+                    # (See PoptorchParameter) but buffers aren't wrapped.
+                    if isinstance(attribute, torch.Tensor) and not isinstance(
+                            attribute, torch.nn.parameter.Parameter):
+                        parent._copyTensorToHostIfNeeded(attribute)  # pylint: disable=protected-access
                     return attribute
 
             class PoptorchParameter(torch.nn.Parameter):
                 def __getattribute__(self, name):
-                    parent._user_model.copyWeightsToHostIfNeeded()  # pylint: disable=protected-access
+                    # Accessing the tensor's metadata doesn't need its data to
+                    # be up to date.
+                    if name not in _TENSOR_METADATA_ATTRIBUTES:
+                        parent._copyTensorToHostIfNeeded(self)  # pylint: disable=protected-access
 
                     return object.__getattribute__(self, name)
 
@@ -408,47 +763,195 @@ class PoplarExecutor:
     def _debugGetPopartIR(self):
         return poptorch_core._getPopartIR(self._executable)  # pylint: disable=protected-access
 
+    def _getWeightsPlan(self):
+        if self._weights_plan is None or not self._weights_plan.isValid():
+            # Don't trigger a copyToHost by accessing `named_parameters`
+            saved_dirty_flag = self._dirty_host_weights
+            self._dirty_host_weights = False
+            self._weights_plan = _WeightsPlan(self._model, self._user_model)
+            self._dirty_host_weights = saved_dirty_flag
+        return self._weights_plan
+
+    def _getWeights(self, names):
+        """Return the names and tensors of the parameters and buffers to
+        transfer: all of them if ``names`` is None.
+        """
+        plan = self._getWeightsPlan()
+        if names is None:
+            return plan.names, plan.tensors
+        return plan.subset(names)
+
+    def _copyTensorToHostIfNeeded(self, tensor):
+        """Copy a single parameter or buffer to the host if the version on
+        the host is out of date."""
+        if not self._dirty_host_weights:
+            return
+        # The plan was validated when the weights got dirty.
+        name = self._weights_plan.nameOf(tensor)
+        if name is None or self._tensor_host_versions.get(
+                name) == self._device_weights_version:
+            return
+        logger.debug("Implicit copyWeightsToHost(%s)", name)
+        self.copyWeightsToHost([name])
+
     # Copy weights from the device into the memory of the model given on wrapper creation.
-    def copyWeightsToHost(self):
+    def copyWeightsToHost(self, names=None):
         """ Updates the parameters used in `model` with the weights stored on device.
         (The weights in ``model.parameters()``)
+
+        :param names: Names of the parameters and buffers to update, as
+            returned by ``model.named_parameters()`` and
+            ``model.named_buffers()``. If None (default): update all of them.
         """
-        weights = {
-            **dict(self._model.named_parameters()),
-            **dict(self._model.named_buffers())
-        }
+        self._waitForPendingSteps()
         poptorch_core.copyWeightsToHost_impl(self._executable,
-                                             tuple(weights.keys()),
-                                             tuple(weights.values()))
+                                             *self._getWeights(names))
+        if names is None:
+            self._dirty_host_weights = False
+        else:
+            plan = self._getWeightsPlan()
+            for name in names:
+                self._tensor_host_versions[plan.userName(name)] = \
+                        self._device_weights_version
         self._host_weights_version += 1
 
     # Write from host memory to IPU memory. This is done automatically on
     # compilation so should be rarely used.
-    def copyWeightsToDevice(self):
+    def copyWeightsToDevice(self, names=None):
         """Copies the weights from ``model.parameters()`` to the IPU device.
         Implicitly called on first call.
-        """
-        # Don't trigger a copyToHost by accessing `named_parameters`
-        saved_dirty_flag = self._dirty_host_weights
-        self._dirty_host_weights = False
 
-        weights = {
-            **dict(self._model.named_parameters()),
-            **dict(self._model.named_buffers())
-        }
+        :param names: Names of the parameters and buffers to copy, as
+            returned by ``model.named_parameters()`` and
+            ``model.named_buffers()``. If None (default): copy all of them.
+        """
+        self._waitForPendingSteps()
         poptorch_core.copyWeightsToDevice_impl(self._executable,
-                                               tuple(weights.keys()),
-                                               tuple(weights.values()))
+                                               *self._getWeights(names))
+
+    def checkpointAsync(self, path, include_optimizer=True):
+        """Save a checkpoint of the model in the background.
+
+        The weights are copied from the device to a dedicated set of host
+        buffers, then serialised with ``torch.save`` on a separate thread
+        while the model keeps running. The checkpoint is a dictionary
+        containing the model's ``state_dict`` (``"model_state_dict"``) and,
+        if requested, the optimizer's hyperparameters
+        (``"optimizer_params"``).
+
+        Only one checkpoint can be in progress at a time: if the previous one
+        hasn't been written yet this call waits for it, so the extra host
+        memory used is bounded to one copy of the weights.
+
+        .. note:: The internal state of the optimizer on the device (e.g.
+            momentum) cannot be read back and is therefore not saved.
+
+        :param path: File or file-like object to save the checkpoint to (See
+            ``torch.save``).
+        :param bool include_optimizer: Whether to save the optimizer's
+            hyperparameters.
+        :returns: A ``concurrent.futures.Future`` which completes once the
+            checkpoint has been written.
+        """
+        if self._checkpoint_executor is None:
+            self._checkpoint_executor = \
+                    concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        elif self._last_checkpoint is not None:
+            # The buffers are still being serialised.
+            concurrent.futures.wait([self._last_checkpoint])
+
+        names, tensors = self._getWeights(None)
+        if self._checkpoint_buffers is None or any(
+                b.shape != t.shape or b.dtype != t.dtype
+                for b, t in zip(self._checkpoint_buffers, tensors)):
+            self._checkpoint_buffers = tuple(
+                torch.empty_like(t, requires_grad=False) for t in tensors)
+
+        if self._executable is None:
+            with torch.no_grad():
+                for buffer, tensor in zip(self._checkpoint_buffers, tensors):
+                    buffer.copy_(tensor)
+        else:
+            self._waitForPendingSteps()
+            poptorch_core.copyWeightsToHost_impl(self._executable, names,
+                                                 self._checkpoint_buffers)
+
+        # Use the names of the user model's state_dict
+        checkpoint = {
+            "model_state_dict": {
+                name: buffer
+                for name, buffer in zip(self._getWeightsPlan().user_names,
+                                        self._checkpoint_buffers)
+            }
+        }
+        if include_optimizer:
+            checkpoint["optimizer_params"] = copy.deepcopy(self._optimizer)
 
-        # Restore dirtiness flag
-        self._dirty_host_weights = saved_dirty_flag
+        self._last_checkpoint = self._checkpoint_executor.submit(
+            torch.save, checkpoint, path)
+        return self._last_checkpoint
 
     def setOptimizer(self, optimizer):
         """Sets the optimiser for a training model. Will overwrite the
         previous one. Supported optimisers: ``optim.SGD``, ``optim.AdamW``,
         ``optim.RMSProp``.
         """
-        self._new_optimizer = _convertOptimizerToDict(optimizer)
+        new_optimizer = _convertOptimizerToDict(optimizer)
+        if self._lr_schedule is not None:
+            # The new learning rates become the base of the schedule.
+            self._base_lrs = _learningRates(new_optimizer)
+            for group, lr in enumerate(self._base_lrs):
+                new_optimizer[group]["lr"] = (lr * self._lr_factor, False)
+        self._updateOptimizer(new_optimizer)
+
+    def setLRSchedule(self, schedule):
+        """Sets the learning rate schedule for a training model.
+
+        Before each step the learning rate of each parameter group is set to
+        its value in the optimizer multiplied by the factor returned by the
+        schedule for the current optimizer step. Only the learning rates
+        which changed are sent to the device.
+
+        .. note:: One call to the model runs ``Options.deviceIterations``
+            optimizer steps: the learning rate can only be updated between
+            calls, so all the steps of a call use the learning rate of its
+            first step.
+
+        :param poptorch.optim.LRSchedule schedule: The schedule to use or
+            None to stop using a schedule and restore the optimizer's
+            learning rates.
+        """
+        assert self._training, "Learning rate schedules need a training model"
+        base_lrs = self._base_lrs if self._lr_schedule else _learningRates(
+            self._optimizer)
+        self._lr_schedule = schedule
+        self._base_lrs = base_lrs
+        self._lr_factor = None
+        self._applyLRSchedule()
+
+    def _applyLRSchedule(self):
+        factor = 1.0 if self._lr_schedule is None else self._lr_schedule(
+            self._optimizer_steps)
+        if factor == self._lr_factor:
+            return
+        self._lr_factor = factor
+        new_optimizer = dict(self._optimizer)
+        for group, lr in enumerate(self._base_lrs):
+            new_optimizer[group] = {
+                **new_optimizer[group], "lr": (lr * factor, False)
+            }
+        self._updateOptimizer(new_optimizer)
+        if self._lr_schedule is None:
+            self._base_lrs = []
+
+    def _updateOptimizer(self, new_optimizer):
+        update = _diffOptimizerDicts(self._optimizer, new_optimizer)
+        if not update:
+            return
+        self._optimizer = new_optimizer
+        self._optimizer_update = _mergeOptimizerUpdates(
+            self._optimizer_update, update)
+        self._optimizer_version += 1
 
     def _parseArgsAndCompile(self, args, kwargs):
         # Convert single tensor to tuple.
@@ -463,11 +966,18 @@ class PoplarExecutor:
                                "non-contiguous tensors will be converted.")
                 self._warned_not_contiguous_input = True
 
+        signature = None
+        if self._options.Jit.max_executables > 1:
+            signature = _CallPlan.signature(in_tensors)
+            if self._executable is not None and signature != self._signature:
+                self._switchExecutable(signature)
+
         if self._executable is not None:
             return in_tensors
 
         with self._profiling.tracepoint("modelCompilation"):
             self._first_none_arg = in_tensors.first_none
+            self._signature = signature
 
             # Input will be in form of [BatchSize* BatchPerStep, ...] so we
             # should slice it up so we compile by the batch size alone.
@@ -534,10 +1044,11 @@ class PoplarExecutor:
                         convertedLayers.append(name)
 
                 # We will trace using the normal trace view.
-                self._options._execution_strategy.onStartTracing()
-                self._trace = torch.jit.trace(self._model,
-                                              in_tensors_trace_view.asTuple())
-                self._options._execution_strategy.onEndTracing()
+                with _tracing_lock:
+                    self._options._execution_strategy.onStartTracing()
+                    self._trace = torch.jit.trace(
+                        self._model, in_tensors_trace_view.asTuple())
+                    self._options._execution_strategy.onEndTracing()
 
                 # Save the inputs of the traced graph printout as it will be
                 # different after getting originals back.
@@ -563,19 +1074,16 @@ class PoplarExecutor:
                     in_tensors_as_half.forEach(narrowTensor)
 
                     # Compile using the actual halves.
-                    self._executable = poptorch_core.compileWithTrace(
-                        self._trace._c, tuple(parameters.keys()),
-                        tuple(parameters.values()),
-                        in_tensors_as_half.asTuple(), trace_input_string,
-                        self._options.toDict(), self._training,
-                        self._optimizer)
+                    compile_inputs = in_tensors_as_half.asTuple()
                 else:
-                    self._executable = poptorch_core.compileWithTrace(
+                    compile_inputs = in_tensors_trace_view.asTuple()
+                self._executable = self._compileOrLoad(
+                    lambda: poptorch_core.compileWithTrace(
                         self._trace._c, tuple(parameters.keys()),
-                        tuple(parameters.values()),
-                        in_tensors_trace_view.asTuple(), trace_input_string,
-                        self._options.toDict(), self._training,
-                        self._optimizer)
+                        tuple(parameters.values()), compile_inputs,
+                        trace_input_string, self._options.toDict(),
+                        self._training, self._optimizer), parameters,
+                    compile_inputs)
             else:
                 logger.info('Compiling the model using scripting')
                 self._trace = torch.jit.script(self._model)
@@ -589,24 +1097,160 @@ class PoplarExecutor:
                     **dict(self._trace.named_parameters()),
                     **dict(self._trace.named_buffers())
                 }
-                self._executable = poptorch_core.compileWithScript(
-                    self._trace._c, self._trace.graph,
-                    tuple(parameters.keys()), tuple(parameters.values()),
-                    in_tensors_trace_view.asTuple(), self._options.toDict(),
-                    self._training)
+                self._executable = self._compileOrLoad(
+                    lambda: poptorch_core.compileWithScript(
+                        self._trace._c, self._trace.graph,
+                        tuple(parameters.keys()), tuple(parameters.values()),
+                        in_tensors_trace_view.asTuple(),
+                        self._options.toDict(), self._training), parameters,
+                    in_tensors_trace_view.asTuple())
+
+            # The executable was compiled with the latest optimizer.
+            self._optimizer_update = {}
+            self._device_optimizer_version = self._optimizer_version
+
+            poptorch_core.setOutputBufferPoolDepth(
+                self._executable, self._options.Host.output_buffer_pool_depth)
 
             # Upload the weights to the IPU
-            self.copyWeightsToDevice()
+            # (Not using copyWeightsToDevice() as this might be running in
+            # the compileAsync() thread)
+            poptorch_core.copyWeightsToDevice_impl(self._executable,
+                                                   *self._getWeights(None))
         return in_tensors
 
+    def _switchExecutable(self, signature):
+        """Make the executable compiled for ``signature`` the current one or,
+        if there isn't one, clear the current executable so that a new one
+        gets compiled.
+        """
+        # The steps submitted by executeAsync() run the current executable.
+        self._waitForLastStep()
+        self._executables[self._signature] = (self._executable,
+                                              self._first_none_arg,
+                                              self._call_plans, self._trace)
+        cached = self._executables.pop(signature, None)
+        if cached is None:
+            self._executable = None
+            self._call_plans = {}
+            # Leave room for the executable about to be compiled.
+            self._releaseExecutables(self._options.Jit.max_executables - 1)
+            return
+        logger.debug("Switching to the executable compiled for %s",
+                     signature)
+        (self._executable, self._first_none_arg, self._call_plans,
+         self._trace) = cached
+        self._signature = signature
+        # The weights might have been modified on the host since this
+        # executable last ran.
+        poptorch_core.copyWeightsToDevice_impl(self._executable,
+                                               *self._getWeights(None))
+
+    def _releaseExecutables(self, max_count):
+        """Destroy the least recently used executables until no more than
+        ``max_count`` are left."""
+        while len(self._executables) > max_count:
+            signature, (executable, *_) = self._executables.popitem(
+                last=False)
+            logger.info("Releasing the executable compiled for %s",
+                        signature)
+            # Don't wait for the garbage collector to release the IPUs.
+            poptorch_core.detachFromDevice(executable)
+
+    def _compileOrLoad(self, compile_fn, parameters, inputs):
+        """Return the executable created by ``compile_fn`` or, if executable
+        caching is enabled and the graph has already been compiled, create it
+        from the state saved in the cache.
+
+        The state saved is the output of the lowering (ONNX model, tensor
+        ids, etc.): a cache hit skips all the graph passes and the Poplar
+        compilation is then skipped by PopART's engine cache.
+        """
+        popart_options = self._options.Popart.options
+        if not popart_options.get("enableEngineCaching", False):
+            return compile_fn()
+
+        key = _compilationCacheKey(self._trace.inlined_graph, parameters,
+                                   inputs, self._options.toDict(),
+                                   self._training, self._optimizer)
+        path = os.path.join(popart_options["cachePath"], key + ".poptorch")
+        if os.path.isfile(path):
+            logger.info("Loading the lowered graph from the cache: %s", path)
+            return poptorch_core.loadExecutableState(path,
+                                                     self._options.toDict(),
+                                                     self._training,
+                                                     self._optimizer)
+
+        executable = compile_fn()
+        os.makedirs(popart_options["cachePath"], exist_ok=True)
+        # Write to a temporary file first: several processes might be
+        # populating the cache at the same time.
+        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+        poptorch_core.saveExecutableState(executable, tmp_path)
+        os.replace(tmp_path, path)
+        return executable
+
+    def _getInputs(self, args, kwargs):
+        """Return the tuple of inputs to pass to the executable.
+
+        Use the call plan matching the signature of the arguments if there is
+        one, otherwise go through the args parser (compiling the model if
+        needed) and create a plan for the next calls.
+        """
+        self._waitForCompilation()
+        if self._executable is not None:
+            plan = self._call_plans.get(_CallPlan.key(args, kwargs))
+            if plan is not None:
+                inputs = plan.inputs(args, kwargs)
+                if inputs is not None:
+                    return inputs
+
+        in_tensors = self._parseArgsAndCompile(args, kwargs)
+        assert in_tensors.first_none == self._first_none_arg, (
+            f"Number of arguments mismatch: {self._first_none_arg} "
+            f"arguments used to compile the model and "
+            f"{in_tensors.first_none} provided this time (Use "
+            f"Options.Jit.maxExecutables() to compile one executable per "
+            f"input signature)")
+
+        plan = _CallPlan.create(args, kwargs, in_tensors)
+        if plan is not None:
+            self._call_plans[_CallPlan.key(args, kwargs)] = plan
+        return in_tensors.asTuple()
+
     def compile(self, *args, **kwargs):
         """Takes the same arguments as the wrapped PyTorch `model.__call__`.
 
         Trace and compile the wrapped model if no executable has been
         created yet.
         """
+        self._waitForCompilation()
         self._parseArgsAndCompile(args, kwargs)
 
+    def compileAsync(self, *args, **kwargs):
+        """Same as :py:meth:`compile` but the model is compiled in a
+        background thread.
+
+        The calling thread is free to do something else in the meantime (Load
+        a dataset, compile another model, etc.): any call which needs the
+        executable (e.g. running the model or copying the weights) waits for
+        the compilation to complete.
+
+        :returns: A ``concurrent.futures.Future`` which completes once the
+            model is compiled.
+        """
+        if self._compilation is not None:
+            return self._compilation
+        if self._compile_executor is None:
+            self._compile_executor = \
+                    concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        def compileModel():
+            self._parseArgsAndCompile(args, kwargs)
+
+        self._compilation = self._compile_executor.submit(compileModel)
+        return self._compilation
+
     def __call__(self, *args, **kwargs):
         """
         Takes the same arguments as the wrapped PyTorch `model.__call__`.
@@ -614,22 +1258,106 @@ class PoplarExecutor:
         .. note:: The first time the PoplarExecutor wrapper is called, the
             wrapped model will be traced and compiled.
 
+        """
+        self._waitForPendingSteps()
+        return self._executeStep(*self._prepareStep(args, kwargs))
+
+    def executeAsync(self, *args, **kwargs):
+        """
+        Takes the same arguments as the wrapped PyTorch `model.__call__` but
+        returns a ``concurrent.futures.Future`` which will hold the outputs
+        once the step has completed, instead of the outputs themselves.
+
+        The GIL is released while the device is running, so the host can
+        prepare the next inputs or process previous outputs in the meantime.
+        Steps are executed in the order they were submitted. If
+        ``Options.Host.maxStepsInFlight`` steps are already pending this call
+        blocks until the oldest one has completed.
+
+        Use ``asyncio.wrap_future()`` to await the returned future from a
+        coroutine.
+
+        .. note:: The first call will trace and compile the model
+            synchronously.
+
+        .. warning:: The input tensors must not be modified until the
+            returned future is done.
+        """
+        step = self._prepareStep(args, kwargs)
+        if self._async_executor is None:
+            self._async_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1)
+            self._steps_in_flight = threading.BoundedSemaphore(
+                self._options.Host.max_steps_in_flight)
+
+        self._steps_in_flight.acquire()
+        try:
+            future = self._async_executor.submit(self._executeStep, *step)
+        except:
+            self._steps_in_flight.release()
+            raise
+        future.add_done_callback(lambda _: self._steps_in_flight.release())
+        self._last_step = future
+        return future
+
+    def executeInto(self, out, *args, **kwargs):
+        """
+        Same as :py:meth:`__call__` but the outputs are written to the
+        tensors provided instead of newly allocated ones.
+
+        :param out: A tensor or a tuple / list of tensors: one per tensor
+            returned by the model, in the same order as in the flattened
+            outputs. Their shape and type must match the ones of the outputs
+            and they must be contiguous.
+        :returns: The outputs, in the same structure as :py:meth:`__call__`,
+            backed by the tensors in ``out``.
+        """
+        if isinstance(out, torch.Tensor):
+            out = (out, )
+        self._waitForPendingSteps()
+        return self._executeStep(*self._prepareStep(args, kwargs), tuple(out))
+
+    def _waitForCompilation(self):
+        if self._compilation is not None:
+            compilation, self._compilation = self._compilation, None
+            # Re-raise the compilation errors, if any.
+            compilation.result()
+
+    def _waitForLastStep(self):
+        # Steps are executed in order: if the last one is done then all of
+        # them are.
+        if self._last_step is not None:
+            concurrent.futures.wait([self._last_step])
+            self._last_step = None
+
+    def _waitForPendingSteps(self):
+        self._waitForCompilation()
+        self._waitForLastStep()
+
+    def _prepareStep(self, args, kwargs):
+        """Compile the model if needed and return the arguments to pass to
+        _executeStep()
         """
         assert self._options.connectionType != enums.ConnectionType.Never, (
             "Trying to run a model on an offline device "
             " (ConnectionType.Never): use model.compile(inputs) instead of"
             " model(inputs)")
-        in_tensors = self._parseArgsAndCompile(args, kwargs)
+        in_tensors = self._getInputs(args, kwargs)
 
         # If this is an inference model: check if the same model is not being
         # trained on a different IPU.
         # If it is: make sure the weights are updated.
         if not self._training:
-            copyWeightsToHostIfNeeded = getattr(self._user_model,
-                                                "copyWeightsToHostIfNeeded",
-                                                None)
-            if callable(copyWeightsToHostIfNeeded):
-                copyWeightsToHostIfNeeded()
+            model_type = type(self._user_model)
+            if model_type is not self._user_model_type:
+                self._user_model_type = model_type
+                copyWeightsToHostIfNeeded = getattr(
+                    self._user_model, "copyWeightsToHostIfNeeded", None)
+                self._copy_weights_to_host_if_needed = \
+                        copyWeightsToHostIfNeeded if callable(
+                            copyWeightsToHostIfNeeded) else None
+            if self._copy_weights_to_host_if_needed is not None:
+                self._copy_weights_to_host_if_needed()
                 if self._host_weights_version != \
                         self._user_model._host_weights_version:
                     # Weights have now been updated on the Host: copy them to
@@ -639,23 +1367,31 @@ class PoplarExecutor:
                     self._host_weights_version = \
                             self._user_model._host_weights_version
 
-        assert in_tensors.first_none == self._first_none_arg, (
-            f"Number of arguments mismatch: {self._first_none_arg} "
-            f"arguments used to compile the model and "
-            f"{in_tensors.first_none} provided this time")
-        # Execute the poplar executable with the full size (batch * device interations)
-        with self._profiling.tracepoint("modelExecution"):
-            if self._new_optimizer and self._new_optimizer != self._optimizer:
-                self._optimizer = self._new_optimizer
-                output = poptorch_core.execute(self._executable,
-                                               in_tensors.asTuple(),
-                                               self._optimizer)
-            else:
-                output = poptorch_core.execute(self._executable,
-                                               in_tensors.asTuple(), {})
+        if self._lr_schedule is not None:
+            self._applyLRSchedule()
+        if self._training:
+            self._optimizer_steps += self._options.device_iterations
+
+        optimizer = {}
+        if self._optimizer_version != self._device_optimizer_version:
+            optimizer = self._optimizer_update
+            self._optimizer_update = {}
+            self._device_optimizer_version = self._optimizer_version
 
         if self._training:
+            # Validate the plan once per step so that the implicit copies of
+            # individual tensors only need a dictionary lookup.
+            self._getWeightsPlan()
             self._dirty_host_weights = True
+            self._device_weights_version += 1
+
+        return in_tensors, optimizer
+
+    def _executeStep(self, in_tensors, optimizer, out=()):
+        # Execute the poplar executable with the full size (batch * device interations)
+        with self._profiling.tracepoint("modelExecution"):
+            output = poptorch_core.execute(self._executable, in_tensors,
+                                           optimizer, out)
 
         if len(output) > 1:
             return output
@@ -664,101 +1400,700 @@ class PoplarExecutor:
     def destroy(self):
         """Destroy the model: release the IPUs and the executable.
         """
+        self._waitForPendingSteps()
+        if self._async_executor is not None:
+            self._async_executor.shutdown()
+            self._async_executor = None
+        if self._checkpoint_executor is not None:
+            self._checkpoint_executor.shutdown()
+            self._checkpoint_executor = None
+            self._checkpoint_buffers = None
+        if self._compile_executor is not None:
+            self._compile_executor.shutdown()
+            self._compile_executor = None
+        self._releaseExecutables(0)
         if not self._executable:
             return
         if self._training:
             self.copyWeightsToHostIfNeeded()
         del self._executable
         self._executable = None
+        self._call_plans = {}
+        self._signature = None
+        self._weights_plan = None
+
+
+# Version of the files written by saveExecutable(): to be incremented every
+# time their content changes.
+_EXECUTABLE_FILE_VERSION = 1
+
+# Options which change the shape of the inputs / outputs of an executable.
+_BATCHING_OPTIONS = ("device_iterations", "replication_factor",
+                     "gradient_accumulation", "anchor_mode",
+                     "anchor_return_period", "output_anchors")
+
+
+def saveExecutable(executor, path):
+    """Save a compiled model to ``path``.
+
+    See :py:func:`poptorch.saveExecutable`
+    """
+    # pylint: disable=protected-access
+    assert executor._executable is not None, (
+        "The model must be compiled before it can be saved: "
+        "call compile() first")
+    executor._waitForPendingSteps()
+    # Only training models update their weights on the device.
+    if executor._training:
+        executor.copyWeightsToHostIfNeeded()
+    names, tensors = executor._getWeights(None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = os.path.join(tmp, "state")
+        engine_dir = os.path.join(tmp, "engine")
+        os.mkdir(engine_dir)
+        poptorch_core.saveExecutableState(executor._executable, state_path)
+        poptorch_core.exportExecutable(executor._executable, engine_dir)
+        with open(state_path, "rb") as f:
+            state = f.read()
+        engine = {}
+        for filename in os.listdir(engine_dir):
+            with open(os.path.join(engine_dir, filename), "rb") as f:
+                engine[filename] = f.read()
+
+    torch.save(
+        {
+            "version": _EXECUTABLE_FILE_VERSION,
+            "training": executor._training,
+            "options": executor._options.toDict(),
+            "optimizer": executor._optimizer,
+            "args_parser": executor._args_parser,
+            "first_none_arg": executor._first_none_arg,
+            "weights": {
+                name: tensor.detach().clone()
+                for name, tensor in zip(names, tensors)
+            },
+            "state": state,
+            "engine": engine,
+        }, path)
+
+
+def loadExecutable(path, options=None):
+    """Load a model saved by :py:func:`saveExecutable`.
+
+    See :py:func:`poptorch.loadExecutable`
+    """
+    saved = torch.load(path)
+    assert saved.get("version") == _EXECUTABLE_FILE_VERSION, (
+        f"{path} was saved by an incompatible version of PopTorch")
+
+    options_dict = saved["options"]
+    if options is not None:
+        if options.defaultAnchorMode():
+            options.anchorMode(enums.AnchorMode(options_dict["anchor_mode"]),
+                               options_dict["anchor_return_period"])
+        new_options_dict = options.toDict()
+        for key in _BATCHING_OPTIONS:
+            assert new_options_dict.get(key) == options_dict.get(key), (
+                f"The option {key} ({new_options_dict.get(key)}) must match "
+                f"the value used to compile the executable "
+                f"({options_dict.get(key)})")
+        options_dict = new_options_dict
+    else:
+        options_dict = dict(options_dict)
+        # Executables compiled for an offline target are meant to be run on
+        # the IPUs available here.
+        if options_dict.get("connection_type") == \
+                enums.ConnectionType.Never.value:
+            options_dict.pop("connection_type")
+            options_dict.pop("ipu_version", None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = os.path.join(tmp, "state")
+        engine_dir = os.path.join(tmp, "engine")
+        os.mkdir(engine_dir)
+        with open(state_path, "wb") as f:
+            f.write(saved["state"])
+        for filename, data in saved["engine"].items():
+            with open(os.path.join(engine_dir, filename), "wb") as f:
+                f.write(data)
+        # PopART loads the Poplar executable from its engine cache.
+        options_dict["enableEngineCaching"] = True
+        options_dict["cachePath"] = engine_dir
+        executable = poptorch_core.loadExecutableState(
+            state_path, options_dict, saved["training"], saved["optimizer"])
+
+    if options is not None:
+        poptorch_core.setOutputBufferPoolDepth(
+            executable, options.Host.output_buffer_pool_depth)
+
+    executor = PrecompiledExecutor(executable, saved["args_parser"],
+                                   saved["first_none_arg"], saved["weights"])
+    executor.copyWeightsToDevice()
+    return executor
+
+
+class PrecompiledExecutor:
+    """Model loaded by :py:func:`poptorch.loadExecutable`.
+
+    Runs the executable without the source of the model: its weights are
+    stored in :py:attr:`weights`.
+    """
+
+    def __init__(self, executable, args_parser, first_none_arg, weights):
+        self._executable = executable
+        self._args_parser = args_parser
+        self._first_none_arg = first_none_arg
+        self._weights = weights
+
+    @property
+    def weights(self):
+        """Dictionary of the parameters and buffers of the model."""
+        return self._weights
+
+    def copyWeightsToHost(self):
+        """Copy the weights from the device into :py:attr:`weights`."""
+        poptorch_core.copyWeightsToHost_impl(self._executable,
+                                             tuple(self._weights.keys()),
+                                             tuple(self._weights.values()))
+
+    def copyWeightsToDevice(self):
+        """Copy :py:attr:`weights` to the device."""
+        poptorch_core.copyWeightsToDevice_impl(self._executable,
+                                               tuple(self._weights.keys()),
+                                               tuple(self._weights.values()))
+
+    def __call__(self, *args, **kwargs):
+        """Takes the same arguments as the ``forward`` method of the model
+        the executable was compiled from.
+        """
+        assert self._executable is not None, "The model has been destroyed"
+        in_tensors = self._args_parser(args, kwargs)
+        assert in_tensors.first_none == self._first_none_arg, (
+            f"Number of arguments mismatch: {self._first_none_arg} "
+            f"arguments used to compile the model and "
+            f"{in_tensors.first_none} provided this time")
+        in_tensors.forEachMatchedAtLeastOnce(
+            condition=lambda t: isinstance(t, torch.Tensor) and not t.
+            is_contiguous(),
+            doOnTrue=lambda t: t.contiguous())
+
+        output = poptorch_core.execute(self._executable, in_tensors.asTuple(),
+                                       {})
+        if len(output) > 1:
+            return output
+        return output[0]
+
+    def destroy(self):
+        """Destroy the model: release the IPUs and the executable."""
+        self._executable = None
+
+
+class BucketedExecutor:
+    """Inference model compiled for several sizes of one of the dimensions
+    of its inputs (e.g. the sequence length), created by
+    :py:func:`poptorch.bucketedInferenceModel`.
+
+    Each call is padded to the smallest bucket which fits its inputs and run
+    using the executable compiled for this bucket, then the outputs are
+    sliced back to the size of the inputs.
+    """
+
+    def __init__(self, model, buckets, options, dim, pad_value):
+        assert buckets, "At least one bucket is needed"
+        self._model = model
+        self._buckets = sorted(set(buckets))
+        # The executors share the options: only the shape of their inputs
+        # differs.
+        self._options = options or Options()
+        self._dim = dim
+        self._pad_value = pad_value
+        # Inference executors indexed by bucket, created on demand.
+        self._executors = {}
+
+    def __getattr__(self, attr):
+        return getattr(self._model, attr)
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def buckets(self):
+        """Sorted list of the sizes the model is compiled for."""
+        return self._buckets
+
+    def _isBucketed(self, tensor):
+        return isinstance(tensor, torch.Tensor) and tensor.dim() > self._dim
+
+    def _bucketFor(self, args, kwargs):
+        """Return the size of the inputs and the smallest bucket it fits in.
+        """
+        sizes = {
+            t.shape[self._dim]
+            for t in list(args) + list(kwargs.values()) if self._isBucketed(t)
+        }
+        assert len(sizes) == 1, (
+            "All the input tensors with a dimension %d must have the same "
+            "size along this dimension: got %s") % (self._dim, sorted(sizes))
+        size = sizes.pop()
+        for bucket in self._buckets:
+            if bucket >= size:
+                return size, bucket
+        raise AssertionError("Input size %d along dimension %d is larger "
+                             "than the largest bucket (%d)" %
+                             (size, self._dim, self._buckets[-1]))
+
+    def _resize(self, tensor, size):
+        """Pad (or narrow) ``tensor`` to ``size`` along the bucketed
+        dimension."""
+        if not self._isBucketed(tensor):
+            return tensor
+        missing = size - tensor.shape[self._dim]
+        if missing <= 0:
+            return tensor.narrow(self._dim, 0, size)
+        # Padding sizes are listed from the last dimension.
+        pad = [0, 0] * (tensor.dim() - self._dim - 1) + [0, missing]
+        return torch.nn.functional.pad(tensor, pad, value=self._pad_value)
+
+    def _slice(self, output, bucket, size):
+        if isinstance(output, (tuple, list)):
+            return type(output)(self._slice(o, bucket, size) for o in output)
+        if self._isBucketed(output) and output.shape[self._dim] == bucket:
+            return output.narrow(self._dim, 0, size)
+        return output
+
+    def _executor(self, bucket):
+        executor = self._executors.get(bucket)
+        if executor is None:
+            logger.info("Creating the executable for the bucket of size %d",
+                        bucket)
+            executor = PoplarExecutor(model=self._model,
+                                      options=self._options,
+                                      training=False)
+            self._executors[bucket] = executor
+        return executor
+
+    def _resizeArgs(self, args, kwargs, bucket):
+        return ([self._resize(a, bucket) for a in args],
+                {k: self._resize(v, bucket)
+                 for k, v in kwargs.items()})
+
+    def compile(self, *args, **kwargs):
+        """Compile the executables of all the buckets up front.
+
+        Takes the same arguments as the wrapped PyTorch `model.__call__`:
+        the example inputs are padded or narrowed to the size of each
+        bucket.
+        """
+        for bucket in self._buckets:
+            bucket_args, bucket_kwargs = self._resizeArgs(args, kwargs, bucket)
+            self._executor(bucket).compile(*bucket_args, **bucket_kwargs)
+
+    def __call__(self, *args, **kwargs):
+        """Takes the same arguments as the wrapped PyTorch `model.__call__`.
+
+        .. note:: The first time a bucket is used its executable is compiled,
+            unless :py:meth:`compile` was called.
+        """
+        size, bucket = self._bucketFor(args, kwargs)
+        bucket_args, bucket_kwargs = self._resizeArgs(args, kwargs, bucket)
+        output = self._executor(bucket)(*bucket_args, **bucket_kwargs)
+        if size == bucket:
+            return output
+        return self._slice(output, bucket, size)
+
+    def destroy(self):
+        """Destroy the executables of all the buckets and release their IPUs.
+        """
+        for executor in self._executors.values():
+            executor.destroy()
+        self._executors = {}
+
+
+def _dataStructure(data, leaves):
+    """Return the structure of an element of a dataset: the element with
+    its tensors replaced by None. The tensors are appended to ``leaves``.
+
+    Tuples (including named tuples), lists and dicts can be nested.
+    """
+    if isinstance(data, dict):
+        return {
+            key: _dataStructure(value, leaves)
+            for key, value in data.items()
+        }
+    if isinstance(data, (tuple, list)):
+        structure = [_dataStructure(d, leaves) for d in data]
+        if hasattr(data, "_fields"):
+            return type(data)(*structure)
+        return type(data)(structure)
+    assert isinstance(data, torch.Tensor), (
+        "AsynchronousDataAccessor expects the elements of the dataset to be "
+        "tensors or (nested) tuples, lists and dicts of tensors: got %s" %
+        type(data).__name__)
+    leaves.append(data)
+    return None
+
+
+def _flattenData(data, structure, leaves):
+    """Append the tensors of an element to ``leaves`` in the order of the
+    given structure."""
+    if structure is None:
+        leaves.append(data)
+    elif isinstance(structure, dict):
+        for key, value in structure.items():
+            _flattenData(data[key], value, leaves)
+    else:
+        for d, value in zip(data, structure):
+            _flattenData(d, value, leaves)
+    return leaves
+
+
+def _unflattenData(structure, leaves):
+    """Return an element with the given structure made of the tensors
+    returned by the iterator ``leaves``."""
+    if structure is None:
+        return next(leaves)
+    if isinstance(structure, dict):
+        return {
+            key: _unflattenData(value, leaves)
+            for key, value in structure.items()
+        }
+    values = [_unflattenData(value, leaves) for value in structure]
+    if hasattr(structure, "_fields"):
+        return type(structure)(*values)
+    return type(structure)(values)
+
+
+class AsynchronousWorkerInfo:
+    """Information about the AsynchronousDataAccessor worker process the
+    dataset is being iterated in.
+
+    See :py:func:`poptorch.asynchronousWorkerInfo`
+    """
+
+    def __init__(self, worker_id, num_workers):
+        self.id = worker_id
+        self.num_workers = num_workers
+
+    def __repr__(self):
+        return "AsynchronousWorkerInfo(id=%d, num_workers=%d)" % (
+            self.id, self.num_workers)
+
+
+# Set in the AsynchronousDataAccessor worker processes.
+_asynchronous_worker_info = None
+
+
+def asynchronousWorkerInfo():
+    """See :py:func:`poptorch.asynchronousWorkerInfo`"""
+    return _asynchronous_worker_info
+
+
+def _isMapStyleDataset(dataset):
+    return hasattr(dataset, "__getitem__") and hasattr(
+        dataset, "__len__") and not isinstance(
+            dataset, torch.utils.data.IterableDataset)
+
+
+def _isSplittableDataLoader(dataset):
+    # DataLoaders iterating over an IterableDataset don't use indices.
+    return isinstance(dataset, torch.utils.data.DataLoader) and \
+            not isinstance(dataset.dataset, torch.utils.data.IterableDataset)
+
+
+class _ShardedSampler:
+    """Every ``num_workers``-th index returned by a sampler, starting from the
+    ``worker_id``-th one."""
+
+    def __init__(self, sampler, worker_id, num_workers):
+        self._sampler = sampler
+        self._worker_id = worker_id
+        self._num_workers = num_workers
+
+    def __iter__(self):
+        return itertools.islice(iter(self._sampler), self._worker_id, None,
+                                self._num_workers)
+
+    def __len__(self):
+        return len(
+            range(self._worker_id, len(self._sampler), self._num_workers))
+
+
+def _narrowTo(tensor, shape):
+    """Return a view of the first elements of ``tensor`` along each
+    dimension."""
+    return tensor[tuple(slice(0, size) for size in shape)]
 
 
 class AsynchronousWorker:
-    """Interface for the host to create and manage a separate worker process to fetch elements from a dataset."""
+    """Interface for the host to create and manage separate worker processes to fetch elements from a dataset."""
+
+    # Bounds of the number of times the ring buffer is polled before blocking.
+    _MIN_SPIN_COUNT = 16
+    _MAX_SPIN_COUNT = 4096
 
-    def __init__(self, buffer_size, miss_sleep_time_in_ms, dataset,
-                 load_indefinitely):
-        self._process = _AsynchronousWorkerProcess(buffer_size,
-                                                   miss_sleep_time_in_ms,
-                                                   dataset, load_indefinitely)
+    def __init__(self,
+                 buffer_size,
+                 miss_sleep_time_in_ms,
+                 dataset,
+                 load_indefinitely,
+                 num_workers=1,
+                 ordered=True,
+                 max_shapes=None,
+                 collate_into=None):
+        assert num_workers >= 1, "num_workers must be at least 1"
+        assert max_shapes is None or collate_into is None, (
+            "max_shapes can't be used with collate_into")
+        assert num_workers == 1 or _isMapStyleDataset(
+            dataset) or isinstance(
+                dataset,
+                (torch.utils.data.DataLoader,
+                 torch.utils.data.IterableDataset)), (
+                     "The work of a %s can't be split between several "
+                     "workers: use num_workers=1, a map-style dataset, a "
+                     "DataLoader or an IterableDataset sharding itself using "
+                     "poptorch.asynchronousWorkerInfo()" %
+                     type(dataset).__name__)
+        # Each worker owns every num_workers-th slot of the ring buffer.
+        buffer_size = -(-buffer_size // num_workers) * num_workers
+        # Used by all the workers to shuffle the indices of a DataLoader in
+        # the same way.
+        shuffle_seed = int(torch.empty((), dtype=torch.int64).random_())
+        self._processes = [
+            _AsynchronousWorkerProcess(buffer_size, miss_sleep_time_in_ms,
+                                       dataset, load_indefinitely, worker_id,
+                                       num_workers, ordered, max_shapes,
+                                       collate_into, shuffle_seed)
+            for worker_id in range(num_workers)
+        ]
+        self._num_workers = num_workers
+        self._ordered = ordered
         self._previously_ready_element = None
         self._ring_read_index = 0
         self._buffer_size = buffer_size
-
-        # Keep end of file events in a special buffer shared between worker and device. This is due to the worker reseting automatically.
-        (self._shutdown_pipe, self._ready_to_read_index,
-         self._is_single_tensor, self._eof_event_tensor,
-         self._data_buffers) = self._process.start()
+        self._end_of_epoch = False
+        self._wait_timeout = miss_sleep_time_in_ms / 1000
+        # Adapted to how long the workers usually take to produce an element:
+        # spinning is only worth it if the element arrives soon.
+        self._spin_count = self._MIN_SPIN_COUNT
+
+        # Released by all the workers every time an element is ready.
+        self._data_event = multiprocessing.get_context('spawn').Semaphore(0)
+        self._shutdown_pipes = []
+        self._host_events = []
+
+        # The first worker allocates the shared buffers, the other ones
+        # write into them.
+        shared_buffers = None
+        try:
+            for process in self._processes:
+                shutdown_pipe, host_event, shared_buffers = process.start(
+                    self._data_event, shared_buffers)
+                self._shutdown_pipes.append(shutdown_pipe)
+                self._host_events.append(host_event)
+        except Exception:
+            self.terminate()
+            raise
+
+        # Keep end of file events in a special buffer shared between workers and device. This is due to the workers reseting automatically.
+        (self._ready_to_read_index, self._structure, self._eof_event_tensor,
+         self._data_buffers, self._slot_sizes) = shared_buffers
+        # The tensors whose shape can change from one element to the next:
+        # their views have to be narrowed to the actual size of each element.
+        self._variable_leaves = [
+            leaf for leaf, sizes in enumerate(self._slot_sizes)
+            if sizes is not None
+        ]
+        # The elements are returned as views of the shared buffers: build them
+        # once for each slot of the ring buffer.
+        self._slot_leaves = [[buffer[index] for buffer in self._data_buffers]
+                             for index in range(buffer_size)]
 
     def terminate(self):
-        if self._process.isAlive():
+        if self._isAlive():
             self._requestShutdown()
 
-        self._process.join()
+        for process in self._processes:
+            if process.isStarted():
+                process.join()
 
     def resetIterator(self):
-        self._eof_event_tensor[0] = -1
+        eof = self._eof_event_tensor
+        if self._end_of_epoch:
+            if self._ordered:
+                # The first worker writes the first element of the new epoch:
+                # skip the slots of the other workers up to its next slot.
+                start = -(-self._ring_read_index //
+                          self._num_workers) * self._num_workers
+                self._ring_read_index = start % self._buffer_size
+                eof[self._num_workers] = self._ring_read_index
+            for worker_id in range(self._num_workers):
+                eof[worker_id] = -1
+        else:
+            # Only start the workers which haven't started yet: the others
+            # are still loading the current epoch.
+            for worker_id in range(self._num_workers):
+                if eof[worker_id] == -2:
+                    eof[worker_id] = -1
+        self._end_of_epoch = False
+        for host_event in self._host_events:
+            host_event.release()
+
+    def _nextReadyIndex(self):
+        if self._ordered:
+            if self._ready_to_read_index[self._ring_read_index]:
+                return self._ring_read_index
+            return None
+        for offset in range(self._buffer_size):
+            index = (self._ring_read_index + offset) % self._buffer_size
+            if self._ready_to_read_index[index]:
+                return index
+        return None
 
     def dataIsAvailable(self):
-        return self._ready_to_read_index[self._ring_read_index]
+        return self._nextReadyIndex() is not None
 
     def endOfFile(self):
-        return self._eof_event_tensor[0] == self._ring_read_index
+        # The epoch is over once every worker reached the end of its share
+        # of it and all the elements it loaded before were read. (The flags
+        # must be checked after the EOF events)
+        return all(self._eof_event_tensor[worker_id] >= 0
+                   for worker_id in range(self._num_workers)
+                   ) and not self.dataIsAvailable()
 
     def acquireElementIfAvailable(self):
         assert self._previously_ready_element is None, (
             "The current element "
             "must be released by calling releaseElement() before trying to "
             "acquire a new one")
-        if not self.dataIsAvailable():
+        index = self._nextReadyIndex()
+        if index is None:
             return None
-        # Pull the ready buffer.
-        data = [buffer[self._ring_read_index] for buffer in self._data_buffers]
+        self._previously_ready_element = index
 
-        self._previously_ready_element = self._ring_read_index
-
-        self._ring_read_index += 1
+        self._ring_read_index = index + 1
         # Ring back around.
         if self._ring_read_index >= self._buffer_size:
             self._ring_read_index = 0
 
-        # Return either one tensor or the list.
-        if self._is_single_tensor:
-            return data[0]
-
-        # Else return the list.
-        return data
+        # Return the views of the ready buffer in new containers: the caller
+        # is free to modify them.
+        if not self._variable_leaves:
+            return _unflattenData(self._structure,
+                                  iter(self._slot_leaves[index]))
+
+        leaves = list(self._slot_leaves[index])
+        for leaf in self._variable_leaves:
+            leaves[leaf] = _narrowTo(leaves[leaf],
+                                     self._slot_sizes[leaf][index].tolist())
+        return _unflattenData(self._structure, iter(leaves))
+
+    def acquireElement(self):
+        """Wait for the next element to be available and return it, or
+        return None if the end of the dataset was reached or the workers
+        stopped.
+
+        The ring buffer is polled for a short while first, then the thread
+        blocks until a worker signals a new element.
+        """
+        spins = 0
+        notified = False
+        while True:
+            data = self.acquireElementIfAvailable()
+            if data is not None:
+                # Consume the worker's notification for this element so that
+                # the next wait doesn't return straight away.
+                if not notified:
+                    self._data_event.acquire(block=False)
+                if spins <= self._spin_count:
+                    self._spin_count = min(self._spin_count * 2,
+                                           self._MAX_SPIN_COUNT)
+                return data
+            if self.endOfFile():
+                self._end_of_epoch = True
+                return None
+            if spins < self._spin_count:
+                spins += 1
+                continue
+            if spins == self._spin_count:
+                # Spinning didn't pay off this time.
+                self._spin_count = max(self._spin_count // 2,
+                                       self._MIN_SPIN_COUNT)
+                spins += 1
+            notified = self._data_event.acquire(timeout=self._wait_timeout)
+            if not notified and self._hasStopped():
+                # The workers might have produced some elements before
+                # stopping.
+                return self.acquireElementIfAvailable()
 
     def assertNoError(self):
-        if not self._process.isAlive():
-            assert self._process.exitCode() == 0, \
-                "An error occurred in the data fetcher"
+        for process in self._processes:
+            if not process.isAlive():
+                assert process.exitCode() == 0, \
+                    "An error occurred in the data fetcher"
 
     def releaseElement(self):
         # Set the previous iteration to false so it can be pulled in now
         # avoiding any data races.
         if self._previously_ready_element is not None:
             self._ready_to_read_index[self._previously_ready_element] = False
+            # Wake the worker owning the slot up if it was waiting for it.
+            self._host_events[self._previously_ready_element %
+                              self._num_workers].release()
         self._previously_ready_element = None
 
+    def _isAlive(self):
+        return any(process.isStarted() and process.isAlive()
+                   for process in self._processes)
+
+    def _hasStopped(self):
+        """True if all the workers exited or if one of them failed: no more
+        elements will be produced in the order expected."""
+        return not self._isAlive() or any(
+            not process.isAlive() and process.exitCode() != 0
+            for process in self._processes)
+
     def _requestShutdown(self):
-        # Send the exit signal if the worker is still alive.
-        try:
-            self._shutdown_pipe.send(0)
-        except BrokenPipeError:
-            pass
+        # Send the exit signal to the workers still alive.
+        for shutdown_pipe in self._shutdown_pipes:
+            try:
+                shutdown_pipe.send(0)
+            except BrokenPipeError:
+                pass
+        for host_event in self._host_events:
+            host_event.release()
 
 
 class _AsynchronousWorkerProcess:
     """Worker process fetching elements from a given dataset"""
 
-    def __init__(self, buffer_size, miss_sleep_time_in_ms, dataset,
-                 load_indefinitely):
+    def __init__(self,
+                 buffer_size,
+                 miss_sleep_time_in_ms,
+                 dataset,
+                 load_indefinitely,
+                 worker_id=0,
+                 num_workers=1,
+                 ordered=True,
+                 max_shapes=None,
+                 collate_into=None,
+                 shuffle_seed=0):
         self._buffer_size = buffer_size
         self._miss_sleep_time_in_ms = miss_sleep_time_in_ms
         self._dataset = dataset
         self._load_indefinitely = load_indefinitely
+        self._worker_id = worker_id
+        self._num_workers = num_workers
+        self._ordered = ordered
+        self._max_shapes = max_shapes
+        self._collate_into = collate_into
+        self._shuffle_seed = shuffle_seed
         self._process = None
 
+    def isStarted(self):
+        return self._process is not None
+
     def isAlive(self):
         return self._process.exitcode is None
 
@@ -771,7 +2106,16 @@ class _AsynchronousWorkerProcess:
         self._process.terminate()
         self._process.join()
 
-    def start(self):
+    def start(self, data_event, shared_buffers=None):
+        """Start the worker process.
+
+        :param data_event: Semaphore released by the worker every time an
+            element (or EOF) is ready.
+        :param shared_buffers: The buffers allocated by the first worker
+            or None if this is the first worker.
+        :returns: The shutdown pipe, the semaphore to release to wake the
+            worker up and the shared buffers.
+        """
         assert self._process is None, "Worker already started"
         # We use a small pipe to get the initial data. The latency of
         # deserialising the python data is too high to be used for the
@@ -779,7 +2123,14 @@ class _AsynchronousWorkerProcess:
         # in shared memory which will be used for the actual read/write
         # in the hot loop.
         ctx = multiprocessing.get_context('spawn')
-        read_data_pipe, write_data_pipe = ctx.Pipe(duplex=False)
+
+        # The ring buffer's flags are the source of truth, the semaphores are
+        # only used to wake up the other process instead of having it poll
+        # the flags: data_event is released by the workers every time an
+        # element (or EOF) is ready and host_event by the host every time one
+        # of the worker's slots is released, the iterator is reset or a
+        # shutdown is requested.
+        host_event = ctx.Semaphore(0)
 
         # If the worker exits before the parent process is done
         # setting up the _data_buffers then the pipe will get freed
@@ -787,12 +2138,26 @@ class _AsynchronousWorkerProcess:
         read_setup_complete_pipe, write_setup_complete_pipe = ctx.Pipe(
             duplex=False)
 
+        if shared_buffers is not None:
+            # The buffers already exist: pass them straight to the worker.
+            self._process = ctx.Process(target=self._main_loop,
+                                        args=(None, read_setup_complete_pipe,
+                                              data_event, host_event,
+                                              shared_buffers))
+            self._process.start()
+            read_setup_complete_pipe.close()
+            write_setup_complete_pipe.send(0)
+            return write_setup_complete_pipe, host_event, shared_buffers
+
+        read_data_pipe, write_data_pipe = ctx.Pipe(duplex=False)
+
         # Fetch the data on a seperate process.
         logger.debug("AsynchronousDataAccessor parent process: %d",
                      os.getpid())
         self._process = ctx.Process(target=self._main_loop,
                                     args=(write_data_pipe,
-                                          read_setup_complete_pipe))
+                                          read_setup_complete_pipe, data_event,
+                                          host_event))
         self._process.start()
         write_data_pipe.close()
         read_setup_complete_pipe.close()
@@ -800,7 +2165,7 @@ class _AsynchronousWorkerProcess:
         try:
             ready_to_read_index = read_data_pipe.recv()
             buffer_len = read_data_pipe.recv()
-            is_single_tensor = read_data_pipe.recv()
+            structure = read_data_pipe.recv()
             eof_event_tensor = read_data_pipe.recv()
             data_buffers = []
 
@@ -808,12 +2173,14 @@ class _AsynchronousWorkerProcess:
                 # Get the buffer from the host.
                 buffer = read_data_pipe.recv()
                 data_buffers.append(buffer)
+            slot_sizes = read_data_pipe.recv()
 
             # We're all set: let the worker know.
             write_setup_complete_pipe.send(0)
             # We reuse the read_setup_complete_pipe pipe as a shutdown pipe
-            return (write_setup_complete_pipe, ready_to_read_index,
-                    is_single_tensor, eof_event_tensor, data_buffers)
+            return (write_setup_complete_pipe, host_event,
+                    (ready_to_read_index, structure, eof_event_tensor,
+                     data_buffers, slot_sizes))
         except EOFError:
             pass
         # Exit the except block before raising a cleaner exception otherwise the previous one will not be cleared.
@@ -821,7 +2188,70 @@ class _AsynchronousWorkerProcess:
             "AsynchronousDataAccessor worker thread failed to start "
             "(Check above for details)")
 
-    def _main_loop(self, conn, pipe):  # pylint: disable=too-many-statements
+    def _shardDataLoader(self):
+        """Make this worker's copy of the DataLoader only load its share of
+        the batches: the ones whose index modulo the number of workers is
+        the worker's index."""
+        loader = self._dataset
+        attribute = "sampler" if loader.batch_sampler is None \
+                else "batch_sampler"
+        index_sampler = getattr(loader, attribute)
+
+        # The workers must all shuffle the indices in the same way.
+        sampler = getattr(loader.sampler, "real_sampler", loader.sampler)
+        sampler = getattr(sampler, "sampler", sampler)
+        if isinstance(sampler, torch.utils.data.RandomSampler
+                      ) and sampler.generator is None:
+            sampler.generator = torch.Generator()
+            sampler.generator.manual_seed(self._shuffle_seed)
+
+        # poptorch.DataLoader repeats the sampler indefinitely to reuse its
+        # workers: shard each epoch.
+        if hasattr(index_sampler, "real_sampler"):
+            index_sampler.real_sampler = _ShardedSampler(
+                index_sampler.real_sampler, self._worker_id,
+                self._num_workers)
+        else:
+            object.__setattr__(
+                loader, attribute,
+                _ShardedSampler(index_sampler, self._worker_id,
+                                self._num_workers))
+
+    def _iterate(self):
+        """Return an iterator over this worker's share of the dataset: the
+        elements whose index modulo the number of workers is the worker's
+        index."""
+        # DataLoaders are sharded once and IterableDatasets shard themselves.
+        if self._num_workers == 1 or not _isMapStyleDataset(self._dataset):
+            return iter(self._dataset)
+        return (self._dataset[index]
+                for index in range(self._worker_id, len(self._dataset),
+                                   self._num_workers))
+
+    @staticmethod
+    def _writeSlot(data, data_buffers, slot_sizes, ring_write_index):
+        for tensor, buffer, sizes in zip(data, data_buffers, slot_sizes):
+            slot = buffer[ring_write_index]
+            if sizes is None:
+                slot.copy_(tensor)
+                continue
+            assert tensor.dim() == slot.dim() and all(
+                size <= max_size
+                for size, max_size in zip(tensor.shape, slot.shape)), (
+                    "Tensor of shape %s doesn't fit in the maximum shape %s" %
+                    (list(tensor.shape), list(slot.shape)))
+            sizes[ring_write_index] = torch.tensor(tensor.shape)
+            _narrowTo(slot, tensor.shape).copy_(tensor)
+
+    def _nextSlot(self, ring_write_index):
+        ring_write_index += self._num_workers
+        # Ring back around.
+        if ring_write_index >= self._buffer_size:
+            ring_write_index -= self._buffer_size
+        return ring_write_index
+
+    def _main_loop(self, conn, pipe, data_event, host_event,
+                   shared_buffers=None):  # pylint: disable=too-many-statements
         # Make sure this process's output gets printed (In case of error)
         sys.stdout = io.TextIOWrapper(open(sys.stdout.fileno(), 'wb', 0),
                                       write_through=True)
@@ -829,70 +2259,118 @@ class _AsynchronousWorkerProcess:
                                       write_through=True)
         shutdown_now = False
         setup_complete = False
+        worker_id = self._worker_id
+
+        logger.debug("AsynchronousDataAccessor worker %d process: %d",
+                     worker_id, os.getpid())
+        global _asynchronous_worker_info  # pylint: disable=global-statement
+        _asynchronous_worker_info = AsynchronousWorkerInfo(
+            worker_id, self._num_workers)
+        if self._num_workers > 1 and _isSplittableDataLoader(self._dataset):
+            self._shardDataLoader()
+        dataset_iterator = self._iterate()
+
+        if shared_buffers is not None:
+            (ready_to_read_index, structure, eof_tensor, data_buffers,
+             slot_sizes) = shared_buffers
+            ring_write_index = worker_id
+        else:
+            data = None
+            try:
+                data = next(dataset_iterator)
+            except StopIteration:
+                pass
+            if data is None:
+                raise RuntimeError("The Dataset is empty")
+            if self._collate_into is not None:
+                # The shapes of the buffers come from the first batch.
+                data = torch.utils.data.dataloader.default_collate(data)
+
+            # Record how the tensors are nested once: only the tensors go
+            # through the ring buffer.
+            leaves = []
+            structure = _dataStructure(data, leaves)
+            data = leaves
+
+            # We communicate with the host via an array of sentinel values to say
+            # if the data is ready as this has much better latency than queue or
+            # lock approaches. (The semaphores are only used to avoid polling)
+            ready_to_read_index = torch.tensor(
+                [False] * self._buffer_size,
+                dtype=torch.bool).share_memory_()
+            conn.send(ready_to_read_index)
 
-        logger.debug("AsynchronousDataAccessor worker process: %d",
-                     os.getpid())
-        dataset_iterator = iter(self._dataset)
-
-        data = None
-        try:
-            data = next(dataset_iterator)
-        except StopIteration:
-            pass
-        if data is None:
-            raise RuntimeError("The Dataset is empty")
-
-        # We support either a single tensor or a flat 1D iterable of tensors.
-        is_single_tensor = False
-        if isinstance(data, torch.Tensor):
-            is_single_tensor = True
-            data = (data, )
-
-        # We communicate with the host via an array of sentinel values to say
-        # if the data is ready as this has much better latency than queue or
-        # lock approaches.
-        ready_to_read_index = torch.tensor([False] * self._buffer_size,
-                                           dtype=torch.bool).share_memory_()
-        conn.send(ready_to_read_index)
-
-        data_buffers = []
-
-        # Tell the host how many tensors we will be sending.
-        data_length = len(data)
-
-        conn.send(data_length)
-        conn.send(is_single_tensor)
-
-        # Share a small buffer with host to signal EOF and where in ring buffer the event occured.
-        # -1 means no event and the worker will keep loading. We start with a dummy event so the
-        # EOF won't be hit before the first call to __init__
-        eof_tensor = torch.tensor([42], dtype=torch.int).share_memory_()
-        conn.send(eof_tensor)
-
-        # Send the tensors to the host.
-        for index, tensor in enumerate(data):
-            assert isinstance(
-                tensor,
-                torch.Tensor), """Tensor at index %d is not a torch tensor.
-                    AsynchronousDataAccessor expects data to
-                    be organised as a flat 1D container of
-                    tensors.""" % index
-
-            # Shared with parent process.
-            memory = tensor.expand(
-                self._buffer_size,
-                *tensor.size()).clone().contiguous().share_memory_()
-            data_buffers.append(memory)
-
-            # Send it to the host.
-            conn.send(memory)
-
-        # We've loaded the first element as part of the spin up process.
-        ready_to_read_index[0] = True
+            data_buffers = []
 
-        ring_write_index = 1
+            # Tell the host how many tensors we will be sending.
+            data_length = len(data)
+
+            conn.send(data_length)
+            conn.send(structure)
+
+            # Share a small buffer with host to signal EOF and where in ring buffer the event occured.
+            # There is one event per worker: -1 means no event and the worker will keep loading.
+            # We start with a dummy event (-2) so the EOF won't be hit before the first call to __iter__
+            # The last element is where the first worker starts writing after an EOF when the
+            # elements are returned in order.
+            eof_tensor = torch.tensor([-2] * self._num_workers + [0],
+                                      dtype=torch.int).share_memory_()
+            conn.send(eof_tensor)
+
+            max_shapes = [None] * data_length
+            if self._max_shapes is not None:
+                max_shapes = _flattenData(self._max_shapes, structure, [])
+                assert len(max_shapes) == data_length, (
+                    "max_shapes must have the same structure as the elements"
+                    " of the dataset")
+
+            # The actual shape of the tensors with a maximum shape in each
+            # slot of the ring buffer.
+            slot_sizes = []
+
+            # Send the tensors to the host.
+            for tensor, max_shape in zip(data, max_shapes):
+                # Shared with parent process.
+                if max_shape is None:
+                    memory = tensor.expand(
+                        self._buffer_size,
+                        *tensor.size()).clone().contiguous().share_memory_()
+                    slot_sizes.append(None)
+                else:
+                    memory = tensor.new_zeros(
+                        (self._buffer_size, ) +
+                        tuple(max_shape)).share_memory_()
+                    slot_sizes.append(
+                        torch.zeros(self._buffer_size,
+                                    len(max_shape),
+                                    dtype=torch.long).share_memory_())
+                data_buffers.append(memory)
+
+                # Send it to the host.
+                conn.send(memory)
+            conn.send(slot_sizes)
+
+            # We've loaded the first element as part of the spin up process.
+            self._writeSlot(data, data_buffers, slot_sizes, 0)
+            ready_to_read_index[0] = True
+            data_event.release()
+            ring_write_index = self._nextSlot(0)
+
+        # The views of each slot passed to collate_into.
+        slot_views = None
+        if self._collate_into is not None:
+            slot_views = [
+                _unflattenData(structure,
+                               iter([buffer[index] for buffer in data_buffers]))
+                for index in range(self._buffer_size)
+            ]
+
+        # Maximum time to block before checking for messages from the parent.
+        wait_timeout = self._miss_sleep_time_in_ms / 1000
 
         any_data_sent = True
+        notified = False
+        restarting = False
 
         while not shutdown_now:
             # Check for messages from the parent process:
@@ -905,66 +2383,85 @@ class _AsynchronousWorkerProcess:
                     continue
                 setup_complete = True
             # If we hit EOF sleep till re-awakened by host
-            if eof_tensor[0] != -1:
-                time.sleep(self._miss_sleep_time_in_ms)
+            if eof_tensor[worker_id] != -1:
+                host_event.acquire(timeout=wait_timeout)
                 continue
 
+            if restarting:
+                restarting = False
+                # Start the new epoch where the host expects it.
+                if self._ordered:
+                    ring_write_index = (eof_tensor[self._num_workers].item() +
+                                        worker_id) % self._buffer_size
+
             try:
 
                 # Only pull the next iteration if we sent data the last one,
                 # otherwise try send the old one again.
                 if any_data_sent:
                     data = next(dataset_iterator)
-                    if isinstance(data, torch.Tensor):
-                        data = (data, )
+                    if self._collate_into is None:
+                        data = _flattenData(data, structure, [])
             except StopIteration:
+                # Tell the host where the EOF occured.
+                eof_tensor[worker_id] = ring_write_index
+                data_event.release()
+
                 # If we are not to load indefinitely we just kill the worker.
                 if not self._load_indefinitely:
                     logger.debug(
-                        "AsynchronousDataAccessor worker: end of dataset"
-                        " reached")
+                        "AsynchronousDataAccessor worker %d: end of dataset"
+                        " reached", worker_id)
                     break
 
                 logger.debug(
-                    "AsynchronousDataAccessor worker: end of dataset reached."
-                    " Creating a new iterator")
+                    "AsynchronousDataAccessor worker %d: end of dataset "
+                    "reached. Creating a new iterator", worker_id)
                 # We always reset and will keep the worker thread running.
-                dataset_iterator = iter(self._dataset)
-
-                # Tell the host where the EOF occured.
-                eof_tensor[0] = ring_write_index
+                dataset_iterator = self._iterate()
+                restarting = True
                 logger.debug(
-                    "AsynchronousDataAccessor worker: new iterator ready")
+                    "AsynchronousDataAccessor worker %d: new iterator ready",
+                    worker_id)
                 continue
 
             any_data_sent = False
 
             if not ready_to_read_index[ring_write_index]:
-                # Copy the tensor into the preallocated shared memory.
-                for index, tensor in enumerate(data):
-                    data_buffers[index][ring_write_index].copy_(tensor)
+                if self._collate_into is not None:
+                    # Collate the samples straight into the shared memory.
+                    self._collate_into(slot_views[ring_write_index], data)
+                else:
+                    # Copy the tensor into the preallocated shared memory.
+                    self._writeSlot(data, data_buffers, slot_sizes,
+                                    ring_write_index)
 
                 # Tell the host this data is ready.
                 ready_to_read_index[ring_write_index] = True
+                data_event.release()
+                # This slot was freed by the host: consume its notification
+                # unless it has already been consumed by the wait below.
+                if not notified:
+                    host_event.acquire(block=False)
 
                 # Quit the loop
                 any_data_sent = True
 
-                ring_write_index += 1
-
-                # Ring back around.
-                if ring_write_index >= self._buffer_size:
-                    ring_write_index = 0
+                ring_write_index = self._nextSlot(ring_write_index)
 
-            # (Briefly) sleep the thread if we didn't fetch any data.
+            # Wait for the host to release a slot if the ring is full.
+            notified = False
             if not any_data_sent:
-                time.sleep(self._miss_sleep_time_in_ms)
+                notified = host_event.acquire(timeout=wait_timeout)
 
         logger.debug(
-            "AsynchronousDataAccessor worker: ready to exit: checking parent"
-            " is ready")
+            "AsynchronousDataAccessor worker %d: ready to exit: checking "
+            "parent is ready", worker_id)
         # In the unlikely event the worker is done reading the dataset
         # before the parent is done setting the buffers up: wait here.
         if not setup_complete:
             pipe.recv()
-        logger.debug("AsynchronousDataAccessor worker: clean exit")
+        # Don't keep the host waiting for more data.
+        data_event.release()
+        logger.debug("AsynchronousDataAccessor worker %d: clean exit",
+                     worker_id)
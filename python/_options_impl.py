@@ -42,12 +42,19 @@ class OptionsDict:
             del self._values[option]
 
     def __getstate__(self):
-        return self._values
+        # Include the attributes set by the subclasses (e.g the sub-groups of
+        # poptorch.Options) so that options can be sent to other processes.
+        return self.__dict__
 
     def __setstate__(self, state):
-        self._values = state
+        self.__dict__.update(state)
 
     def __getattr__(self, option):
+        # Special attributes (e.g __deepcopy__) are looked up by Python
+        # itself, sometimes before _values has been restored: they're not
+        # options.
+        if option.startswith("__") or option == "_values":
+            raise AttributeError(option)
         assert self.exists(
             option), ("Invalid option %s, "
                       "valid options are %s") % (option, self._values.keys())
@@ -0,0 +1,88 @@
+# Copyright (c) 2020 Graphcore Ltd. All rights reserved.
+import torch
+
+
+def _counts(numerator, denominator):
+    return torch.stack(
+        [numerator, torch.full_like(numerator, float(denominator))])
+
+
+def accuracy(output, target):
+    """Number of samples for which the class with the highest score in
+    ``output`` is ``target``.
+
+    :param torch.Tensor output: Scores of shape ``[..., num_classes]``.
+    :param torch.Tensor target: Class indices of shape ``[...]``.
+    :returns: The tensor ``[num_correct, num_samples]``: use
+        :py:func:`ratio` to get the accuracy.
+    """
+    predictions = torch.argmax(output, dim=-1)
+    return _counts(torch.eq(predictions, target).float().sum(),
+                   target.numel())
+
+
+def topKAccuracy(output, target, k):
+    """Number of samples for which ``target`` is one of the ``k`` classes
+    with the highest scores in ``output``.
+
+    :param torch.Tensor output: Scores of shape ``[..., num_classes]``.
+    :param torch.Tensor target: Class indices of shape ``[...]``.
+    :param int k: Number of predictions to consider.
+    :returns: The tensor ``[num_correct, num_samples]``: use
+        :py:func:`ratio` to get the accuracy.
+    """
+    _, predictions = torch.topk(output, k, dim=-1)
+    correct = torch.eq(predictions, target.unsqueeze(-1)).float().sum()
+    return _counts(correct, target.numel())
+
+
+def meanLoss(loss):
+    """Accumulate a loss to compute its mean across all the batches.
+
+    :param torch.Tensor loss: The (already reduced) loss of the batch.
+    :returns: The tensor ``[loss, 1]``: use :py:func:`ratio` to get the
+        mean loss.
+    """
+    return _counts(loss.detach().sum(), 1)
+
+
+def confusionMatrix(output, target, num_classes):
+    """Number of samples of each class predicted as each class.
+
+    :param torch.Tensor output: Scores of shape ``[..., num_classes]``.
+    :param torch.Tensor target: Class indices of shape ``[...]``.
+    :param int num_classes: Number of classes.
+    :returns: A tensor of shape ``[num_classes, num_classes]`` where the
+        element ``[i, j]`` is the number of samples of class ``i`` predicted
+        as class ``j``. Use :py:func:`confusionCounts` to combine the
+        matrices returned by the device.
+    """
+    classes = torch.arange(num_classes)
+    predictions = torch.argmax(output, dim=-1).reshape(-1, 1)
+    predicted = torch.eq(predictions, classes).float()
+    actual = torch.eq(target.reshape(-1, 1), classes).float()
+    return torch.matmul(actual.transpose(0, 1), predicted)
+
+
+def ratio(metric):
+    """Return the value of a metric returned by :py:func:`accuracy`,
+    :py:func:`topKAccuracy` or :py:func:`meanLoss`.
+
+    The counts of all the batches and replicas returned are combined.
+
+    :param torch.Tensor metric: Output of the model.
+    :rtype: float
+    """
+    totals = metric.reshape(-1, 2).sum(dim=0)
+    return (totals[0] / totals[1]).item()
+
+
+def confusionCounts(metric, num_classes):
+    """Combine the confusion matrices returned for all the batches and
+    replicas by :py:func:`confusionMatrix`.
+
+    :param torch.Tensor metric: Output of the model.
+    :param int num_classes: Number of classes.
+    :returns: A tensor of shape ``[num_classes, num_classes]``.
+    """
+    return metric.reshape(-1, num_classes, num_classes).sum(dim=0)
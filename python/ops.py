@@ -1,9 +1,25 @@
 # Copyright (c) 2020 Graphcore Ltd. All rights reserved.
+import threading
 import torch
 from . import enums
 
 _end_ipu_block = torch.ops.poptorch.end_ipu_block
 
+# The stages manager is set by the ExecutionStrategy before the graph is
+# traced, for the tracing thread only: models can be traced in a background
+# thread (See PoplarExecutor.compileAsync) while other models run on the CPU.
+# If it's None then it means it's a CPU execution of the graph so turn the
+# blocks into no-ops.
+_tracing_state = threading.local()
+
+
+def _stagesManager():
+    return getattr(_tracing_state, "stages_manager", None)
+
+
+def _setStagesManager(stages_manager):
+    _tracing_state.stages_manager = stages_manager
+
 
 def ipu_print_tensor(tensor, title=""):
     return torch.ops.poptorch.ipu_print_tensor(tensor, title)
@@ -116,10 +132,6 @@ class Block(torch.nn.Module):
     ...     self.layer = MyLayer(x)
 
     """
-    # Will be set by the ExecutionStrategy before the graph is traced.
-    # If it's None then it means it's a CPU execution of the graph so
-    # turn the whole class into a no-op.
-    _stages_manager = None
 
     @staticmethod
     def useAutoId():
@@ -137,8 +149,9 @@ class Block(torch.nn.Module):
         >>> with poptorch.Block(): # user_id = "1"
         ...     layer()
         """
-        if Block._stages_manager is not None:
-            Block._stages_manager.resetAutoId()
+        stages_manager = _stagesManager()
+        if stages_manager is not None:
+            stages_manager.resetAutoId()
 
     def __init__(self, user_id=None, ipu_id=None):
         """
@@ -159,8 +172,9 @@ class Block(torch.nn.Module):
         self._ipu_id = ipu_id
 
     def __enter__(self):
-        if Block._stages_manager is not None:
-            Block._stages_manager.beginStage(self._user_id, self._ipu_id)
+        stages_manager = _stagesManager()
+        if stages_manager is not None:
+            stages_manager.beginStage(self._user_id, self._ipu_id)
 
     def __exit__(self, type, value, traceback):
         _end_ipu_block()
@@ -207,10 +221,11 @@ class BeginBlock(torch.nn.Module):
         self._ipu_id = ipu_id
 
     def __call__(self, *input, **kwargs):
-        if Block._stages_manager is not None:
+        stages_manager = _stagesManager()
+        if stages_manager is not None:
             if self._user_id is None:
-                self._user_id = Block._stages_manager.nextAutoId()
-            Block._stages_manager.beginStage(self._user_id, self._ipu_id)
+                self._user_id = stages_manager.nextAutoId()
+            stages_manager.beginStage(self._user_id, self._ipu_id)
 
         out = self._layer_to_call(*input, **kwargs)
         return out
@@ -1,4 +1,5 @@
 # Copyright (c) 2020 Graphcore Ltd. All rights reserved.
+import abc
 import math
 import inspect
 import torch
@@ -306,3 +307,133 @@ _check_constructor_match_parent(AdamW, [
     "firstOrderMomentumAccumType", "secondOrderMomentumAccumType"
 ])
 _check_constructor_match_parent(RMSprop, ["loss_scaling"])
+
+
+class LRSchedule(abc.ABC):
+    """Base class for the learning rate schedules.
+
+    A schedule returns the factor to apply to the learning rate of each
+    parameter group for a given optimizer step. Warmup, if any, linearly
+    increases the factor from ``1 / warmup_steps`` to 1 over the first
+    ``warmup_steps`` steps.
+
+    Schedules are attached to a training model using
+    :py:meth:`poptorch.PoplarExecutor.setLRSchedule`.
+    """
+
+    def __init__(self, warmup_steps=0):
+        """
+        :param int warmup_steps: Number of warmup steps.
+        """
+        assert isinstance(warmup_steps, int) and warmup_steps >= 0, (
+            "warmup_steps must be a positive integer")
+        self.warmup_steps = warmup_steps
+
+    def __call__(self, step):
+        if step < self.warmup_steps:
+            return (step + 1) / self.warmup_steps
+        return self.factor(step - self.warmup_steps)
+
+    @abc.abstractmethod
+    def factor(self, step):
+        """Return the factor to apply to the learning rate ``step`` steps
+        after the end of the warmup.
+        """
+
+
+class _DecaySchedule(LRSchedule):
+    def __init__(self, total_steps, end_factor, warmup_steps):
+        super().__init__(warmup_steps)
+        assert total_steps > warmup_steps, ("total_steps must be greater "
+                                            "than warmup_steps")
+        self.total_steps = total_steps
+        self.end_factor = end_factor
+
+    def factor(self, step):
+        progress = min(step / (self.total_steps - self.warmup_steps), 1.0)
+        return self.end_factor + (1.0 - self.end_factor) * self._decay(
+            progress)
+
+    @abc.abstractmethod
+    def _decay(self, progress):
+        """Return the decay, from 1 to 0, for the given progress (between 0
+        and 1)."""
+
+
+class LinearDecay(_DecaySchedule):
+    """Linearly decay the learning rate from its initial value to
+    ``end_factor`` times its initial value at step ``total_steps``.
+    """
+
+    def __init__(self, total_steps, end_factor=0.0, warmup_steps=0):
+        """
+        :param int total_steps: Step at which the decay ends (Including the
+            warmup steps).
+        :param float end_factor: Factor applied to the learning rate at the
+            end of the decay.
+        :param int warmup_steps: Number of warmup steps.
+        """
+        super().__init__(total_steps, end_factor, warmup_steps)
+
+    def _decay(self, progress):
+        return 1.0 - progress
+
+
+class CosineDecay(_DecaySchedule):
+    """Decay the learning rate from its initial value to ``end_factor``
+    times its initial value at step ``total_steps`` following a half cosine.
+    """
+
+    def __init__(self, total_steps, end_factor=0.0, warmup_steps=0):
+        """
+        :param int total_steps: Step at which the decay ends (Including the
+            warmup steps).
+        :param float end_factor: Factor applied to the learning rate at the
+            end of the decay.
+        :param int warmup_steps: Number of warmup steps.
+        """
+        super().__init__(total_steps, end_factor, warmup_steps)
+
+    def _decay(self, progress):
+        return 0.5 * (1.0 + math.cos(math.pi * progress))
+
+
+class PolynomialDecay(_DecaySchedule):
+    """Decay the learning rate from its initial value to ``end_factor``
+    times its initial value at step ``total_steps`` following a polynomial
+    of degree ``power``.
+    """
+
+    def __init__(self, total_steps, power=1.0, end_factor=0.0,
+                 warmup_steps=0):
+        """
+        :param int total_steps: Step at which the decay ends (Including the
+            warmup steps).
+        :param float power: Degree of the polynomial.
+        :param float end_factor: Factor applied to the learning rate at the
+            end of the decay.
+        :param int warmup_steps: Number of warmup steps.
+        """
+        super().__init__(total_steps, end_factor, warmup_steps)
+        self.power = power
+
+    def _decay(self, progress):
+        return (1.0 - progress)**self.power
+
+
+class StepDecay(LRSchedule):
+    """Multiply the learning rate by ``gamma`` every ``step_size`` steps."""
+
+    def __init__(self, step_size, gamma=0.1, warmup_steps=0):
+        """
+        :param int step_size: Number of steps between two decays.
+        :param float gamma: Factor applied to the learning rate at each decay.
+        :param int warmup_steps: Number of warmup steps.
+        """
+        super().__init__(warmup_steps)
+        assert step_size > 0, "step_size must be strictly positive"
+        self.step_size = step_size
+        self.gamma = gamma
+
+    def factor(self, step):
+        return self.gamma**(step // self.step_size)
@@ -17,7 +17,7 @@ class _JitOptions(_options_impl.OptionsDict):
     """
 
     def __init__(self):
-        super().__init__(trace_model=True)
+        super().__init__(trace_model=True, max_executables=1)
 
     def traceModel(self, trace_model):
         """
@@ -30,6 +30,76 @@ class _JitOptions(_options_impl.OptionsDict):
         self.set(trace_model=trace_model)
         return self
 
+    def maxExecutables(self, max_executables):
+        """Maximum number of executables an inference model can keep, one
+        per input signature (number of arguments, shapes and types of the
+        input tensors).
+
+        If greater than 1, calling the model with a new signature compiles a
+        new executable instead of failing, and calling it again with a
+        signature used before switches back to the executable compiled for
+        it. Once the limit is reached the least recently used executable is
+        destroyed and its IPUs are released.
+
+        .. warning:: Each executable is attached to its own IPUs.
+
+        Only supported by inference models. Default: 1.
+        """
+        assert isinstance(max_executables, int)
+        assert max_executables > 0, ("max_executables must be strictly "
+                                     "positive")
+        self.set(max_executables=max_executables)
+        return self
+
+
+class _HostOptions(_options_impl.OptionsDict):
+    """Options related to how the host drives the execution of the model.
+
+    .. note:: These options only affect the Python frontend: they are not
+        passed to the backend.
+
+    Can be accessed via :py:attr:`poptorch.Options.Host`:
+
+    >>> opts = poptorch.Options()
+    >>> opts.Host.maxStepsInFlight(4)
+    >>> opts.Host.outputBufferPoolDepth(2)
+    """
+
+    def __init__(self):
+        super().__init__(max_steps_in_flight=2, output_buffer_pool_depth=0)
+
+    def maxStepsInFlight(self, max_steps_in_flight):
+        """Maximum number of steps submitted using
+        :py:meth:`poptorch.PoplarExecutor.executeAsync` which can be pending
+        at any given time.
+
+        Once this limit is reached ``executeAsync`` blocks until the oldest
+        step has completed.
+
+        Default: 2.
+        """
+        assert isinstance(max_steps_in_flight, int)
+        assert max_steps_in_flight > 0, ("max_steps_in_flight must be "
+                                         "strictly positive")
+        self.set(max_steps_in_flight=max_steps_in_flight)
+        return self
+
+    def outputBufferPoolDepth(self, depth):
+        """Number of sets of output tensors to preallocate and reuse in
+        rotation between steps.
+
+        An output tensor is only reused once it is no longer referenced
+        outside of the pool (including by views), so holding on to the
+        results of a step is always safe: a new tensor gets allocated to
+        replace it in the pool.
+
+        If 0 (default): new output tensors are allocated for every step.
+        """
+        assert isinstance(depth, int)
+        assert depth >= 0, "depth must be positive"
+        self.set(output_buffer_pool_depth=depth)
+        return self
+
 
 class _TrainingOptions(_options_impl.OptionsDict):
     """Options specific to model training.
@@ -344,11 +414,11 @@ class _IExecutionStrategy:
 
     def onStartTracing(self):
         self._stages_manager.clearDebug()
-        ops.Block._stages_manager = self._stages_manager  # pylint: disable=protected-access
+        ops._setStagesManager(self._stages_manager)  # pylint: disable=protected-access
 
     def onEndTracing(self):
         self._stages_manager.printDebug()
-        ops.Block._stages_manager = None  # pylint: disable=protected-access
+        ops._setStagesManager(None)  # pylint: disable=protected-access
 
     def backendOptions(self):
         return {}
@@ -700,6 +770,7 @@ class Options(_options_impl.OptionsDict):
 
     def __init__(self):
         self._jit = _JitOptions()
+        self._host = _HostOptions()
         self._training = _TrainingOptions()
         self._popart = _PopartOptions()
         self._distributed = _DistributedOptions()
@@ -715,7 +786,8 @@ class Options(_options_impl.OptionsDict):
                          use_model=False,
                          connection_type=enums.ConnectionType.Always.value,
                          sync_pattern=enums.SyncPattern.Full.value,
-                         available_memory_proportion={})
+                         available_memory_proportion={},
+                         output_anchors={})
 
     @property
     def TensorLocations(self):
@@ -738,6 +810,13 @@ class Options(_options_impl.OptionsDict):
         .. seealso:: :py:class:`poptorch.options._JitOptions`"""
         return self._jit
 
+    @property
+    def Host(self):
+        """Options related to how the host drives the execution.
+
+        .. seealso:: :py:class:`poptorch.options._HostOptions`"""
+        return self._host
+
     @property
     def Training(self):
         """Options specific to training.
@@ -831,6 +910,10 @@ class Options(_options_impl.OptionsDict):
         """If ``path`` is ``None``: disable executable caching.
 
         Otherwise use ``path`` as a cache to save / load Poplar executables.
+        The result of the lowering of the traced graph to PopART is cached
+        too: when a model with the same graph, inputs and options is compiled
+        again (e.g. after restarting the process) both the graph passes and
+        the Poplar compilation are skipped.
         """
         if path is None:
             self.Popart.set("enableEngineCaching", False)
@@ -948,6 +1031,48 @@ class Options(_options_impl.OptionsDict):
                  anchor_return_period=anchor_return_period or 1)
         return self
 
+    def outputAnchorMode(self,
+                         output,
+                         anchor_mode,
+                         anchor_return_period=None):
+        """Override the anchor mode set by :py:meth:`anchorMode` for one of
+        the outputs of the model.
+
+        For example in training, to return the loss of every batch but only
+        the logits of the last one:
+
+        >>> opts.anchorMode(poptorch.AnchorMode.All)
+        >>> opts.outputAnchorMode(0, poptorch.AnchorMode.Final)  # logits
+
+        :param int output: Position of the output in the flattened outputs
+            of the model. (e.g. for ``return a, (b, c)``, ``c`` is the output
+            2)
+        :param anchor_mode: How the output is returned, or None if it never
+            needs to be copied to the host: None is then returned in its
+            place.
+        :type anchor_mode: poptorch.AnchorMode or None
+        :param int anchor_return_period: Return period when using
+            ``AnchorMode.EveryN``.
+        """
+        assert isinstance(output, int) and output >= 0, (
+            "output must be the position of an output of the model")
+        if anchor_mode is None:
+            mode = "none"
+        else:
+            assert isinstance(anchor_mode, enums.AnchorMode)
+            assert anchor_mode != enums.AnchorMode.Default, (
+                "The anchor mode of an output can't be AnchorMode.Default")
+            if anchor_mode == enums.AnchorMode.EveryN:
+                assert anchor_return_period and anchor_return_period > 0, (
+                    "EveryN anchor must have anchor_return_period set to "
+                    "valid positive integer")
+            mode = "%d %d" % (anchor_mode.value, anchor_return_period or 1)
+        self.createOrSet(output_anchors={
+            **self.output_anchors,
+            str(output): mode
+        })
+        return self
+
     def defaultAnchorMode(self):
         """
         :return: True if the anchorMode is currently set to Default;
@@ -965,8 +1090,8 @@ class Options(_options_impl.OptionsDict):
         return self
 
     def toDict(self):
-        """ Merge all the options, except for the Jit ones, into a single
-        dictionary to be serialised and passed to the C++ backend.
+        """ Merge all the options, except for the Jit and Host ones, into a
+        single dictionary to be serialised and passed to the C++ backend.
 
         :meta private:
         """
@@ -178,15 +178,33 @@ std::vector<Optimizer> parseOptimizer(const py::dict &opt) {
   return optimizers;
 }
 
-std::map<std::string, void *>
+// Process a partial optimizer dictionary containing only the hyperparameters
+// which changed for each group: {group: {name: (value, is_const)}}
+std::map<std::uint64_t, Optimizer::ParamList>
+parseOptimizerUpdate(const py::dict &opt) {
+  std::map<std::uint64_t, Optimizer::ParamList> params;
+  for (auto element : opt) {
+    ERROR_ON_MSG(!py::isinstance<py::int_>(element.first),
+                 "(Internal) Unexpected key in optimizer update");
+    Optimizer::ParamList &group = params[element.first.cast<std::uint64_t>()];
+    for (auto optimizer_field : element.second.cast<py::dict>()) {
+      group[optimizer_field.first.cast<std::string>()] =
+          optimizer_field.second.cast<std::pair<float, bool>>();
+    }
+  }
+  return params;
+}
+
+std::vector<PoplarExecutable::NamedBuffer>
 getParameterBuffers(const pybind11::tuple &names,
                     const pybind11::tuple &tensors) {
   ERROR_ON(names.size() != tensors.size());
-  std::map<std::string, void *> parameters;
+  std::vector<PoplarExecutable::NamedBuffer> parameters;
+  parameters.reserve(names.size());
   torch::jit::Stack stack = torch::jit::toTraceableStack(tensors);
   for (std::uint64_t i = 0; i < names.size(); ++i) {
-    parameters.insert(
-        {names[i].cast<std::string>(), stack[i].toTensor().data_ptr()});
+    parameters.emplace_back(names[i].cast<std::string>(),
+                            stack[i].toTensor().data_ptr());
   }
   return parameters;
 }
@@ -414,6 +432,51 @@ void copyWeightsToDeviceImpl(
   }
 }
 
+void setOutputBufferPoolDepth(
+    const std::shared_ptr<poptorch::PoplarExecutable> &executable,
+    std::uint64_t depth) {
+  executable->setOutputBufferPoolDepth(depth);
+}
+
+void detachFromDevice(
+    const std::shared_ptr<poptorch::PoplarExecutable> &executable) {
+  try {
+    executable->detachFromDevice();
+  }
+  CATCH_AND_RETHROW_AS_POPTORCH_EXCEPTION
+}
+
+void saveExecutableState(
+    const std::shared_ptr<poptorch::PoplarExecutable> &executable,
+    const std::string &filename) {
+  try {
+    executable->saveState(filename);
+  }
+  CATCH_AND_RETHROW_AS_POPTORCH_EXCEPTION
+}
+
+void exportExecutable(
+    const std::shared_ptr<poptorch::PoplarExecutable> &executable,
+    const std::string &directory) {
+  try {
+    executable->exportExecutable(directory);
+  }
+  CATCH_AND_RETHROW_AS_POPTORCH_EXCEPTION
+}
+
+std::shared_ptr<poptorch::PoplarExecutable>
+loadExecutableState(const std::string &filename, const pybind11::dict &options,
+                    bool training, const py::dict &optimizerDict) {
+  try {
+    auto optimizers = parseOptimizer(optimizerDict);
+    auto session_options = parseSessionOptions(options);
+    py::gil_scoped_release release;
+    return poptorch::loadFromState(filename, training, std::move(optimizers),
+                                   session_options);
+  }
+  CATCH_AND_RETHROW_AS_POPTORCH_EXCEPTION
+}
+
 std::string
 getPopartIR(const std::shared_ptr<poptorch::PoplarExecutable> &executable) {
   return executable->getPopartIR();
@@ -427,7 +490,8 @@ void setLogLevel(std::uint64_t level) {
 
 std::vector<pybind11::object>
 execute(const std::shared_ptr<poptorch::PoplarExecutable> &executable,
-        const pybind11::tuple &inputs, py::dict *optimizerDict) {
+        const pybind11::tuple &inputs, py::dict *optimizerDict,
+        const pybind11::tuple &outputs) {
   try {
     // Create a jit stack from the incoming pytorch tensors.
     torch::jit::Stack input_stack = torch::jit::toTraceableStack(inputs);
@@ -439,15 +503,35 @@ execute(const std::shared_ptr<poptorch::PoplarExecutable> &executable,
       buildTensorList(value, &input_tensors);
     }
 
+    // Optional tensors provided by the user to write the outputs to.
+    std::vector<at::Tensor> out_tensors;
+    for (const torch::jit::IValue &value :
+         torch::jit::toTraceableStack(outputs)) {
+      buildTensorList(value, &out_tensors);
+    }
+
     // Create an empty optimizer for inference, this will not be applied.
     std::vector<Optimizer> optimizers;
 
-    if (optimizerDict) {
-      optimizers = parseOptimizer(*optimizerDict);
+    // The frontend either sends a full optimizer or only the hyperparameters
+    // which changed since the previous update.
+    if (optimizerDict && !optimizerDict->empty()) {
+      if (optimizerDict->contains("optimizer_type")) {
+        optimizers = parseOptimizer(*optimizerDict);
+      } else {
+        optimizers =
+            executable->updateOptimizers(parseOptimizerUpdate(*optimizerDict));
+      }
     }
 
-    std::vector<at::IValue> output_tensors =
-        executable->run(&input_tensors, optimizers);
+    std::vector<at::IValue> output_tensors;
+    {
+      // Release the GIL while the device is running so that other Python
+      // threads (See PoplarExecutor.executeAsync) can make progress.
+      py::gil_scoped_release release;
+      output_tensors =
+          executable->run(&input_tensors, optimizers, out_tensors);
+    }
 
     std::vector<pybind11::object> returnee;
 
@@ -630,10 +714,15 @@ std::shared_ptr<poptorch::PoplarExecutable> compileWithTrace(
 
     logging::trace("Graph right before popart:\n{}", *graph);
 
+    auto session_options = parseSessionOptions(options);
+    // The lowering and the Poplar compilation don't need the GIL: release it
+    // so that other Python threads can make progress in the meantime.
+    // (See PoplarExecutor.compileAsync)
+    py::gil_scoped_release release;
     return poptorch::lowerToPopart(
         graph.get(), &input_tensors, std::move(traced_tensors),
         std::move(parameters), training, std::move(optimizers),
-        parseSessionOptions(options));
+        session_options);
   }
   CATCH_AND_RETHROW_AS_POPTORCH_EXCEPTION
 }
@@ -722,9 +811,12 @@ std::shared_ptr<poptorch::PoplarExecutable> compileWithScript(
 
     logging::debug("Graph right before popart:\n{}", *graph);
 
-    return poptorch::lowerToPopart(
-        graph.get(), &input_tensors, std::move(parameter_data),
-        std::move(parameters), training, {}, parseSessionOptions(options));
+    auto session_options = parseSessionOptions(options);
+    py::gil_scoped_release release;
+    return poptorch::lowerToPopart(graph.get(), &input_tensors,
+                                   std::move(parameter_data),
+                                   std::move(parameters), training, {},
+                                   session_options);
   }
   CATCH_AND_RETHROW_AS_POPTORCH_EXCEPTION
 }
@@ -791,7 +883,14 @@ PYBIND11_MODULE(poptorch_core, m) { // NOLINT
 
   m.def("compileWithTrace", poptorch::compileWithTrace);
   m.def("compileWithScript", poptorch::compileWithScript);
-  m.def("execute", poptorch::execute);
+  m.def("saveExecutableState", poptorch::saveExecutableState);
+  m.def("loadExecutableState", poptorch::loadExecutableState);
+  m.def("exportExecutable", poptorch::exportExecutable);
+  m.def("execute", poptorch::execute, py::arg("executable"),
+        py::arg("inputs"), py::arg("optimizerDict"),
+        py::arg("outputs") = py::tuple());
+  m.def("setOutputBufferPoolDepth", poptorch::setOutputBufferPoolDepth);
+  m.def("detachFromDevice", poptorch::detachFromDevice);
   m.def("propagateInputShapes", poptorch::pyPropagateInputShapes);
   m.def("peepholeOptimizations", poptorch::pyPeepholeOptimizations);
   m.def("eliminateListConstructs", poptorch::pyEliminateListConstructs);
@@ -0,0 +1,201 @@
+# Copyright (c) 2020 Graphcore Ltd. All rights reserved.
+import collections
+import concurrent.futures
+import threading
+import time
+
+import torch
+
+from . import enums
+from ._impl import PoplarExecutor
+from ._logging import logger
+from .options import Options
+
+
+class _Request:
+    def __init__(self, args):
+        self.args = args
+        self.rows = args[0].shape[0]
+        self.future = concurrent.futures.Future()
+        self.submit_time = time.perf_counter()
+
+
+class BatchingExecutor:
+    """Merge small concurrent inference requests into full device steps.
+
+    Each device step processes ``batch_size * deviceIterations *
+    replicationFactor`` rows. Requests are queued and a worker thread
+    concatenates them along their first dimension until either a step is
+    full or the oldest request has waited ``max_latency`` seconds. Partial
+    steps are padded with zeros. The outputs are then sliced and returned
+    to each caller.
+
+    >>> server = poptorch.serving.BatchingExecutor(model, batch_size=4)
+    >>> future = server.submit(torch.rand(1, 16))
+    >>> output = future.result()
+    >>> output = server(torch.rand(1, 16))  # Blocking version.
+    >>> server.latencyPercentile(99)
+
+    Use ``asyncio.wrap_future()`` to await the futures from a coroutine.
+
+    :param torch.nn.Module model: The PyTorch model to run.
+    :param int batch_size: Batch size of the model: number of rows of each
+        device iteration.
+    :param poptorch.Options options: The IPU specific options. The anchor
+        mode must be ``AnchorMode.All``.
+    :param float max_latency: Maximum time in seconds a request waits for
+        other requests to fill the step before the step is run anyway.
+    :param int latency_history: Number of request latencies to keep.
+    """
+
+    def __init__(self,
+                 model,
+                 batch_size,
+                 options=None,
+                 max_latency=0.005,
+                 latency_history=10000):
+        options = options or Options()
+        assert options.anchor_mode in (
+            enums.AnchorMode.All.value, enums.AnchorMode.Default.value), (
+                "BatchingExecutor needs the outputs of all the batches: "
+                "the anchor mode must be AnchorMode.All")
+        assert max_latency >= 0, "max_latency must be positive"
+        self._executor = PoplarExecutor(model=model,
+                                        options=options,
+                                        training=False)
+        self._step_rows = batch_size * options.device_iterations * \
+                options.replication_factor
+        self._max_latency = max_latency
+        self._latencies = collections.deque(maxlen=latency_history)
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._mainLoop,
+                                        name="BatchingExecutor",
+                                        daemon=True)
+        self._worker.start()
+
+    @property
+    def executor(self):
+        """The :py:class:`poptorch.PoplarExecutor` running the steps."""
+        return self._executor
+
+    @property
+    def stepSize(self):
+        """Number of rows processed by each device step."""
+        return self._step_rows
+
+    def submit(self, *args):
+        """Queue a request.
+
+        :param args: The input tensors of the model. Their first dimension
+            is the number of rows of the request, which must be the same for
+            all of them and not greater than :py:attr:`stepSize`.
+        :returns: A ``concurrent.futures.Future`` which will hold the
+            outputs of the model for the rows of this request.
+        """
+        assert args and all(isinstance(a, torch.Tensor) for a in args), (
+            "BatchingExecutor only supports positional tensor arguments")
+        request = _Request(args)
+        assert all(a.shape[0] == request.rows for a in args), (
+            "All the inputs of a request must have the same number of rows")
+        assert 0 < request.rows <= self._step_rows, (
+            "A request must have between 1 and %d rows: got %d" %
+            (self._step_rows, request.rows))
+        with self._condition:
+            assert not self._stopped, "The executor has been stopped"
+            self._queue.append(request)
+            self._condition.notify()
+        return request.future
+
+    def __call__(self, *args):
+        """Same as :py:meth:`submit` but waits for the outputs and returns
+        them."""
+        return self.submit(*args).result()
+
+    def latencies(self):
+        """Return the latencies, in seconds, of the most recent requests:
+        from the time they were submitted to the time their outputs were
+        available."""
+        return list(self._latencies)
+
+    def latencyPercentile(self, percentile):
+        """Return the given percentile (e.g. 99) of :py:meth:`latencies` or
+        None if no request has completed yet."""
+        latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        index = round(percentile / 100 * (len(latencies) - 1))
+        return latencies[min(max(index, 0), len(latencies) - 1)]
+
+    def _nextStep(self):
+        """Wait for requests and return the ones to run in the next step, or
+        None if the executor has been stopped."""
+        with self._condition:
+            while not self._queue and not self._stopped:
+                self._condition.wait()
+            if not self._queue:
+                return None
+            deadline = self._queue[0].submit_time + self._max_latency
+            while not self._stopped:
+                rows = sum(r.rows for r in self._queue)
+                remaining = deadline - time.perf_counter()
+                if rows >= self._step_rows or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            step, rows = [], 0
+            while self._queue and \
+                    rows + self._queue[0].rows <= self._step_rows:
+                request = self._queue.popleft()
+                rows += request.rows
+                step.append(request)
+            return step
+
+    def _runStep(self, step):
+        rows = sum(r.rows for r in step)
+        inputs = []
+        for i in range(len(step[0].args)):
+            tensors = [r.args[i] for r in step]
+            if rows < self._step_rows:
+                first = tensors[0]
+                tensors.append(
+                    first.new_zeros((self._step_rows - rows, ) +
+                                    first.shape[1:]))
+            inputs.append(torch.cat(tensors))
+        outputs = self._executor(*inputs)
+        single_output = isinstance(outputs, torch.Tensor)
+        if single_output:
+            outputs = (outputs, )
+
+        start = 0
+        now = time.perf_counter()
+        for request in step:
+            result = tuple(
+                o.narrow(0, start, request.rows) if isinstance(
+                    o, torch.Tensor) and o.dim() > 0 else o for o in outputs)
+            start += request.rows
+            self._latencies.append(now - request.submit_time)
+            request.future.set_result(
+                result[0] if single_output else result)
+
+    def _mainLoop(self):
+        while True:
+            step = self._nextStep()
+            if step is None:
+                return
+            try:
+                self._runStep(step)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error("BatchingExecutor step failed: %s", e)
+                for request in step:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def destroy(self):
+        """Run the requests already queued, stop the worker thread and
+        destroy the model."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._worker.join()
+        self._executor.destroy()
@@ -182,3 +182,35 @@ def test_trainingAnchors(anchor):
             assert loss > 500.0
         else:
             assert False, "Unexpected anchor type %s" % anchor
+
+
+def test_outputAnchorMode():
+    torch.manual_seed(42)
+
+    input = torch.randn(100, 10)
+    label = torch.randint(0, 10, [1]).expand([100])
+    model = torch.nn.Linear(10, 10)
+
+    # The loss of each batch but only the logits of every 20 batches.
+    opts = poptorch.Options().deviceIterations(100)
+    opts.anchorMode(poptorch.AnchorMode.All)
+    opts.outputAnchorMode(0, poptorch.AnchorMode.EveryN, 20)
+    poptorch_model = helpers.trainingModelWithLoss(
+        model, options=opts, loss=torch.nn.CrossEntropyLoss())
+
+    poptorchOut, loss = poptorch_model(input, label)
+    assert poptorchOut.size() == torch.Size([5, 10])
+    assert loss.size() == torch.Size([100])
+
+    # The logits are never returned.
+    opts = poptorch.Options().deviceIterations(100)
+    opts.anchorMode(poptorch.AnchorMode.All)
+    opts.outputAnchorMode(0, None)
+    poptorch_model = helpers.trainingModelWithLoss(
+        torch.nn.Linear(10, 10),
+        options=opts,
+        loss=torch.nn.CrossEntropyLoss())
+
+    poptorchOut, loss = poptorch_model(input, label)
+    assert poptorchOut is None
+    assert loss.size() == torch.Size([100])
@@ -45,6 +45,25 @@ class IncrementIterableDatasetWithLen(IncrementIterableDataset):
         return self._length
 
 
+class SlowIterableDataset(torch.utils.data.IterableDataset):
+    def __init__(self, length, delay):
+        self._length = length
+        self._delay = delay
+
+    def __iter__(self):
+        for index in range(self._length):
+            time.sleep(self._delay)
+            yield torch.full((2, ), index, dtype=torch.float32)
+
+
+class ShardedIncrementIterableDataset(IncrementIterableDataset):
+    def __iter__(self):
+        info = poptorch.asynchronousWorkerInfo()
+        assert info is not None
+        for index in range(info.id, self._length, info.num_workers):
+            yield torch.full(self._shape, index, dtype=torch.float32)
+
+
 class IncrementDatasetWithLabels(torch.utils.data.Dataset):
     def __init__(self, shape, length):
         self._shape = shape
@@ -58,6 +77,38 @@ class IncrementDatasetWithLabels(torch.utils.data.Dataset):
                 torch.full((1, ), index, dtype=torch.long))
 
 
+class IncrementDictDataset(torch.utils.data.Dataset):
+    def __init__(self, shape, length):
+        self._shape = shape
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        return {
+            "input_ids": torch.full(self._shape, index, dtype=torch.long),
+            "masks": (torch.ones(self._shape), [torch.zeros(1)]),
+            "labels": torch.tensor(index),
+        }
+
+
+class IncrementBatchedDataset(IncrementDataset):
+    def __init__(self, shape, length):
+        super().__init__(shape, length)
+        self.fetches = 0
+
+    def __getitem__(self, index):
+        assert False, "Samples must be fetched using __getitems__"
+
+    def __getitems__(self, indices):
+        self.fetches += 1
+        return [
+            torch.full(self._shape, index, dtype=torch.float32)
+            for index in indices
+        ]
+
+
 class CheckOrderModel(torch.nn.Module):
     def forward(self, data, expected):
         # return expected + 1 if data was what we expected
@@ -499,3 +550,197 @@ def test_reuse_workers(DatasetType):
             num_tensors_reuse += 1
         end = time.perf_counter()
         print(f"Other epoch: {end - start} {num_tensors_reuse}")
+
+
+def test_async_loader_blocks_while_waiting():
+    num_tensors = 10
+    delay = 0.05
+    loader = poptorch.AsynchronousDataAccessor(
+        SlowIterableDataset(num_tensors, delay))
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    count = 0
+    for index, data in enumerate(loader):
+        assert torch.equal(data, torch.full((2, ), index))
+        count += 1
+    wall_time = time.perf_counter() - start
+    cpu_time = time.process_time() - cpu_start
+    loader.terminate()
+
+    assert count == num_tensors
+    assert wall_time >= num_tensors * delay * 0.5
+    # The host doesn't spin while waiting for the worker.
+    assert cpu_time < wall_time / 2, (cpu_time, wall_time)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+@pytest.mark.parametrize("DatasetType",
+                         [IncrementDataset, ShardedIncrementIterableDataset])
+def test_async_loader_num_workers(DatasetType, ordered):
+    shape = [2, 3]
+    num_tensors = 11
+    loader = poptorch.AsynchronousDataAccessor(DatasetType(
+        shape, num_tensors),
+                                               buffer_size=4,
+                                               num_workers=3,
+                                               ordered=ordered)
+
+    # Make sure each element is returned exactly once per epoch.
+    for _ in range(3):
+        values = [int(data[0][0]) for data in loader]
+        if ordered:
+            assert values == list(range(num_tensors))
+        else:
+            assert sorted(values) == list(range(num_tensors))
+    loader.terminate()
+
+
+@pytest.mark.parametrize("shuffle", [True, False])
+@pytest.mark.parametrize("persistent_workers", [True, False])
+def test_async_loader_num_workers_dataloader(shuffle, persistent_workers):
+    shape = [2, 3]
+    num_tensors = 20
+
+    opts = poptorch.Options()
+    data = poptorch.DataLoader(opts,
+                               IncrementDataset(shape, num_tensors),
+                               batch_size=2,
+                               shuffle=shuffle,
+                               num_workers=1,
+                               persistent_workers=persistent_workers)
+    loader = poptorch.AsynchronousDataAccessor(data, num_workers=3)
+
+    # Each batch must be loaded by a single worker.
+    for _ in range(2):
+        values = [int(x) for data in loader for x in data[:, 0, 0]]
+        if shuffle:
+            assert sorted(values) == list(range(num_tensors))
+        else:
+            assert values == list(range(num_tensors))
+    loader.terminate()
+
+
+def test_async_loader_num_workers_unsplittable():
+    class Iterable:
+        def __iter__(self):
+            yield torch.zeros(2)
+
+    with pytest.raises(AssertionError, match="can't be split"):
+        poptorch.AsynchronousDataAccessor(Iterable(), num_workers=2)
+
+
+def test_async_loader_nested_data():
+    shape = [2, 3]
+    num_tensors = 10
+
+    opts = poptorch.Options()
+    data = poptorch.DataLoader(opts,
+                               IncrementDictDataset(shape, num_tensors),
+                               batch_size=2,
+                               num_workers=1)
+    loader = poptorch.AsynchronousDataAccessor(data)
+
+    for _ in range(2):
+        count = 0
+        for index, batch in enumerate(loader):
+            assert list(batch.keys()) == ["input_ids", "masks", "labels"]
+            assert torch.equal(batch["labels"],
+                               torch.tensor([index * 2, index * 2 + 1]))
+            assert batch["input_ids"].shape == torch.Size([2, 2, 3])
+            assert isinstance(batch["masks"], list)
+            assert torch.equal(batch["masks"][0], torch.ones(2, 2, 3))
+            assert torch.equal(batch["masks"][1][0], torch.zeros(2, 1))
+            # The containers belong to the caller: modifying them mustn't
+            # affect the following elements.
+            batch.pop("labels")
+            batch["masks"].pop()
+            count += 1
+        assert count == num_tensors // 2
+    loader.terminate()
+
+
+class VariableLengthDataset(torch.utils.data.Dataset):
+    def __len__(self):
+        return 6
+
+    def __getitem__(self, index):
+        return {
+            "tokens": torch.full((index + 1, ), index, dtype=torch.long),
+            "label": torch.tensor([index]),
+        }
+
+
+def test_async_loader_max_shapes():
+    loader = poptorch.AsynchronousDataAccessor(VariableLengthDataset(),
+                                               max_shapes={
+                                                   "tokens": (8, ),
+                                                   "label": None
+                                               })
+
+    for _ in range(2):
+        count = 0
+        for index, data in enumerate(loader):
+            assert torch.equal(data["tokens"],
+                               torch.full((index + 1, ), index))
+            assert torch.equal(data["label"], torch.tensor([index]))
+            count += 1
+        assert count == 6
+    loader.terminate()
+
+
+def collate_into_slot(slot, samples):
+    data, labels = slot
+    for index, (sample, label) in enumerate(samples):
+        data[index].copy_(sample)
+        labels[index] = label
+
+
+def test_async_loader_collate_into():
+    shape = [2, 3]
+    num_tensors = 20
+    batch_size = 4
+
+    opts = poptorch.Options()
+    data = poptorch.DataLoader(opts,
+                               IncrementDatasetWithLabels(shape, num_tensors),
+                               batch_size=batch_size,
+                               collate_fn=list)
+    loader = poptorch.AsynchronousDataAccessor(data,
+                                               collate_into=collate_into_slot)
+
+    for _ in range(2):
+        count = 0
+        for index, (batch, labels) in enumerate(loader):
+            expected = torch.arange(index * batch_size,
+                                    (index + 1) * batch_size)
+            assert torch.equal(labels, expected.unsqueeze(1))
+            assert torch.equal(batch[:, 0, 0], expected.float())
+            count += 1
+        assert count == num_tensors // batch_size
+    loader.terminate()
+
+
+@pytest.mark.parametrize("num_hosts", [1, 2])
+def test_getitems(num_hosts):
+    shape = [2, 3]
+    num_tensors = 24
+    batch_size = 2
+    device_iterations = 3
+
+    opts = poptorch.Options()
+    opts.deviceIterations(device_iterations)
+    opts.Distributed.configureProcessId(num_hosts - 1, num_hosts)
+
+    dataset = IncrementBatchedDataset(shape, num_tensors)
+    data = poptorch.DataLoader(opts, dataset, batch_size=batch_size)
+    num_batches = num_tensors // (batch_size * device_iterations * num_hosts)
+    assert len(data) == num_batches
+
+    offset = (num_hosts - 1) * num_tensors // num_hosts
+    for index, batch in enumerate(data):
+        start = offset + index * data.combinedBatchSize
+        expected = torch.arange(start, start + data.combinedBatchSize)
+        assert batch.shape == torch.Size([data.combinedBatchSize] + shape)
+        assert torch.equal(batch[:, 0, 0], expected.float())
+    assert dataset.fetches == num_batches
@@ -242,3 +242,31 @@ def test_input_three_agg_nested_dict():
             "arguments, including when nested in tuples."
             "\nReceived dict y[2][1] = "
             "{'c': tensor([4])}")
+
+
+def test_call_plan_signature_change():
+    class TwoAdder(nn.Module):
+        def forward(self, x, y=torch.ones(2)):
+            return x + y
+
+    model = TwoAdder()
+    inference_model = poptorch.inferenceModel(model)
+
+    x = torch.tensor([1., 2.])
+    y = torch.tensor([3., 4.])
+
+    # The first call compiles the model and creates the call plans, the next
+    # ones go through the fast path.
+    for _ in range(3):
+        torch.testing.assert_allclose(inference_model(x), model(x))
+        torch.testing.assert_allclose(inference_model(x, y), model(x, y))
+        torch.testing.assert_allclose(inference_model(x, y=y), model(x, y=y))
+
+    # Non-contiguous inputs must fall back to the slow path.
+    nc = torch.tensor([[1., 0.], [2., 0.]])[:, 0]
+    assert not nc.is_contiguous()
+    torch.testing.assert_allclose(inference_model(nc, y), model(nc, y))
+
+    # So must a change of dtype.
+    torch.testing.assert_allclose(inference_model(x.double(), y),
+                                  model(x, y))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# Copyright (c) 2020 Graphcore Ltd. All rights reserved.
+
+import pytest
+import torch
+import poptorch
+
+
+class EvalModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.linear = torch.nn.Linear(8, 4)
+
+    def forward(self, x, labels):
+        logits = self.linear(x)
+        loss = torch.nn.functional.cross_entropy(logits, labels)
+        return (poptorch.metrics.accuracy(logits, labels),
+                poptorch.metrics.topKAccuracy(logits, labels, 2),
+                poptorch.metrics.meanLoss(loss),
+                poptorch.metrics.confusionMatrix(logits, labels, 4))
+
+
+@pytest.mark.parametrize("anchor",
+                         [poptorch.AnchorMode.Sum, poptorch.AnchorMode.All])
+def test_metrics(anchor):
+    torch.manual_seed(42)
+    model = EvalModel()
+    x = torch.randn(40, 8)
+    labels = torch.randint(0, 4, [40])
+
+    opts = poptorch.Options().deviceIterations(10)
+    for output in range(4):
+        opts.outputAnchorMode(output, anchor)
+    poptorch_model = poptorch.inferenceModel(model, opts)
+    accuracy, top2, loss, confusion = poptorch_model(x, labels)
+    if anchor == poptorch.AnchorMode.Sum:
+        # Only the totals are returned.
+        assert accuracy.shape == torch.Size([2])
+        assert confusion.shape == torch.Size([4, 4])
+
+    logits = model.linear(x)
+    native_accuracy = (logits.argmax(dim=1) == labels).float().mean()
+    native_top2 = (logits.topk(2, dim=1)[1] == labels.unsqueeze(1)).any(
+        dim=1).float().mean()
+    native_loss = torch.stack([
+        torch.nn.functional.cross_entropy(logits[i:i + 4], labels[i:i + 4])
+        for i in range(0, 40, 4)
+    ]).mean()
+    native_confusion = torch.zeros(4, 4)
+    for label, prediction in zip(labels, logits.argmax(dim=1)):
+        native_confusion[label, prediction] += 1
+
+    assert poptorch.metrics.ratio(accuracy) == pytest.approx(
+        native_accuracy.item())
+    assert poptorch.metrics.ratio(top2) == pytest.approx(native_top2.item())
+    assert poptorch.metrics.ratio(loss) == pytest.approx(native_loss.item(),
+                                                         rel=1e-4)
+    torch.testing.assert_allclose(
+        poptorch.metrics.confusionCounts(confusion, 4), native_confusion)
@@ -386,3 +386,124 @@ def test_optimizer_SGD_nesterov():
                                                    nesterov=True,
                                                    momentum=0.1,
                                                    lr=0.001))
+
+
+def test_optimizer_incremental_update():
+    torch.manual_seed(42)
+
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.layer1 = torch.nn.Linear(10, 10)
+            self.layer2 = torch.nn.Linear(10, 10)
+            self.loss = torch.nn.CrossEntropyLoss()
+
+        def forward(self, X, Y):
+            fwd = self.layer2(self.layer1(X))
+            return fwd, self.loss(fwd, Y)
+
+    model = Model()
+    optimizer = optim.SGD([{
+        'params': model.layer1.parameters()
+    }, {
+        'params': model.layer2.parameters()
+    }],
+                          lr=0.0)
+    poptorch_model = poptorch.trainingModel(model, optimizer=optimizer)
+
+    input = torch.randn(1, 10)
+    target = torch.randint(0, 10, [1])
+    poptorch_model(input, target)
+    layer1_weight = model.layer1.weight.detach().clone()
+
+    # Setting the same optimizer again is a no-op.
+    poptorch_model.setOptimizer(optimizer)
+    assert not poptorch_model._optimizer_update  # pylint: disable=protected-access
+
+    # Only the learning rate of the second group changed.
+    optimizer.param_groups[1]['lr'] = 0.1
+    poptorch_model.setOptimizer(optimizer)
+    assert poptorch_model._optimizer_update == {1: {"lr": (0.1, False)}}  # pylint: disable=protected-access
+
+    for _ in range(10):
+        poptorch_model(input, target)
+    assert not poptorch_model._optimizer_update  # pylint: disable=protected-access
+
+    # The first layer mustn't have been trained.
+    torch.testing.assert_allclose(model.layer1.weight, layer1_weight)
+
+    # Changing anything else than the per group hyperparameters triggers a
+    # full update.
+    poptorch_model.setOptimizer(optim.AdamW(model.parameters(), lr=0.1))
+    assert "optimizer_type" in poptorch_model._optimizer_update  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize("schedule", [
+    poptorch.optim.LinearDecay(10, warmup_steps=2),
+    poptorch.optim.CosineDecay(10, end_factor=0.1),
+    poptorch.optim.PolynomialDecay(10, power=2.0),
+    poptorch.optim.StepDecay(3, gamma=0.5, warmup_steps=1)
+])
+def test_lr_schedule(schedule):
+    torch.manual_seed(42)
+
+    model = torch.nn.Linear(10, 10)
+    optimizer = optim.SGD(model.parameters(), lr=0.1)
+
+    opts = poptorch.Options()
+    opts.deviceIterations(2)
+    poptorch_model = helpers.trainingModelWithLoss(
+        model,
+        options=opts,
+        loss=torch.nn.CrossEntropyLoss(),
+        optimizer=optimizer)
+    poptorch_model.setLRSchedule(schedule)
+
+    input = torch.randn(2, 10)
+    label = torch.randint(0, 10, [2])
+
+    for step in range(0, 12, 2):
+        poptorch_model(input, label)
+        lr = poptorch_model._optimizer[0]["lr"][0]  # pylint: disable=protected-access
+        assert lr == pytest.approx(0.1 * schedule(step))
+
+    # Updating the optimizer changes the base learning rate.
+    optimizer.param_groups[0]['lr'] = 0.2
+    poptorch_model.setOptimizer(optimizer)
+    poptorch_model(input, label)
+    lr = poptorch_model._optimizer[0]["lr"][0]  # pylint: disable=protected-access
+    assert lr == pytest.approx(0.2 * schedule(12))
+
+    # Removing the schedule restores the optimizer's learning rate.
+    poptorch_model.setLRSchedule(None)
+    assert poptorch_model._optimizer[0]["lr"][0] == pytest.approx(0.2)  # pylint: disable=protected-access
+
+
+def test_lr_schedule_abstract():
+    class IncompleteSchedule(poptorch.optim.LRSchedule):
+        pass
+
+    # Incomplete schedules are rejected before being used.
+    with pytest.raises(TypeError, match="abstract"):
+        IncompleteSchedule()
+
+
+def test_lr_schedule_factors():
+    linear = poptorch.optim.LinearDecay(12, warmup_steps=2)
+    assert linear(0) == pytest.approx(0.5)
+    assert linear(1) == pytest.approx(1.0)
+    assert linear(2) == pytest.approx(1.0)
+    assert linear(7) == pytest.approx(0.5)
+    assert linear(12) == pytest.approx(0.0)
+    assert linear(100) == pytest.approx(0.0)
+
+    cosine = poptorch.optim.CosineDecay(10, end_factor=0.5)
+    assert cosine(0) == pytest.approx(1.0)
+    assert cosine(5) == pytest.approx(0.75)
+    assert cosine(10) == pytest.approx(0.5)
+
+    polynomial = poptorch.optim.PolynomialDecay(10, power=2.0)
+    assert polynomial(5) == pytest.approx(0.25)
+
+    step = poptorch.optim.StepDecay(3, gamma=0.5)
+    assert [step(i) for i in range(7)] == [1, 1, 1, 0.5, 0.5, 0.5, 0.25]
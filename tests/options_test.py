@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 # Copyright (c) 2020 Graphcore Ltd. All rights reserved.
+import copy
 import unittest.mock
 
 import torch
@@ -178,3 +179,19 @@ def test_tensor_location():
     y = torch.zeros(2)
 
     inference_model(x, y)
+
+
+def test_options_deepcopy():
+    opts = poptorch.Options()
+    opts.deviceIterations(2)
+    opts.Training.gradientAccumulation(4)
+
+    # Used by compileMany() to modify the options of each variant.
+    opts_copy = copy.deepcopy(opts)
+    opts_copy.deviceIterations(3)
+    opts_copy.Training.gradientAccumulation(8)
+    assert opts_copy.Jit.trace_model == opts.Jit.trace_model
+    assert opts.device_iterations == 2
+    assert opts.Training.gradient_accumulation == 4
+    assert opts_copy.device_iterations == 3
+    assert opts_copy.Training.gradient_accumulation == 8
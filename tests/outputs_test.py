@@ -117,3 +117,49 @@ def test_same_tensor():
 
     assert poptorch.testing.allclose(
         ref, ipu), "%s doesn't match the expected output %s" % (ipu, ref)
+
+
+def test_output_buffer_pool():
+    class Network(nn.Module):
+        def forward(self, x):
+            return x + 1, x * 2
+
+    model = Network()
+    opts = poptorch.Options()
+    opts.Host.outputBufferPoolDepth(1)
+    inference_model = poptorch.inferenceModel(model, opts)
+
+    x = torch.ones(2)
+    # Results which are still referenced must not be overwritten.
+    first = inference_model(x)
+    second = inference_model(x * 3)
+    assert poptorch.testing.allclose(first, model(x))
+    assert poptorch.testing.allclose(second, model(x * 3))
+    assert first[0].data_ptr() != second[0].data_ptr()
+
+    # Once released they get reused.
+    ptr = second[0].data_ptr()
+    del first, second
+    third = inference_model(x * 5)
+    assert poptorch.testing.allclose(third, model(x * 5))
+    assert third[0].data_ptr() == ptr
+
+
+def test_execute_into():
+    class Network(nn.Module):
+        def forward(self, x, y):
+            return x + y, (x * y, )
+
+    model = Network()
+    inference_model = poptorch.inferenceModel(model)
+
+    x = torch.ones(2)
+    y = torch.full((2, ), 3.0)
+    out = (torch.empty(2), torch.empty(2))
+    ipu = inference_model.executeInto(out, x, y)
+    ref = model(x, y)
+    assert poptorch.testing.allclose(
+        ref, ipu), "%s doesn't match the expected output %s" % (ipu, ref)
+    assert ipu[0].data_ptr() == out[0].data_ptr()
+    assert ipu[1][0].data_ptr() == out[1].data_ptr()
+    assert poptorch.testing.allclose(out[0], ref[0])
@@ -3,6 +3,7 @@
 
 import os
 import tempfile
+import unittest.mock
 import pytest
 import poptorch
 import torch
@@ -34,6 +35,38 @@ def test_ExecutableCaching(capfd):
         log.assert_contains("set enableEngineCaching to value true")
 
 
+def test_compilation_cache(capfd):
+    poptorch.setLogLevel(1)  # Force debug logging
+
+    def run(x, weight):
+        model = torch.nn.Linear(3, 2)
+        with torch.no_grad():
+            model.weight.fill_(weight)
+        poptorch_model = poptorch.inferenceModel(model, opts)
+        out = poptorch_model(x)
+        poptorch_model.destroy()
+        torch.testing.assert_allclose(out, model(x))
+
+    with tempfile.TemporaryDirectory() as cache:
+        opts = poptorch.Options()
+        opts.enableExecutableCaching(cache)
+
+        run(torch.ones(2, 3), 1.0)
+        assert len([f for f in os.listdir(cache)
+                    if f.endswith(".poptorch")]) == 1
+
+        # Same graph: the lowered graph is loaded from the cache and the
+        # current weights are uploaded.
+        run(torch.ones(2, 3), 2.0)
+        log = helpers.LogChecker(capfd)
+        log.assert_contains("Loading the lowered graph from the cache")
+
+        # Different input shape: new entry.
+        run(torch.ones(4, 3), 1.0)
+        assert len([f for f in os.listdir(cache)
+                    if f.endswith(".poptorch")]) == 2
+
+
 def test_inference_attributes():
     class Model(torch.nn.Module):
         def __init__(self, attr):
@@ -145,3 +178,336 @@ def test_explicit_deletion(use_half):
     training_model.destroy()
 
     inference_model(input)
+
+
+def test_execute_async():
+    class Model(torch.nn.Module):
+        def forward(self, x):
+            return x * 2
+
+    opts = poptorch.Options()
+    opts.Host.maxStepsInFlight(2)
+    model = Model()
+    poptorch_model = poptorch.inferenceModel(model, opts)
+
+    inputs = [torch.full((2, 3), float(i)) for i in range(5)]
+    futures = [poptorch_model.executeAsync(x) for x in inputs]
+
+    # The results must be returned in order.
+    for x, future in zip(inputs, futures):
+        torch.testing.assert_allclose(future.result(), model(x))
+
+    # Synchronous calls wait for the pending steps.
+    future = poptorch_model.executeAsync(inputs[1])
+    torch.testing.assert_allclose(poptorch_model(inputs[2]), model(inputs[2]))
+    assert future.done()
+    torch.testing.assert_allclose(future.result(), model(inputs[1]))
+
+
+def test_execute_async_training():
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.linear = torch.nn.Linear(3, 3)
+            self.loss = torch.nn.MSELoss()
+
+        def forward(self, x, target):
+            out = self.linear(x)
+            return out, self.loss(out, target)
+
+    model = Model()
+    poptorch_model = poptorch.trainingModel(model)
+    x = torch.ones(2, 3)
+    target = torch.zeros(2, 3)
+
+    futures = [poptorch_model.executeAsync(x, target) for _ in range(3)]
+    first_loss = futures[0].result()[1]
+
+    # Accessing the weights on the host must wait for all the steps.
+    weight = model.linear.weight.detach().clone()
+    assert all(f.done() for f in futures)
+    assert futures[-1].result()[1] < first_loss
+    torch.testing.assert_allclose(weight, model.linear.weight)
+
+
+def test_checkpoint_async():
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.linear = torch.nn.Linear(3, 3)
+            self.loss = torch.nn.MSELoss()
+
+        def forward(self, x, target):
+            out = self.linear(x)
+            return out, self.loss(out, target)
+
+    model = Model()
+    poptorch_model = poptorch.trainingModel(model)
+    x = torch.ones(2, 3)
+    target = torch.zeros(2, 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, "ckpt%d.pt" % i) for i in range(2)]
+        futures = []
+        for path in paths:
+            poptorch_model(x, target)
+            futures.append(poptorch_model.checkpointAsync(path))
+        futures[-1].result()
+        assert all(f.done() for f in futures)
+
+        # The last checkpoint matches the current weights.
+        checkpoint = torch.load(paths[-1])
+        assert "optimizer_params" in checkpoint
+        for name, tensor in model.state_dict().items():
+            torch.testing.assert_allclose(
+                checkpoint["model_state_dict"][name], tensor)
+
+        # The first one was taken before the last training step.
+        first = torch.load(paths[0])["model_state_dict"]
+        assert not torch.allclose(first["linear.weight"],
+                                  model.linear.weight)
+
+
+def test_save_load_executable():
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.linear = torch.nn.Linear(3, 2)
+
+        def forward(self, x, y=None):
+            out = self.linear(x)
+            if y is not None:
+                out = out + y
+            return out, out.sum()
+
+    model = Model()
+    poptorch_model = poptorch.inferenceModel(model)
+    x = torch.rand(4, 3)
+    poptorch_model.compile(x)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.poptorch")
+        poptorch.saveExecutable(poptorch_model, path)
+        poptorch_model.destroy()
+
+        loaded = poptorch.loadExecutable(path)
+        out, total = loaded(x)
+        native_out, native_total = model(x)
+        torch.testing.assert_allclose(out, native_out)
+        torch.testing.assert_allclose(total, native_total)
+        assert set(loaded.weights) == {"linear.weight", "linear.bias"}
+
+        # The signature used to compile the model must be used.
+        with pytest.raises(AssertionError):
+            loaded(x, torch.ones(4, 2))
+        loaded.destroy()
+
+        # The options changing the shape of the inputs must match.
+        opts = poptorch.Options()
+        opts.deviceIterations(2)
+        with pytest.raises(AssertionError):
+            poptorch.loadExecutable(path, opts)
+
+
+def test_save_load_inference_executable():
+    model = torch.nn.Linear(3, 2)
+    poptorch_model = poptorch.inferenceModel(model)
+    x = torch.rand(4, 3)
+    poptorch_model.compile(x)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.poptorch")
+        poptorch.saveExecutable(poptorch_model, path)
+        poptorch_model.destroy()
+
+        saved = torch.load(path)
+        assert not saved["training"]
+        for name, tensor in model.state_dict().items():
+            torch.testing.assert_allclose(saved["weights"][name], tensor)
+
+        loaded = poptorch.loadExecutable(path)
+        torch.testing.assert_allclose(loaded(x), model(x))
+        loaded.destroy()
+
+
+def test_compile_async():
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.linear = torch.nn.Linear(3, 3)
+
+        def forward(self, x):
+            with poptorch.Block(ipu_id=0):
+                x = self.linear(x)
+            return x * 2
+
+    models = [Model() for _ in range(2)]
+    poptorch_models = [poptorch.inferenceModel(m) for m in models]
+    x = torch.rand(2, 3)
+
+    futures = [m.compileAsync(x) for m in poptorch_models]
+    # The blocks must be no-ops for the models running on the CPU while the
+    # other ones are being traced.
+    native_outs = [m(x) for m in models]
+    for future in futures:
+        assert future.result() is None
+
+    for poptorch_model, native_out in zip(poptorch_models, native_outs):
+        torch.testing.assert_allclose(poptorch_model(x), native_out)
+
+    # Calls which need the executable wait for the compilation.
+    model = Model()
+    poptorch_model = poptorch.inferenceModel(model)
+    future = poptorch_model.compileAsync(x)
+    torch.testing.assert_allclose(poptorch_model(x), model(x))
+    assert future.done()
+
+
+class CompileManyModel(torch.nn.Module):
+    # Defined at module level: the model is sent to the worker processes.
+    def __init__(self):
+        super().__init__()
+        self.linear = torch.nn.Linear(3, 2)
+
+    def forward(self, x):
+        return self.linear(x)
+
+
+@pytest.mark.skipif(not poptorch.ipuHardwareIsAvailable(),
+                    reason="Hardware IPU needed to run offline executables")
+def test_compile_many():
+    model = CompileManyModel()
+    variants = []
+    for iterations in [1, 2]:
+        opts = poptorch.Options()
+        opts.deviceIterations(iterations)
+        variants.append((opts, torch.rand(iterations * 4, 3)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = poptorch.compileMany(model, variants, workers=2, directory=tmp)
+        assert len(paths) == len(variants)
+
+        for path, (opts, x) in zip(paths, variants):
+            # The user's options must not have been modified.
+            assert opts.connection_type != \
+                poptorch.ConnectionType.Never.value
+            loaded = poptorch.loadExecutable(path, opts)
+            torch.testing.assert_allclose(loaded(x), model(x))
+            loaded.destroy()
+
+
+def test_compile_many_inference():
+    # Compiling for an offline target doesn't need any hardware.
+    model = CompileManyModel()
+    variants = [(poptorch.Options(), torch.rand(4, 3)),
+                (poptorch.Options().deviceIterations(2), torch.rand(8, 3))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = poptorch.compileMany(model, variants, workers=2, directory=tmp)
+        assert len(paths) == len(variants)
+        for path, (opts, _) in zip(paths, variants):
+            # The variants' options are copied before being modified.
+            assert opts.connection_type != \
+                poptorch.ConnectionType.Never.value
+            saved = torch.load(path)
+            assert not saved["training"]
+            for name, tensor in model.state_dict().items():
+                torch.testing.assert_allclose(saved["weights"][name], tensor)
+
+
+def test_bucketed_inference_model():
+    class Model(torch.nn.Module):
+        def forward(self, x, mask):
+            # Shapes: [batch, seq, 2] and [batch, seq]
+            out = x * mask.unsqueeze(-1)
+            return out, out.sum(dim=1)
+
+    model = Model()
+    poptorch_model = poptorch.bucketedInferenceModel(model, [4, 8], dim=1)
+
+    for seq in [3, 4, 6]:
+        x = torch.rand(2, seq, 2)
+        mask = torch.ones(2, seq)
+        out, total = poptorch_model(x, mask)
+        native_out, native_total = model(x, mask)
+        # The outputs are sliced back to the size of the inputs.
+        assert out.shape == native_out.shape
+        torch.testing.assert_allclose(out, native_out)
+        torch.testing.assert_allclose(total, native_total)
+    # One executable per bucket.
+    assert len(poptorch_model._executors) == 2  # pylint: disable=protected-access
+
+    with pytest.raises(AssertionError, match="larger than the largest"):
+        poptorch_model(torch.rand(2, 9, 2), torch.ones(2, 9))
+    with pytest.raises(AssertionError, match="must have the same size"):
+        poptorch_model(torch.rand(2, 3, 2), torch.ones(2, 4))
+    poptorch_model.destroy()
+
+
+def test_max_executables():
+    class Model(torch.nn.Module):
+        def forward(self, x, y=None):
+            if y is None:
+                return x * 2
+            return x + y
+
+    model = Model()
+    opts = poptorch.Options()
+    opts.Jit.maxExecutables(2)
+    poptorch_model = poptorch.inferenceModel(model, opts)
+
+    def run(*args):
+        torch.testing.assert_allclose(poptorch_model(*args), model(*args))
+
+    x = torch.rand(2, 3)
+    run(x)
+    run(torch.rand(4, 3))
+    assert len(poptorch_model._executables) == 1  # pylint: disable=protected-access
+
+    # Different number of arguments: the least recently used executable
+    # gets released.
+    run(x, x)
+    assert len(poptorch_model._executables) == 1  # pylint: disable=protected-access
+    executable = poptorch_model._executable  # pylint: disable=protected-access
+    run(torch.rand(4, 3))
+    run(x, x)
+    assert poptorch_model._executable is executable  # pylint: disable=protected-access
+    poptorch_model.destroy()
+
+    # Only one executable by default.
+    poptorch_model = poptorch.inferenceModel(model)
+    run(x)
+    with pytest.raises(AssertionError, match="maxExecutables"):
+        poptorch_model(x, x)
+
+
+def test_max_executables_detach():
+    class Model(torch.nn.Module):
+        def forward(self, x, y=None, z=None):
+            if y is None:
+                return x * 2
+            if z is None:
+                return x + y
+            return x + y + z
+
+    opts = poptorch.Options()
+    opts.Jit.maxExecutables(2)
+    poptorch_model = poptorch.inferenceModel(Model(), opts)
+
+    x = torch.rand(2, 3)
+    poptorch_model(x)
+    evicted = poptorch_model._executable  # pylint: disable=protected-access
+    poptorch_model(x, x)
+
+    core = poptorch._impl.poptorch_core  # pylint: disable=protected-access
+    with unittest.mock.patch.object(
+            core, "detachFromDevice",
+            wraps=core.detachFromDevice) as detach:
+        # The least recently used executable gets released.
+        poptorch_model(x, x, x)
+    detach.assert_called_once_with(evicted)
+
+    # The evicted executable doesn't hold its IPUs any more.
+    with pytest.raises(RuntimeError, match="detached from its device"):
+        core.execute(evicted, (x, ), {})
+    poptorch_model.destroy()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# Copyright (c) 2020 Graphcore Ltd. All rights reserved.
+
+import concurrent.futures
+import pytest
+import torch
+import poptorch
+
+
+class Model(torch.nn.Module):
+    def forward(self, x):
+        return x * 2, x.sum(dim=1)
+
+
+def test_batching_executor():
+    model = Model()
+    opts = poptorch.Options()
+    opts.deviceIterations(2)
+    server = poptorch.serving.BatchingExecutor(model,
+                                               batch_size=3,
+                                               options=opts,
+                                               max_latency=0.05)
+    assert server.stepSize == 6
+
+    requests = [torch.rand(rows, 4) for rows in [1, 2, 3, 1, 2, 1]]
+    # Submit the requests from several threads.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(server, requests))
+
+    for request, (doubled, total) in zip(requests, results):
+        native_doubled, native_total = model(request)
+        torch.testing.assert_allclose(doubled, native_doubled)
+        torch.testing.assert_allclose(total, native_total)
+
+    assert len(server.latencies()) == len(requests)
+    assert server.latencyPercentile(99) >= server.latencyPercentile(50)
+
+    with pytest.raises(AssertionError, match="between 1 and 6 rows"):
+        server.submit(torch.rand(7, 4))
+    server.destroy()
+
+
+def test_batching_executor_error():
+    class DoubleModel(torch.nn.Module):
+        def forward(self, x):
+            return x * 2
+
+    server = poptorch.serving.BatchingExecutor(DoubleModel(), batch_size=2)
+    server(torch.rand(1, 4))
+    # Shape mismatch: the error is reported to the caller.
+    with pytest.raises(Exception):
+        server(torch.rand(1, 5))
+    server.destroy()
@@ -508,3 +508,163 @@ def test_access_scalar_parameter(use_half):
     poptorch_model.copyWeightsToHost()
     # Bias should already be up to date
     assert updated_bias == str(poptorch_model.model.model.bias)
+
+
+def test_selective_weights_copy():
+    torch.manual_seed(42)
+
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.body = torch.nn.Linear(10, 10)
+            self.head = torch.nn.Linear(10, 10)
+            self.loss = torch.nn.MSELoss()
+
+        def forward(self, x, target):
+            out = self.head(self.body(x))
+            return out, self.loss(out, target)
+
+    model = Model()
+    poptorch_model = poptorch.trainingModel(model)
+    input = torch.randn(10)
+    target = torch.randn(10)
+
+    for _ in range(10):
+        poptorch_model(input, target)
+    poptorch_model.copyWeightsToHost()
+    body_weight = model.body.weight.data.clone()
+    body_bias = model.body.bias.data.clone()
+
+    # Only overwrite the head on the device: the body must keep its trained
+    # weights.
+    with torch.no_grad():
+        model.head.weight.copy_(torch.eye(10))
+        model.head.bias.zero_()
+    poptorch_model.copyWeightsToDevice(["head.weight", "head.bias"])
+    poptorch_model.setOptimizer(optim.SGD(model.parameters(), lr=0.0))
+    out, _ = poptorch_model(input, target)
+    torch.testing.assert_allclose(
+        out, torch.nn.functional.linear(input, body_weight, body_bias))
+
+    # Only download the head: the body on the host must be left untouched.
+    with torch.no_grad():
+        model.body.weight.zero_()
+    poptorch_model.copyWeightsToHost(["head.weight", "head.bias"])
+    torch.testing.assert_allclose(model.head.weight.data, torch.eye(10))
+    torch.testing.assert_allclose(model.body.weight.data, torch.zeros(10, 10))
+
+    with pytest.raises(AssertionError,
+                       match="Unknown parameter or buffer 'not_a_weight'"):
+        poptorch_model.copyWeightsToHost(["not_a_weight"])
+
+
+def test_lazy_parameter_sync():
+    torch.manual_seed(42)
+
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.body = torch.nn.Linear(10, 10)
+            self.head = torch.nn.Linear(10, 10)
+            self.loss = torch.nn.MSELoss()
+
+        def forward(self, x, target):
+            out = self.head(self.body(x))
+            return out, self.loss(out, target)
+
+    model = Model()
+    poptorch_model = poptorch.trainingModel(model)
+    input = torch.randn(10)
+    target = torch.randn(10)
+
+    poptorch_model(input, target)
+    body_weight = model.body.weight.data.clone()
+    head_weight = model.head.weight.data.clone()
+    poptorch_model(input, target)
+
+    host_versions = poptorch_model._tensor_host_versions  # pylint: disable=protected-access
+
+    # Metadata access doesn't trigger any copy.
+    assert model.head.weight.shape == torch.Size([10, 10])
+    assert model.head.weight.dtype == torch.float
+    assert model.head.weight.requires_grad
+    assert "head.weight" not in host_versions or host_versions[
+        "head.weight"] != poptorch_model._device_weights_version  # pylint: disable=protected-access
+
+    # Data access only copies the tensor being accessed.
+    assert not torch.allclose(model.head.weight.data, head_weight)
+    assert host_versions["head.weight"] == \
+        poptorch_model._device_weights_version  # pylint: disable=protected-access
+    assert "body.weight" not in host_versions or host_versions[
+        "body.weight"] != poptorch_model._device_weights_version  # pylint: disable=protected-access
+
+    assert not torch.allclose(model.body.weight.data, body_weight)
+
+
+def test_lazy_parameter_sync_single_download(capfd):
+    poptorch.setLogLevel(1)  # Force debug logging
+
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.body = torch.nn.Linear(10, 10)
+            self.head = torch.nn.Linear(10, 10)
+            self.loss = torch.nn.MSELoss()
+
+        def forward(self, x, target):
+            out = self.head(self.body(x))
+            return out, self.loss(out, target)
+
+    model = Model()
+    poptorch_model = poptorch.trainingModel(model)
+    input = torch.randn(10)
+    target = torch.randn(10)
+
+    for _ in range(2):
+        poptorch_model(input, target)
+        capfd.readouterr()
+
+        # Accessing each tensor must only download the weights once per step.
+        for param in model.parameters():
+            param.data.sum()
+        out, err = capfd.readouterr()
+        assert (out + err).count("Downloading the weights from the IPU") == 1
+
+
+def test_selective_weights_copy_param_groups():
+    torch.manual_seed(42)
+
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.body = torch.nn.Linear(10, 10)
+            self.head = torch.nn.Linear(10, 10)
+            self.loss = torch.nn.MSELoss()
+
+        def forward(self, x, target):
+            out = self.head(self.body(x))
+            return out, self.loss(out, target)
+
+    model = Model()
+    # Several parameter groups: the model is wrapped in an OptimizerWrapper.
+    optimizer = optim.SGD([{
+        "params": model.body.parameters(),
+        "lr": 0.0
+    }, {
+        "params": model.head.parameters()
+    }],
+                          lr=0.01)
+    poptorch_model = poptorch.trainingModel(model, optimizer=optimizer)
+    input = torch.randn(10)
+    target = torch.randn(10)
+    poptorch_model(input, target)
+
+    # The names are the ones of the user's model.
+    with torch.no_grad():
+        model.head.weight.copy_(torch.eye(10))
+        model.head.bias.zero_()
+    poptorch_model.copyWeightsToDevice(["head.weight", "head.bias"])
+    with torch.no_grad():
+        model.head.weight.zero_()
+    poptorch_model.copyWeightsToHost(["head.weight"])
+    torch.testing.assert_allclose(model.head.weight.data, torch.eye(10))